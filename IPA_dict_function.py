@@ -404,20 +404,61 @@ IPA = {
 
 
 
+from functools import lru_cache  # For caching the conversion of repeated words
+
+from geez_tokenizer import ETHIOPIC_PUNCTUATION  # Word separators, like the word space ፡
+
+IPA_CACHE_SIZE = 65536  # Number of distinct words whose conversion is cached
+
+
+class IPATranslationTable(dict):
+    """
+    Codepoint translation table built once from the IPA dict, for str.translate.
+
+    Characters that are not in the IPA dict are dropped, like IPA.get(char, '') did,
+    except for whitespace when keep_whitespace is set, and the separators, which
+    are replaced by a space. The decision for each new codepoint is stored in the
+    table, so it is only made once.
+    """
+
+    def __init__(self, ipa, keep_whitespace=False, separators=''):
+        super().__init__((ord(char), phoneme) for char, phoneme in ipa.items())
+        self.update((ord(char), ' ') for char in separators)
+        self.keep_whitespace = keep_whitespace
+
+    def __missing__(self, codepoint):
+        value = codepoint if self.keep_whitespace and chr(codepoint).isspace() else None
+        self[codepoint] = value
+        return value
+
+
+IPA_TABLE = IPATranslationTable(IPA)  # For single words
+IPA_TEXT_TABLE = IPATranslationTable(IPA, keep_whitespace=True, separators=ETHIOPIC_PUNCTUATION)  # For whole documents
+
+
+@lru_cache(maxsize=IPA_CACHE_SIZE)
+def ipa_convert_word(word):
+    """Convert one word to its IPA representation, caching repeated words."""
+    return word.translate(IPA_TABLE)
+
+
+def ipa_convert_document(text):
+    """Convert a whole document to IPA in one call, keeping the words apart at whitespace and Ethiopic punctuation."""
+    return text.translate(IPA_TEXT_TABLE)
+
+
 def ipa_convert(text):
-    ipa_convert=[]
-    for i in text:
-        ipa_word_convert=''
-        for j in i:
-            ipa_word_convert+=IPA.get(j,'')
-        ipa_convert.append(ipa_word_convert)
-        
-    return ipa_convert
+    """Convert a list of words to a list of their IPA representations."""
+    return list(map(ipa_convert_word, text))
+
+
+def ipa_convert_stream(words):
+    """Lazily convert a stream of words to their IPA representations."""
+    return map(ipa_convert_word, words)
 
 
 def ipa_convertor_alpahbet(text):
-    ipa_converted_alphabet=[]
-    for i in text:
-        ipa_converted_alphabet.append(IPA.get(i,''))
-    return ipa_converted_alphabet
+    """Convert a list of alphabets to a list of their IPA representations."""
+    get = IPA.get
+    return [get(char, '') for char in text]
 
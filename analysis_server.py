@@ -0,0 +1,318 @@
+"""
+Long-lived local HTTP service for on-demand Amharic/Tigrigna statistics.
+
+Starting the analysis script for every request costs the imports and the
+stopword and IPA setup each time. This server is started once: its worker
+processes load the stopword sets and IPA tables when they start and keep them
+warm. Clients POST batches of documents as JSON and get the counters back;
+results are cached by a hash of the request content, with LRU eviction
+bounded by both the number of responses and their encoded size. A worker pool
+broken by a crashed worker is replaced by a new one. Only
+the standard library is used and nothing is downloaded, so the server runs
+fully offline:
+
+    python analysis_server.py --port 8765 --workers 4
+
+    POST /analyze  {"language": "amharic", "documents": ["...", "..."], "tokenizer": "geez", "ipa": true}
+    GET  /health
+"""
+
+import argparse  # For the command line arguments
+import hashlib  # For the cache keys
+import json  # For the requests and responses
+import os  # For interacting with the operating system
+import threading  # For the cache lock
+from collections import OrderedDict  # For the LRU cache
+from concurrent.futures import ProcessPoolExecutor  # For the worker pool
+from concurrent.futures.process import BrokenProcessPool  # For replacing a crashed pool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # For the HTTP service
+
+from frequency import count_items
+from stopword_registry import STOPWORD_FILES, get_stopwords
+from pipeline import TOKENIZERS
+from parallel import CorpusAnalysis, analyze_documents
+from IPA_dict_function import ipa_convert_document
+
+DEFAULT_HOST = '127.0.0.1'  # Only reachable from this machine
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 1024  # Cached responses
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024  # Size of the cached responses, as UTF-8 JSON
+BATCH_SIZE = 1000  # Documents analyzed by a worker at a time
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+def warm_up(languages):
+    """
+    Load the stopword sets of the languages in a worker process, so that requests do not pay for it.
+
+    Parameters:
+    languages (iterable): The languages to load.
+    """
+    for language in languages:
+        get_stopwords(language)
+
+def analyze_batch(task):
+    """
+    Analyze a batch of documents (run in a worker process).
+
+    Parameters:
+    task (tuple): (documents, language, tokenizer, ipa).
+
+    Returns:
+    tuple: (CorpusAnalysis of the batch, IPA of the documents or None)
+    """
+    documents, language, tokenizer, ipa = task
+    analysis = analyze_documents((documents, language, tokenizer))
+    return analysis, [ipa_convert_document(document) for document in documents] if ipa else None
+
+def response_size(response):
+    """int: The size of a response encoded as UTF-8 JSON, as sent by the server."""
+    return len(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+
+class ResultCache:
+    """
+    A thread-safe LRU cache of responses, keyed by the hash of the request content.
+
+    Parameters:
+    max_entries (int): The number of responses kept; the least recently used one is evicted first.
+    max_bytes (int): The total size of the responses kept (see response_size); a larger response is not cached.
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def key(request):
+        """str: The SHA-256 of the canonical JSON form of a request."""
+        content = json.dumps(request, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Get a cached response, or None."""
+        with self.lock:
+            try:
+                self.entries.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self.entries[key]
+
+    def put(self, key, response):
+        """Cache a response, evicting the least recently used ones while the cache is over its limits."""
+        if self.max_entries <= 0:
+            return
+        size = response_size(response)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            self.total_bytes += size - self.sizes.get(key, 0)
+            self.entries[key] = response
+            self.sizes[key] = size
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                evicted, _ = self.entries.popitem(last=False)
+                self.total_bytes -= self.sizes.pop(evicted)
+
+    def stats(self):
+        """dict: The size, hits and misses of the cache."""
+        return {'entries': len(self.entries), 'max_entries': self.max_entries, 'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses}
+
+def parse_request(request):
+    """
+    Validate an analysis request and fill in the defaults.
+
+    Parameters:
+    request (dict): The decoded JSON request.
+
+    Returns:
+    dict: The normalized request.
+
+    Raises:
+    ValueError: If the request is not valid.
+    """
+    if not isinstance(request, dict):
+        raise ValueError('The request must be a JSON object.')
+    documents = request.get('documents')
+    if not isinstance(documents, list) or not all(isinstance(document, str) for document in documents):
+        raise ValueError('"documents" must be a list of strings.')
+    language = request.get('language')
+    if language is not None and not isinstance(language, str):
+        raise ValueError('"language" must be a string.')
+    tokenizer = request.get('tokenizer', 'geez')
+    if not isinstance(tokenizer, str) or tokenizer not in TOKENIZERS:  # A list or dict is not hashable
+        raise ValueError(f'"tokenizer" must be one of {", ".join(sorted(TOKENIZERS))}.')
+    return {'documents': documents, 'language': language, 'tokenizer': tokenizer, 'ipa': bool(request.get('ipa', False))}
+
+class AnalysisService:
+    """
+    Run analysis requests on a warm process pool, caching the responses.
+
+    Parameters:
+    workers (int, optional): The number of worker processes, all cores by default.
+    cache_size (int): The number of cached responses.
+    batch_size (int): The number of documents analyzed by a worker at a time.
+    languages (iterable, optional): The languages whose stopwords are loaded up front, all registered ones by default.
+    cache_bytes (int): The total size of the cached responses.
+    """
+
+    def __init__(self, workers=None, cache_size=DEFAULT_CACHE_SIZE, batch_size=BATCH_SIZE, languages=None, cache_bytes=DEFAULT_CACHE_BYTES):
+        self.workers = workers or os.cpu_count() or 1
+        self.languages = tuple(STOPWORD_FILES) if languages is None else tuple(languages)
+        self.pool_lock = threading.Lock()
+        self.pool = self.new_pool()
+        self.cache = ResultCache(cache_size, cache_bytes)
+        self.batch_size = batch_size
+
+    def new_pool(self):
+        """ProcessPoolExecutor: A pool of warm worker processes."""
+        return ProcessPoolExecutor(self.workers, initializer=warm_up, initargs=(self.languages,))
+
+    def replace_pool(self, broken_pool):
+        """Replace a pool broken by a crashed worker, unless another request already did."""
+        with self.pool_lock:
+            if self.pool is broken_pool:
+                self.pool = self.new_pool()
+        broken_pool.shutdown(wait=False)
+
+    def analyze(self, request):
+        """
+        Analyze a batch of documents.
+
+        Parameters:
+        request (dict): {"documents": [...], "language": ..., "tokenizer": ..., "ipa": ...}
+
+        Returns:
+        dict: The counters of the documents, with "cached" telling whether the response came from the cache.
+        """
+        request = parse_request(request)
+        key = ResultCache.key(request)
+        response = self.cache.get(key)
+        if response is not None:
+            return dict(response, cached=True)
+
+        documents = request['documents']
+        tasks = [(documents[start:start + self.batch_size], request['language'], request['tokenizer'], request['ipa'])
+                 for start in range(0, len(documents), self.batch_size)]
+        analysis = CorpusAnalysis()
+        ipa = [] if request['ipa'] else None
+        pool = self.pool
+        try:
+            for batch_analysis, batch_ipa in pool.map(analyze_batch, tasks):
+                analysis.update(batch_analysis)
+                if ipa is not None:
+                    ipa.extend(batch_ipa)
+        except BrokenProcessPool:
+            self.replace_pool(pool)  # This request fails, the next ones run on the new pool
+            raise
+
+        response = analysis.to_dict()
+        response['token_count'] = sum(analysis.word_counts.values())
+        response['unique_words'] = analysis.unique_words()
+        response['alphabet_counts'] = count_items(analysis.alphabets())
+        if ipa is not None:
+            response['ipa'] = ipa
+        self.cache.put(key, response)
+        return dict(response, cached=False)
+
+    def close(self):
+        """Shut down the worker pool."""
+        self.pool.shutdown()
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler of the AnalysisServer: POST /analyze and GET /health."""
+
+    server_version = 'TextAnalyzer/1.0'
+
+    def send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self.send_json(200, {'status': 'ok', 'cache': self.server.service.cache.stats()})
+        else:
+            self.send_json(404, {'error': f'Unknown path {self.path}'})
+
+    def do_POST(self):
+        if self.path != '/analyze':
+            self.send_json(404, {'error': f'Unknown path {self.path}'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.send_json(400, {'error': 'The Content-Length header must be a non-negative integer.'})
+            return
+        if length > MAX_REQUEST_BYTES:
+            self.send_json(413, {'error': f'The request is larger than {MAX_REQUEST_BYTES} bytes.'})
+            return
+        try:
+            request = json.loads(self.rfile.read(length).decode('utf-8'))
+            response = self.server.service.analyze(request)
+        except ValueError as e:  # Also covers invalid JSON and UTF-8
+            self.send_json(400, {'error': str(e)})
+        except Exception as e:
+            self.send_json(500, {'error': f'{type(e).__name__}: {e}'})
+        else:
+            self.send_json(200, response)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+class AnalysisServer(ThreadingHTTPServer):
+    """
+    The HTTP server, holding the AnalysisService shared by the request threads.
+
+    Parameters:
+    address (tuple): (host, port); port 0 picks a free port.
+    service (AnalysisService): The service running the requests.
+    quiet (bool): Do not log the requests.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, service, quiet=False):
+        super().__init__(address, AnalysisRequestHandler)
+        self.service = service
+        self.quiet = quiet
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve Amharic/Tigrigna analysis over HTTP on this machine.')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, help='worker processes (all cores by default)')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE, help='cached responses (0 disables the cache)')
+    parser.add_argument('--cache-bytes', type=int, default=DEFAULT_CACHE_BYTES, help='total size of the cached responses')
+    parser.add_argument('--quiet', action='store_true', help='do not log the requests')
+    args = parser.parse_args(argv)
+
+    service = AnalysisService(args.workers, args.cache_size, cache_bytes=args.cache_bytes)
+    server = AnalysisServer((args.host, args.port), service, args.quiet)
+    print(f'Serving analysis on http://{server.server_address[0]}:{server.server_address[1]}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+if __name__ == '__main__':
+    main()
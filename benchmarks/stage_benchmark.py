@@ -0,0 +1,218 @@
+"""
+Benchmark suite for the analysis stages and the end-to-end pipeline.
+
+Every stage is timed separately on synthetic corpora of each requested size:
+load_data, clean_data, tokenize_data, remove_stopwords, count_frequency,
+extract_alphabets, ipa_convert and the report writers, as well as the
+streaming end-to-end pipeline. Stages that need a missing optional dependency
+(pandas for the DataFrame stages) are recorded as skipped.
+
+The streaming stages never hold the documents or tokens in memory, so corpora
+of several GB can be measured: each stage is timed as the consumption of the
+generator chain from the file through that stage, and its own time
+(stage_seconds) is the difference with the chain of the stage before it.
+The results are saved as JSON so they can be compared across versions:
+
+    python benchmarks/stage_benchmark.py --sizes 10KB 1MB 10MB --output results.json
+    python benchmarks/stage_benchmark.py --baseline results.json
+"""
+
+import argparse  # For the command line arguments
+import json  # For the results file
+import os  # For interacting with the operating system
+import platform  # For describing the machine
+import subprocess  # For the git revision
+import sys  # For the import path
+import tempfile  # For the corpus and report files
+import time  # For timing
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import text_analyzer
+from synthetic_corpus import parse_size, write_corpus
+from corpus_reader import read_lines
+from pipeline import AnalysisPipeline, tokenize_documents
+from stopword_registry import get_stopwords, filter_stopwords
+from IPA_dict_function import ipa_convert_stream
+from phonemes import count_word_phonemes
+from report_writer import ReportWriter, write_tables
+
+DEFAULT_SIZES = ('10KB', '1MB', '10MB')
+REGRESSION_THRESHOLD = 1.10  # Report stages that got more than 10% slower than the baseline
+
+def timed(function, repeat):
+    """
+    Time a function, keeping the fastest of repeat runs.
+
+    Parameters:
+    function (callable): The function to time, without arguments.
+    repeat (int): The number of runs.
+
+    Returns:
+    tuple: (fastest time in seconds, result of the last run)
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def consume(items):
+    """int: Exhaust a stream, counting its items without keeping them."""
+    count = 0
+    for _ in items:
+        count += 1
+    return count
+
+def benchmark_size(size, work_dir, repeat):
+    """
+    Time every stage on a synthetic corpus of one size.
+
+    Parameters:
+    size (str): The corpus size, e.g. '10MB'.
+    work_dir (str): The directory for the corpus and report files.
+    repeat (int): The number of runs per stage.
+
+    Returns:
+    list: One result dict per stage.
+    """
+    corpus_path = write_corpus(os.path.join(work_dir, f'amharic_{size}.txt'), size, 'amharic')
+    corpus_bytes = os.path.getsize(corpus_path)
+    results = []
+
+    chain_seconds = {}  # Stage -> seconds of the generator chain ending with it
+
+    def record(stage, function, items=None, after=None):
+        try:
+            seconds, result = timed(function, repeat)
+        except ImportError as e:
+            results.append({'size': size, 'stage': stage, 'skipped': str(e)})
+            return None
+        count = items(result) if items else None
+        entry = {'size': size, 'bytes': corpus_bytes, 'stage': stage, 'seconds': seconds,
+                 'bytes_per_second': corpus_bytes / seconds if seconds else None}
+        if after is not None:
+            entry['stage_seconds'] = max(0.0, seconds - chain_seconds[after])
+        chain_seconds[stage] = seconds
+        if count is not None:
+            entry['items'] = count
+            entry['items_per_second'] = count / seconds if seconds else None
+        results.append(entry)
+        print(f"{size:>8} {stage:<26} {seconds * 1000:10.1f} ms" +
+              (f" ({entry['stage_seconds'] * 1000:.1f} ms own)" if after is not None else ''))
+        return result
+
+    # DataFrame stages (need pandas)
+    df = record('load_data', lambda: text_analyzer.load_data(corpus_path), len)
+    if df is not None:
+        column = df.columns[0]
+        df = record('clean_data', lambda: text_analyzer.clean_data(df.copy(), column), len)
+        record('tokenize_data', lambda: text_analyzer.tokenize_data(df, column), len)
+        record('tokenize_data_split', lambda: text_analyzer.tokenize_data(df, column, tokenizer=None), len)
+
+    # Streaming stages: generator chains from the file, consumed without keeping the documents or tokens
+    stop_words = get_stopwords('amharic')
+
+    def documents():
+        return read_lines(corpus_path, header='Amharic')
+
+    def tokens():
+        return tokenize_documents(documents(), 'geez')
+
+    def filtered_tokens():
+        return filter_stopwords(tokens(), stop_words)
+
+    record('read_lines', lambda: consume(documents()), lambda count: count)
+    record('tokenize_geez', lambda: consume(tokens()), lambda count: count, after='read_lines')
+    record('remove_stopwords', lambda: consume(filtered_tokens()), lambda count: count, after='tokenize_geez')
+    counter = record('count_frequency', lambda: text_analyzer.count_frequency(filtered_tokens()), len, after='remove_stopwords')
+    alphabets = record('extract_alphabets', lambda: text_analyzer.extract_alphabets(counter), len)
+    record('count_alphabet_frequency', lambda: text_analyzer.count_alphabet_frequency(alphabets), len)
+
+    def ipa_convert_cold():
+        text_analyzer.ipa_convert_word.cache_clear()
+        return consume(ipa_convert_stream(filtered_tokens()))
+    record('ipa_convert', ipa_convert_cold, lambda count: count, after='remove_stopwords')
+
+    report_path = os.path.join(work_dir, 'Output.doc')
+
+    def write_report():
+        with ReportWriter(report_path, mode='w') as report:
+            report.write_list(filtered_tokens())
+            report.write_counts(counter)
+        return len(counter)
+    record('report_writer', write_report, after='remove_stopwords')
+    record('write_tables_jsonl', lambda: write_tables({'words': counter}, report_path + '.jsonl', 'jsonl'), lambda _: len(counter))
+    record('write_tables_csv', lambda: write_tables({'words': counter}, report_path + '.csv', 'csv'), lambda _: len(counter))
+
+    def end_to_end():
+        result = AnalysisPipeline('amharic', tokenizer='geez').run_file(corpus_path, header='Amharic')
+        count_word_phonemes(result.word_counts)
+        return result.token_count
+    record('end_to_end_pipeline', end_to_end, lambda token_count: token_count)
+    return results
+
+def git_revision():
+    """str: The current git revision of the repository, or None."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline_path):
+    """
+    Print the stages that got slower than in a baseline results file.
+
+    Parameters:
+    results (dict): The results of this run.
+    baseline_path (str): The path to an earlier results file.
+
+    Returns:
+    int: The number of regressions.
+    """
+    with open(baseline_path, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    previous = {(entry['size'], entry['stage']): entry['seconds'] for entry in baseline['results'] if 'seconds' in entry}
+    regressions = 0
+    for entry in results['results']:
+        key = (entry['size'], entry['stage'])
+        if 'seconds' in entry and previous.get(key):
+            ratio = entry['seconds'] / previous[key]
+            if ratio > REGRESSION_THRESHOLD:
+                regressions += 1
+                print(f"REGRESSION {entry['size']} {entry['stage']}: {ratio:.2f}x slower than {baseline.get('revision')}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time every analysis stage on synthetic corpora.')
+    parser.add_argument('--sizes', nargs='+', default=list(DEFAULT_SIZES), help='corpus sizes, e.g. 10KB 1MB 2GB')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per stage (the fastest is kept)')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare with an earlier results file')
+    args = parser.parse_args(argv)
+
+    results = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': [],
+    }
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in sorted(args.sizes, key=parse_size):
+            results['results'].extend(benchmark_size(size, work_dir, args.repeat))
+
+    if args.output:
+        with open(args.output, mode='w', encoding='utf-8') as output:
+            json.dump(results, output, indent=2)
+    if args.baseline:
+        return 1 if compare(results, args.baseline) else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
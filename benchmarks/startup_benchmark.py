@@ -0,0 +1,69 @@
+"""
+Startup benchmark for text_analyzer.
+
+Imports text_analyzer in fresh interpreters and reports the median import time.
+It fails (exit code 1) if the import takes longer than the budget, or if it
+pulls in pandas or NLTK, so it can guard the startup time in CI:
+
+    python benchmarks/startup_benchmark.py --runs 20 --budget-ms 100
+"""
+
+import argparse  # For the command line arguments
+import json  # For reading the measurement of each run
+import os  # For interacting with the operating system
+import statistics  # For the median
+import subprocess  # For running fresh interpreters
+import sys  # For the current interpreter
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('pandas', 'nltk', 'numpy')  # Must not be imported by "import text_analyzer"
+
+MEASURE = '''
+import json, sys, time
+start = time.perf_counter()
+import text_analyzer
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "heavy": [m for m in %r if m in sys.modules]}))
+''' % (HEAVY_MODULES,)
+
+def measure_import(runs):
+    """
+    Import text_analyzer in fresh interpreters.
+
+    Parameters:
+    runs (int): The number of interpreters to start.
+
+    Returns:
+    tuple: (list of import times in milliseconds, set of heavy modules that were imported)
+    """
+    times = []
+    heavy = set()
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', MEASURE], cwd=REPO_DIR, check=True,
+                                capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        times.append(result['seconds'] * 1000)
+        heavy.update(result['heavy'])
+    return times, heavy
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='number of fresh interpreters')
+    parser.add_argument('--budget-ms', type=float, default=100.0, help='maximum median import time')
+    args = parser.parse_args(argv)
+
+    times, heavy = measure_import(args.runs)
+    median = statistics.median(times)
+    print(f'import text_analyzer: median {median:.1f} ms, min {min(times):.1f} ms, max {max(times):.1f} ms over {args.runs} runs')
+    failed = False
+    if median > args.budget_ms:
+        print(f'FAIL: median import time is over the {args.budget_ms:.0f} ms budget')
+        failed = True
+    if heavy:
+        print(f'FAIL: importing text_analyzer imported {", ".join(sorted(heavy))}')
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
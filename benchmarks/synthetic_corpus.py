@@ -0,0 +1,136 @@
+"""
+Deterministic generator of synthetic Amharic/Tigrigna-like corpora.
+
+Words are built from the Fidel in the IPA table and drawn from a Zipf
+distribution, so word frequencies look like those of real news text. The same
+language, seed and size always give the same file. Sizes range from a few KB
+to several GB; the text is written line by line and never held in memory.
+
+    python benchmarks/synthetic_corpus.py amharic 10MB corpus.txt
+"""
+
+import argparse  # For the command line arguments
+import bisect  # For drawing from the Zipf distribution
+import os  # For interacting with the operating system
+import random  # For deterministic pseudo-random text
+import sys  # For the import path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from IPA_dict_function import IPA
+
+FIDEL = sorted(char for char in IPA if 0x1200 <= ord(char) < 0x1380)  # The main Ethiopic block
+LANGUAGE_SEEDS = {'amharic': 1, 'tigrigna': 2, 'tigregna': 2}
+HEADERS = {'amharic': 'Amharic', 'tigrigna': 'Tigregna', 'tigregna': 'Tigregna'}
+SIZE_UNITS = {'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'B': 1}
+
+def parse_size(size):
+    """
+    Parse a size such as 10KB, 5MB or 2GB.
+
+    Parameters:
+    size (str or int): The size, in bytes if it has no unit.
+
+    Returns:
+    int: The size in bytes.
+    """
+    if isinstance(size, int):
+        return size
+    size = size.strip().upper()
+    for unit, factor in SIZE_UNITS.items():
+        if size.endswith(unit):
+            return int(float(size[:-len(unit)]) * factor)
+    return int(size)
+
+def make_vocabulary(rng, vocabulary_size, max_syllables=6):
+    """
+    Build distinct synthetic words from the Fidel.
+
+    Parameters:
+    rng (random.Random): The random generator.
+    vocabulary_size (int): The number of words.
+    max_syllables (int): The maximum number of Fidel per word.
+
+    Returns:
+    list: The words, most frequent first.
+    """
+    words = []
+    seen = set()
+    while len(words) < vocabulary_size:
+        word = ''.join(rng.choices(FIDEL, k=rng.randint(1, max_syllables)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+def generate_lines(size, language='amharic', seed=0, vocabulary_size=50000, zipf_exponent=1.07, words_per_line=20, header=True):
+    """
+    Lazily generate the lines of a synthetic corpus of about size bytes (UTF-8).
+
+    Parameters:
+    size (int or str): The target size, e.g. 10485760 or '10MB'.
+    language (str): 'amharic' or 'tigrigna'; each language has its own vocabulary.
+    seed (int): Changes the generated text of a language.
+    vocabulary_size (int): The number of distinct words.
+    zipf_exponent (float): The exponent of the Zipf distribution of the words.
+    words_per_line (int): The average number of words per line (document).
+    header (bool): Start with the "Amharic"/"Tigregna" header line.
+
+    Yields:
+    str: The lines, ending with a newline.
+    """
+    size = parse_size(size)
+    rng = random.Random(LANGUAGE_SEEDS.get(language, 0) * 1000003 + seed)
+    words = make_vocabulary(rng, vocabulary_size)
+    cumulative = []
+    total = 0.0
+    for rank in range(1, vocabulary_size + 1):
+        total += 1 / rank ** zipf_exponent
+        cumulative.append(total)
+
+    written = 0
+    if header:
+        line = HEADERS.get(language, language) + '\n'
+        written += len(line.encode('utf-8'))
+        yield line
+    while written < size:
+        count = max(1, int(rng.gauss(words_per_line, words_per_line / 4)))
+        line_words = [words[bisect.bisect(cumulative, rng.random() * total)] for _ in range(count)]
+        for position in range(4, count - 1, 9):
+            line_words[position] += '፣'
+        line = ' '.join(line_words) + '።\n'
+        written += len(line.encode('utf-8'))
+        yield line
+
+def write_corpus(file_path, size, language='amharic', seed=0, **options):
+    """
+    Write a synthetic corpus to a file.
+
+    Parameters:
+    file_path (str): The path to the output file.
+    size (int or str): The target size, e.g. 10485760 or '10MB'.
+    language (str): 'amharic' or 'tigrigna'.
+    seed (int): Changes the generated text of a language.
+    options: Passed on to generate_lines.
+
+    Returns:
+    str: The path to the output file.
+    """
+    with open(file_path, mode='w', encoding='utf-8', buffering=1024 * 1024) as corpus:
+        corpus.writelines(generate_lines(size, language, seed, **options))
+    return file_path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic Zipf-distributed Ge\'ez corpus.')
+    parser.add_argument('language', choices=sorted(LANGUAGE_SEEDS))
+    parser.add_argument('size', help='target size, e.g. 10KB, 100MB, 2GB')
+    parser.add_argument('output', help='path to the output file')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--vocabulary-size', type=int, default=50000)
+    parser.add_argument('--zipf-exponent', type=float, default=1.07)
+    args = parser.parse_args(argv)
+    write_corpus(args.output, args.size, args.language, args.seed,
+                 vocabulary_size=args.vocabulary_size, zipf_exponent=args.zipf_exponent)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,368 @@
+"""
+Command-line interface streaming the analysis of any corpora to stdout.
+
+Each corpus is given as NAME[:LANGUAGE]=INPUT[,INPUT...], where an input is a
+file, a glob, or - for stdin, and the language (of the stopwords and header)
+is the name unless given, so two corpora of one language can be compared
+under different names (e.g. gojjam:amharic=... wollo:amharic=...). The counters are written to stdout as JSON Lines, CSV
+or TSV rows (corpus, chunk, table, item, count) as soon as each corpus is
+done, or after every chunk with --emit chunk, so the output can be piped into
+other tools. With two or more corpora, the pairwise word, character and
+phoneme overlaps are written at the end.
+
+    python cli.py amharic=Amharic.txt tigregna=Tegrigna.txt --jobs 4
+    python cli.py gojjam:amharic=gojjam.txt wollo:amharic=wollo.txt --similarity cosine
+    zcat news/*.txt.gz | python cli.py amharic=- --format tsv | sort -t$'\\t' -k5 -nr | head
+    python cli.py 'amharic=corpora/am/*.txt' --tables words summary --stopwords amharic=my_stopwords.txt
+
+Files are split into byte ranges read by the workers themselves; stdin is read
+in large blocks and handed to the workers in chunks of --chunk-size documents,
+so a pipe is analyzed about as fast as a file.
+
+With --profile (and --trace-memory), every corpus and comparison is recorded
+as a stage of an Instrumentation, written to cli.profile.json (see
+--profile-path).
+"""
+
+import argparse  # For the command line arguments
+import csv  # For CSV and TSV output
+import glob  # For expanding the input patterns
+import json  # For JSON Lines output
+import os  # For interacting with the operating system
+import sys  # For stdin and stdout
+
+from corpus_reader import DEFAULT_CHUNK_SIZE, DEFAULT_SHARD_SIZE, read_stream, chunked, split_byte_ranges
+from stopword_registry import register_stopwords_file
+from pipeline import TOKENIZERS
+from parallel import CorpusAnalysis, analyze_shard, analyze_documents, iter_analyses
+from overlap import LEVELS, overlap_matrix, overlap_matrices
+from ngrams import NGRAM_LEVELS, count_ngrams_range, top_ngrams, ngram_level
+from cognates import find_cognates
+from similarity import METRICS, similarity_matrices
+from report_writer import REPORT_BUFFER_SIZE
+from instrumentation import NULL_INSTRUMENTATION, add_instrumentation_arguments, instrumentation_from_args
+
+OUTPUT_FORMATS = ('jsonl', 'csv', 'tsv')
+TABLES = ('words', 'alphabets', 'phonemes', 'summary')
+ROW_FIELDS = ('corpus', 'chunk', 'table', 'item', 'count')
+STDIN = '-'
+PROFILE_PATH = 'cli'  # The instrumentation summary is written to cli.profile.json
+
+def parse_corpus(spec, default_language=None):
+    """
+    Parse a NAME[:LANGUAGE]=INPUT[,INPUT...] corpus argument.
+
+    Parameters:
+    spec (str): The argument, e.g. 'amharic=Amharic.txt', 'gojjam:amharic=gojjam.txt' or 'amharic=-'.
+    default_language (str, optional): The name and language of an argument without 'NAME='.
+
+    Returns:
+    tuple: (name, language, list of inputs); the language is the name unless given.
+
+    Raises:
+    ValueError: If the argument has no name and there is no default language, or its name or language is empty.
+    """
+    label, separator, inputs = spec.partition('=')
+    if not separator:
+        if default_language is None:
+            raise ValueError(f"'{spec}' has no language; write it as LANGUAGE={spec} or pass --language")
+        label, inputs = default_language, spec
+    name, _, language = label.partition(':')
+    if not name or (':' in label and not language):
+        raise ValueError(f"'{spec}' needs a name and a language, as NAME:LANGUAGE=INPUT")
+    return name, language or name, [item for item in inputs.split(',') if item]
+
+def expand_inputs(inputs):
+    """
+    Expand the globs of a corpus's inputs, keeping - for stdin.
+
+    Parameters:
+    inputs (list): Files, globs or -.
+
+    Returns:
+    list: The files (and -), in the order given, each glob sorted.
+
+    Raises:
+    ValueError: If an input matches no file.
+    """
+    paths = []
+    for item in inputs:
+        if item == STDIN or os.path.isfile(item):
+            paths.append(item)
+            continue
+        matches = sorted(path for path in glob.glob(item) if os.path.isfile(path))
+        if not matches:
+            raise ValueError(f"No file matches '{item}'")
+        paths.extend(matches)
+    return paths
+
+def corpus_jobs(paths, language, header, tokenizer, chunk_size=DEFAULT_CHUNK_SIZE, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Lazily turn the inputs of one corpus into analysis jobs for iter_analyses.
+
+    Parameters:
+    paths (list): The files, and - for stdin.
+    language (str, optional): The language of the stopwords to remove, or None to keep every word.
+    header (str, optional): A header line (e.g. "Amharic") to skip at the start of each input.
+    tokenizer (str): 'nltk' or 'geez'.
+    chunk_size (int): The number of stdin documents per job.
+    shard_size (int): The approximate number of file bytes per job.
+
+    Yields:
+    tuple: (function, task)
+    """
+    for path in paths:
+        if path == STDIN:
+            for chunk in chunked(read_stream(sys.stdin, header=header), chunk_size):
+                yield analyze_documents, (chunk, language, tokenizer)
+        else:
+            for start, end in split_byte_ranges(path, shard_size):
+                yield analyze_shard, (path, start, end, language, header, tokenizer)
+
+def analysis_rows(corpus, analysis, tables, chunk=None):
+    """
+    Flatten the counters of an analysis into output rows.
+
+    Parameters:
+    corpus (str): The name of the corpus.
+    analysis (CorpusAnalysis): The counters.
+    tables (iterable): The tables to write, out of TABLES.
+    chunk (int, optional): The number of the chunk, for --emit chunk.
+
+    Yields:
+    tuple: (corpus, chunk, table, item, count)
+    """
+    for table in tables:
+        if table == 'words':
+            counts = analysis.word_counts
+        elif table == 'alphabets':
+            counts = analysis.alphabet_counts()
+        elif table == 'phonemes':
+            counts = analysis.phoneme_counts
+        else:
+            counts = {
+                'documents': analysis.document_count,
+                'tokens': sum(analysis.word_counts.values()),
+                'distinct_words': len(analysis.word_counts),
+                'unique_words': len(analysis.unique_words()),
+            }
+        for item, count in counts.items():
+            yield corpus, chunk, table, item, count
+
+def ngram_rows(corpus, word_counts, sizes, levels, top=None):
+    """
+    Count the n-grams of a corpus into output rows: the table is <level>_<n>gram.
+
+    Parameters:
+    corpus (str): The name of the corpus.
+    word_counts (dict): Words as keys and their frequencies as values.
+    sizes (iterable): The values of n.
+    levels (iterable): 'character' and/or 'phoneme'.
+    top (int, optional): Only write the top most frequent n-grams of each table.
+
+    Yields:
+    tuple: (corpus, None, table, n-gram, count)
+    """
+    for level in levels:
+        for n, counts in count_ngrams_range(word_counts, sizes, level).items():
+            for ngram, count in (top_ngrams(counts, top) if top else counts.items()):
+                yield corpus, None, f'{level}_{n}gram', ngram, count
+
+def overlap_rows(matrices):
+    """
+    Flatten overlap matrices into output rows: the table is overlap.<level>, the item the other corpus.
+
+    Parameters:
+    matrices (dict): The output of overlap_matrices.
+
+    Yields:
+    tuple: (corpus, None, table, other corpus, percentage)
+    """
+    for level, matrix in matrices.items():
+        for name1, row in matrix.items():
+            for name2, percentage in row.items():
+                if name1 != name2:
+                    yield name1, None, f'overlap.{level}', name2, percentage
+
+def similarity_rows(counters, metrics):
+    """
+    Compare the counters of every pair of corpora: the table is similarity.<metric>.<table>, the item the other corpus.
+
+    Parameters:
+    counters (dict): Tables (words, alphabets, phonemes) as keys and {corpus: frequency dictionary} as values.
+    metrics (iterable): The metrics, out of similarity.METRICS.
+
+    Yields:
+    tuple: (corpus, None, table, other corpus, value)
+    """
+    for table, corpora in counters.items():
+        for metric, matrix in similarity_matrices(corpora, tuple(metrics)).items():
+            for name1, row in matrix.items():
+                for name2, value in row.items():
+                    if name1 != name2:
+                        yield name1, None, f'similarity.{metric}.{table}', name2, value
+
+def cognate_rows(word_counts, max_distance, limit=None, workers=None):
+    """
+    Find the cognates of every pair of corpora: the table is cognates.<other corpus>, the item the word pair.
+
+    Parameters:
+    word_counts (dict): Corpus names as keys and word frequency dictionaries as values.
+    max_distance (int): The largest edit distance between the IPA of two words, in phonemes.
+    limit (int, optional): Only write the best limit pairs of each pair of corpora.
+    workers (int, optional): The number of worker processes.
+
+    Yields:
+    tuple: (corpus, None, table, 'word1 word2', distance)
+    """
+    names = list(word_counts)
+    for i, name1 in enumerate(names):
+        for name2 in names[i + 1:]:
+            for word1, word2, distance, _ in find_cognates(word_counts[name1], word_counts[name2], max_distance,
+                                                           limit=limit, workers=workers):
+                yield name1, None, f'cognates.{name2}', f'{word1} {word2}', distance
+
+class RowWriter:
+    """
+    Write output rows to a stream as JSON Lines, CSV or TSV, flushing after every batch of rows.
+
+    Parameters:
+    stream (file): The output stream, opened with newline=''.
+    output_format (str): One of OUTPUT_FORMATS.
+    """
+
+    def __init__(self, stream, output_format):
+        self.stream = stream
+        self.output_format = output_format
+        if output_format != 'jsonl':
+            self.writer = csv.writer(stream, delimiter='\t' if output_format == 'tsv' else ',', lineterminator='\n')
+            self.writer.writerow(ROW_FIELDS)
+
+    def write(self, rows):
+        """Write a batch of rows and flush them, so they reach the next program of the pipe right away."""
+        if self.output_format == 'jsonl':
+            self.stream.writelines(json.dumps(dict(zip(ROW_FIELDS, row)), ensure_ascii=False) + '\n' for row in rows)
+        else:
+            self.writer.writerows(rows)
+        self.stream.flush()
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Stream word, alphabet and phoneme statistics of Amharic/Tigrigna corpora to stdout.')
+    parser.add_argument('corpora', nargs='+', metavar='NAME[:LANGUAGE]=INPUT',
+                        help='a corpus: its name, its language if not the name, and comma-separated files, globs, or - for stdin')
+    parser.add_argument('--language', help='language of the corpora given without LANGUAGE=')
+    parser.add_argument('--stopwords', action='append', default=[], metavar='LANGUAGE=FILE',
+                        help='use a stopword file with one word per line for a language (repeatable)')
+    parser.add_argument('--no-stopwords', action='store_true', help='keep the stopwords')
+    parser.add_argument('--tokenizer', choices=sorted(TOKENIZERS), default='geez',
+                        help="'geez' (default, no NLTK data needed) or 'nltk'")
+    parser.add_argument('--header', action='append', default=[], metavar='LANGUAGE=LINE',
+                        help='first line to skip for a language (default: the capitalized language, e.g. Amharic)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='jsonl', dest='output_format')
+    parser.add_argument('--tables', nargs='+', choices=TABLES, default=list(TABLES))
+    parser.add_argument('--emit', choices=('corpus', 'chunk'), default='corpus',
+                        help='write the counters when each corpus is done, or also after every chunk')
+    parser.add_argument('--overlap', nargs='*', choices=sorted(LEVELS), default=sorted(LEVELS),
+                        help='overlap levels written for two or more corpora (none to skip)')
+    parser.add_argument('--overlap-mode', choices=('exact', 'minhash'), default='exact')
+    parser.add_argument('--ngrams', nargs='+', type=int, default=[], metavar='N',
+                        help='also count the n-grams of these sizes inside the words, e.g. --ngrams 2 3')
+    parser.add_argument('--ngram-levels', nargs='+', choices=sorted(NGRAM_LEVELS), default=sorted(NGRAM_LEVELS),
+                        help='count Fidel (character) and/or IPA (phoneme) n-grams')
+    parser.add_argument('--top', type=int, help='only write the top most frequent n-grams of each table')
+    parser.add_argument('--similarity', nargs='+', choices=list(METRICS), default=[], metavar='METRIC',
+                        help='frequency-weighted similarity of the words, alphabets and phonemes of two or more corpora '
+                             f"({', '.join(METRICS)}; needs NumPy)")
+    parser.add_argument('--cognates', type=int, metavar='DISTANCE',
+                        help='also write the word pairs of two corpora whose IPA is at most DISTANCE phoneme edits apart')
+    parser.add_argument('--cognate-limit', type=int, help='only write the best pairs of each pair of corpora')
+    parser.add_argument('--jobs', '-j', type=int, help='worker processes (all cores by default, 1 runs serially)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='stdin documents per job')
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE, help='file bytes per job')
+    add_instrumentation_arguments(parser)
+    parser.add_argument('--profile-path', default=PROFILE_PATH, metavar='PATH',
+                        help='write the instrumentation summary to PATH.profile.json (and the cProfile to PATH.pstats)')
+    return parser
+
+def run(args, stream, instrument=NULL_INSTRUMENTATION):
+    """
+    Analyze the corpora of parsed arguments, writing the rows to a stream.
+
+    Parameters:
+    args (argparse.Namespace): The parsed arguments.
+    stream (file): The output stream, opened with newline=''.
+    instrument (Instrumentation): Records the analysis of every corpus and every comparison as a stage.
+    """
+    for spec in args.stopwords:
+        language, _, file_path = spec.partition('=')
+        register_stopwords_file(language, file_path)
+    headers = dict(spec.partition('=')[::2] for spec in args.header)
+
+    corpora = {}
+    for spec in args.corpora:
+        name, language, inputs = parse_corpus(spec, args.language)
+        if name in corpora:
+            raise ValueError(f"The corpus '{name}' is given twice; list its inputs separated by commas,"
+                             f" or name the corpora apart as NAME:{language}=INPUT")
+        corpora[name] = language, expand_inputs(inputs)
+    if sum(paths.count(STDIN) for _, paths in corpora.values()) > 1:
+        raise ValueError('Only one input can be read from stdin')
+
+    output = RowWriter(stream, args.output_format)
+    word_counts = {}
+    counters = {'words': {}, 'alphabets': {}, 'phonemes': {}}
+    for name, (language, paths) in corpora.items():
+        jobs = corpus_jobs(paths, None if args.no_stopwords else language, headers.get(language, language.capitalize()),
+                           args.tokenizer, args.chunk_size, args.shard_size)
+        analysis = CorpusAnalysis()
+        with instrument.stage(f'analyze.{name}', nbytes=sum(os.path.getsize(path) for path in paths if path != STDIN)) as record:
+            for chunk, chunk_analysis in enumerate(iter_analyses(jobs, args.jobs)):
+                analysis.update(chunk_analysis)
+                if args.emit == 'chunk':
+                    output.write(analysis_rows(name, chunk_analysis, args.tables, chunk))
+            output.write(analysis_rows(name, analysis, args.tables))
+            record.items = sum(analysis.word_counts.values())
+        if args.ngrams:
+            with instrument.stage(f'ngrams.{name}'):
+                output.write(ngram_rows(name, analysis.word_counts, args.ngrams, args.ngram_levels, args.top))
+        word_counts[name] = analysis.word_counts
+        if args.similarity:
+            counters['words'][name] = analysis.word_counts
+            counters['alphabets'][name] = analysis.alphabet_counts()
+            counters['phonemes'][name] = analysis.phoneme_counts
+
+    if len(word_counts) > 1 and args.overlap:
+        with instrument.stage('overlap'):
+            output.write(overlap_rows(overlap_matrices(word_counts, tuple(args.overlap), args.overlap_mode)))
+    if len(word_counts) > 1 and args.ngrams:
+        with instrument.stage('ngram_overlap'):
+            output.write(overlap_rows({f'{level}_{n}gram': overlap_matrix(word_counts, ngram_level(n, level), args.overlap_mode)
+                                       for level in args.ngram_levels for n in args.ngrams}))
+    if len(word_counts) > 1 and args.similarity:
+        with instrument.stage('similarity'):
+            output.write(similarity_rows(counters, args.similarity))
+    if len(word_counts) > 1 and args.cognates is not None:
+        with instrument.stage('cognates'):
+            output.write(cognate_rows(word_counts, args.cognates, args.cognate_limit, args.jobs))
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    stream = open(sys.stdout.fileno(), mode='w', encoding='utf-8', newline='', buffering=REPORT_BUFFER_SIZE, closefd=False)
+    instrument = instrumentation_from_args(args)
+    instrument.start()
+    try:
+        run(args, stream, instrument)
+        stream.close()
+        instrument.stop()
+        instrument.write_summary(args.profile_path)
+    except (ValueError, ImportError, FileNotFoundError) as e:
+        parser.error(str(e))
+    except BrokenPipeError:
+        # The next program of the pipe stopped reading (e.g. head): stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""
+Cross-language cognate finder over the IPA of the words.
+
+get_overlapping_words only counts a word as shared if it is spelled the same
+in both languages. Cognates often differ by one syllable or one vowel order,
+so here the IPA representations of two vocabularies are compared with a
+bounded edit (Levenshtein) distance over phonemes.
+
+Each word is converted with ipa_convert_word and segmented into phonemes
+(see phonemes.segment), so that a changed vowel order is one edit and t͡ʃ
+or kʼ count as one symbol. The phonemes are interned as single characters.
+
+Instead of comparing all pairs, one vocabulary is indexed by padded phoneme
+q-grams, partitioned by length. Two sequences within distance k have lengths
+at most k apart and share at least max(len1, len2) + q - 1 - k*q padded
+q-grams, so only the words passing both filters are compared, with a banded
+distance computation that stops as soon as the distance exceeds k.
+"""
+
+import os  # For the number of workers
+from concurrent.futures import ProcessPoolExecutor  # For the worker pool
+
+from phonemes import segment_word
+from vocabulary import Vocabulary
+
+DEFAULT_MAX_DISTANCE = 1
+DEFAULT_Q = 2
+PAD_START = '\x02'  # Padding of the q-grams, never used by a phoneme
+PAD_END = '\x03'
+PHONEME_CODE_START = 0xE000  # Phonemes are encoded as Private Use Area characters
+EXTRA_QGRAMS = 2  # Q-grams read beyond the prefix filter, to also apply a count filter
+QUERY_BATCH_SIZE = 2000  # Query words per worker task
+
+def ipa_phonemes(word):
+    """
+    Split the IPA of a word into phonemes.
+
+    Parameters:
+    word (str): The word.
+
+    Returns:
+    list: The phonemes, e.g. ['s', 'ə', 'l', 'a', 'm', 'ɨ'] for ሰላም; they join to ipa_convert_word(word).
+    """
+    return segment_word(word)
+
+def bounded_levenshtein(sequence1, sequence2, max_distance):
+    """
+    Compute the edit distance of two sequences, if it is at most max_distance.
+
+    The common prefix and suffix are skipped, only the diagonal band of width
+    2 * max_distance + 1 is computed, and the computation stops as soon as
+    every cell of a row exceeds max_distance.
+
+    Parameters:
+    sequence1 (str): The first sequence.
+    sequence2 (str): The second sequence.
+    max_distance (int): The largest distance of interest.
+
+    Returns:
+    int: The distance, or max_distance + 1 if it is larger than max_distance.
+    """
+    too_far = max_distance + 1
+    if abs(len(sequence1) - len(sequence2)) > max_distance:
+        return too_far
+    if sequence1 == sequence2:
+        return 0
+    start = 0
+    end1, end2 = len(sequence1), len(sequence2)
+    while start < end1 and start < end2 and sequence1[start] == sequence2[start]:
+        start += 1
+    while end1 > start and end2 > start and sequence1[end1 - 1] == sequence2[end2 - 1]:
+        end1 -= 1
+        end2 -= 1
+    sequence1, sequence2 = sequence1[start:end1], sequence2[start:end2]
+    if not sequence1 or not sequence2:
+        return len(sequence1) + len(sequence2)  # At most max_distance, by the length check
+
+    length2 = len(sequence2)
+    previous = [j if j <= max_distance else too_far for j in range(length2 + 1)]
+    for i, symbol1 in enumerate(sequence1, 1):
+        current = [too_far] * (length2 + 1)
+        if i <= max_distance:
+            current[0] = i
+        low = max(1, i - max_distance)
+        left = row_min = current[low - 1]
+        for j in range(low, min(length2, i + max_distance) + 1):
+            distance = previous[j - 1] if symbol1 == sequence2[j - 1] else previous[j - 1] + 1
+            if previous[j] + 1 < distance:
+                distance = previous[j] + 1
+            if left + 1 < distance:
+                distance = left + 1
+            if distance > too_far:
+                distance = too_far
+            current[j] = left = distance
+            if distance < row_min:
+                row_min = distance
+        if row_min > max_distance:
+            return too_far
+        previous = current
+    return previous[length2]
+
+def padded_qgrams(sequence, q=DEFAULT_Q):
+    """
+    Get the q-grams of a sequence padded with q - 1 start and end markers.
+
+    A q-gram occurring several times is numbered, e.g. ('ab', 0) and ('ab', 1),
+    so that the shared q-grams of two sequences are the intersection of their sets.
+
+    Parameters:
+    sequence (str): The encoded phonemes.
+    q (int): The q-gram length.
+
+    Returns:
+    list: (q-gram, occurrence) pairs.
+    """
+    padded = PAD_START * (q - 1) + sequence + PAD_END * (q - 1)
+    seen = {}
+    qgrams = []
+    for start in range(len(padded) - q + 1):
+        qgram = padded[start:start + q]
+        occurrence = seen[qgram] = seen.get(qgram, -1) + 1
+        qgrams.append((qgram, occurrence))
+    return qgrams
+
+class CognateIndex:
+    """
+    A padded q-gram index of the IPA phonemes of a vocabulary, for bounded edit distance search.
+
+    Parameters:
+    words (iterable): The words to index (e.g. the keys of a word frequency dictionary).
+    q (int): The q-gram length.
+    phonemes (Vocabulary, optional): The phoneme vocabulary shared with the queries.
+    """
+
+    def __init__(self, words, q=DEFAULT_Q, phonemes=None):
+        self.q = q
+        self.phonemes = phonemes if phonemes is not None else Vocabulary()
+        self.sequences = []  # Encoded phonemes of each entry
+        self.words = []  # Words of each entry (words with the same IPA share an entry)
+        self.entries = {}  # Encoded phonemes -> entry
+        self.by_length = {}  # Length -> entries
+        self.postings = {}  # (length, (q-gram, occurrence)) -> entries
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return len(self.words)
+
+    def encode(self, word):
+        """str: The phonemes of a word, one character per phoneme."""
+        intern = self.phonemes.intern
+        return ''.join(chr(PHONEME_CODE_START + intern(phoneme)) for phoneme in ipa_phonemes(word))
+
+    def add(self, word):
+        """Index a word."""
+        sequence = self.encode(word)
+        if not sequence:
+            return
+        entry = self.entries.get(sequence)
+        if entry is not None:
+            self.words[entry].append(word)
+            return
+        entry = self.entries[sequence] = len(self.sequences)
+        self.sequences.append(sequence)
+        self.words.append([word])
+        self.by_length.setdefault(len(sequence), []).append(entry)
+        for qgram in padded_qgrams(sequence, self.q):
+            self.postings.setdefault((len(sequence), qgram), []).append(entry)
+
+    def candidates(self, sequence, max_distance):
+        """
+        Get the entries passing the length and q-gram filters for a query.
+
+        An entry within max_distance shares at least T of the query's N q-grams,
+        so it shares at least e + 1 of any N - T + 1 + e of them: only the
+        postings of the N - T + 1 + e rarest q-grams of the query are read
+        (e = EXTRA_QGRAMS, or less for short queries).
+
+        Parameters:
+        sequence (str): The encoded phonemes of the query.
+        max_distance (int): The largest edit distance.
+
+        Returns:
+        set: The candidate entries.
+        """
+        q = self.q
+        query_qgrams = padded_qgrams(sequence, q)
+        candidates = set()
+        for length in range(max(1, len(sequence) - max_distance), len(sequence) + max_distance + 1):
+            if length not in self.by_length:
+                continue
+            threshold = max(len(sequence), length) + q - 1 - max_distance * q
+            if threshold <= 0:
+                candidates.update(self.by_length[length])  # Too short for the q-gram filter
+                continue
+            postings = sorted((self.postings.get((length, qgram), ()) for qgram in query_qgrams), key=len)
+            extra = min(threshold - 1, EXTRA_QGRAMS)
+            shared = {}
+            for entries in postings[:len(query_qgrams) - threshold + 1 + extra]:
+                for entry in entries:
+                    shared[entry] = shared.get(entry, 0) + 1
+            candidates.update(entry for entry, count in shared.items() if count > extra)
+        return candidates
+
+    def search(self, word, max_distance=DEFAULT_MAX_DISTANCE):
+        """
+        Find the indexed words whose IPA is within an edit distance of a word's IPA.
+
+        Parameters:
+        word (str): The query word.
+        max_distance (int): The largest edit distance, in phonemes.
+
+        Returns:
+        list: (indexed word, distance) pairs, closest first.
+        """
+        sequence = self.encode(word)
+        if not sequence:
+            return []
+        matches = []
+        for entry in self.candidates(sequence, max_distance):
+            distance = bounded_levenshtein(sequence, self.sequences[entry], max_distance)
+            if distance <= max_distance:
+                matches.extend((other, distance) for other in self.words[entry])
+        matches.sort(key=lambda match: match[1])
+        return matches
+
+_worker_index = None  # The CognateIndex of a worker process
+
+def _set_worker_index(index):
+    global _worker_index
+    _worker_index = index
+
+def _search_batch(task):
+    """Search a batch of query words in the worker's index (run in a worker process)."""
+    words, max_distance = task
+    return [(word, _worker_index.search(word, max_distance)) for word in words]
+
+def find_cognates(words1, words2, max_distance=DEFAULT_MAX_DISTANCE, q=DEFAULT_Q, include_identical=True,
+                  limit=None, workers=1):
+    """
+    Find the candidate cognate pairs of two vocabularies, ranked by normalized phonetic distance.
+
+    Parameters:
+    words1 (iterable): The words of the first language (e.g. a word frequency dictionary).
+    words2 (iterable): The words of the second language; these are indexed.
+    max_distance (int): The largest edit distance between the IPA of two words, in phonemes.
+    q (int): The q-gram length of the index.
+    include_identical (bool): Also return the pairs of words spelled the same (see get_overlapping_words).
+    limit (int, optional): Return only the best limit pairs.
+    workers (int): The number of worker processes for the queries. None uses all cores.
+
+    Returns:
+    list: (word1, word2, distance, similarity) tuples, where similarity is
+    1 - distance / the phoneme length of the longer word, most similar first.
+    """
+    index = CognateIndex(words2, q)
+    words1 = list(words1)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = ((word, index.search(word, max_distance)) for word in words1)
+    else:
+        tasks = [(words1[start:start + QUERY_BATCH_SIZE], max_distance)
+                 for start in range(0, len(words1), QUERY_BATCH_SIZE)]
+        with ProcessPoolExecutor(workers, initializer=_set_worker_index, initargs=(index,)) as executor:
+            results = [result for batch in executor.map(_search_batch, tasks) for result in batch]
+
+    pairs = []
+    lengths = {}
+    for word1, matches in results:
+        for word2, distance in matches:
+            if word1 == word2 and not include_identical:
+                continue
+            for word in (word1, word2):
+                if word not in lengths:
+                    lengths[word] = len(ipa_phonemes(word))
+            similarity = 1 - distance / max(lengths[word1], lengths[word2])
+            pairs.append((word1, word2, distance, similarity))
+    pairs.sort(key=lambda pair: (-pair[3], pair[2], pair[0], pair[1]))
+    return pairs[:limit] if limit else pairs
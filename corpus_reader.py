@@ -0,0 +1,378 @@
+"""
+Streaming readers for corpus files with one document per line.
+
+The readers yield documents lazily, so memory use does not grow with the size
+of the file and files larger than the available RAM can be processed. Blank
+lines are skipped, like pd.read_fwf did in load_data.
+
+For many files on slow (e.g. network-mounted) storage, FilePrefetcher and
+prefetch_files read and decode the next files in background threads while the
+current one is processed, handing the documents over in chunks through
+bounded queues, so only a fixed number of chunks is held in memory.
+"""
+
+import io  # For streams without a file descriptor
+import mmap  # For memory-mapped reading of large files
+import os  # For interacting with the operating system
+from collections import deque  # For the files in flight
+
+DEFAULT_CHUNK_SIZE = 10000  # Number of documents per chunk
+DEFAULT_SHARD_SIZE = 64 * 1024 * 1024  # Number of bytes per shard of a large file
+STREAM_BUFFER_SIZE = 1024 * 1024  # Bytes read at a time from a pipe
+DEFAULT_IO_THREADS = 4  # Threads reading files in the background
+DEFAULT_PREFETCH = 4  # Files, and chunks of each file, read ahead of the one being processed
+DEFAULT_PREFETCH_CHUNK_SIZE = 1000  # Documents per chunk handed over by a reading thread
+
+def _open_corpus(file_path, mode, encoding=None):
+    """
+    Open a corpus file.
+
+    Parameters:
+    file_path (str): The path to the file.
+    mode (str): The mode to open the file with.
+    encoding (str, optional): The text encoding of the file.
+
+    Returns:
+    file: The opened file object.
+
+    Raises:
+    FileNotFoundError: If the file does not exist; main reports it the same way load_data does.
+    """
+    return open(os.path.abspath(file_path), mode=mode, encoding=encoding)
+
+def _documents(lines, header):
+    """
+    Strip the lines, drop the blank ones and the optional header line.
+
+    Parameters:
+    lines (iterable): The raw lines of the file.
+    header (str, optional): A header line (e.g. "Amharic") to skip if it is the first document.
+
+    Yields:
+    str: The documents.
+    """
+    first = True
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if first:
+            first = False
+            if header is not None and line == header:
+                continue
+        yield line
+
+def read_lines(file_path, encoding='utf-8', header=None):
+    """
+    Lazily read the documents of a corpus file, one per line.
+
+    Parameters:
+    file_path (str): The path to the file.
+    encoding (str): The text encoding of the file.
+    header (str, optional): A header line (e.g. "Amharic") to skip if it is the first document.
+
+    Yields:
+    str: The documents.
+    """
+    with _open_corpus(file_path, 'r', encoding) as corpus:
+        yield from _documents(corpus, header)
+
+def read_mmap_lines(file_path, encoding='utf-8', header=None):
+    """
+    Lazily read the documents of a corpus file through a memory-mapped file.
+
+    Parameters:
+    file_path (str): The path to the file.
+    encoding (str): The text encoding of the file.
+    header (str, optional): A header line (e.g. "Amharic") to skip if it is the first document.
+
+    Yields:
+    str: The documents.
+    """
+    with _open_corpus(file_path, 'rb') as corpus:
+        if os.fstat(corpus.fileno()).st_size == 0:
+            return  # An empty file can not be memory-mapped
+        with mmap.mmap(corpus.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            lines = (line.decode(encoding) for line in iter(mapped.readline, b''))
+            yield from _documents(lines, header)
+
+def read_stream(stream, encoding='utf-8', header=None, buffer_size=STREAM_BUFFER_SIZE):
+    """
+    Lazily read the documents of a stream (e.g. sys.stdin), one per line.
+
+    Pipes are read in blocks of buffer_size bytes instead of the small default
+    buffer of sys.stdin, so reading a pipe is as fast as reading a file.
+
+    Parameters:
+    stream (file): The stream, e.g. sys.stdin.
+    encoding (str): The text encoding of the stream.
+    header (str, optional): A header line (e.g. "Amharic") to skip if it is the first document.
+    buffer_size (int): The number of bytes read at a time.
+
+    Yields:
+    str: The documents.
+    """
+    try:
+        descriptor = stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        yield from _documents(stream, header)  # e.g. io.StringIO
+        return
+    with open(descriptor, mode='r', encoding=encoding, buffering=buffer_size, closefd=False) as corpus:
+        yield from _documents(corpus, header)
+
+_END_OF_FILE = object()  # Put on the queue of a PrefetchedFile after its last chunk
+QUEUE_POLL_SECONDS = 0.1  # How often a blocked reading thread checks whether it was stopped
+
+class PrefetchedFile:
+    """
+    The documents of a corpus file, read in a background thread through a bounded queue.
+
+    The reading thread puts chunks of documents on the queue and waits when
+    it is full, so at most queue_size chunks of the file are held in memory.
+    Iterating yields the documents, as read_lines does.
+
+    Parameters:
+    file_path (str): The path to the file.
+    encoding (str): The text encoding of the file.
+    header (str, optional): A header line (e.g. "Amharic") to skip if it is the first document.
+    chunk_size (int): The number of documents per chunk.
+    queue_size (int): The number of chunks read ahead.
+    """
+
+    def __init__(self, file_path, encoding='utf-8', header=None, chunk_size=DEFAULT_PREFETCH_CHUNK_SIZE,
+                 queue_size=DEFAULT_PREFETCH):
+        import queue  # Imported here to keep the startup light
+        import threading
+        self.file_path = file_path
+        self.encoding = encoding
+        self.header = header
+        self.chunk_size = chunk_size
+        self.queue = queue.Queue(queue_size)
+        self.stopped = threading.Event()
+
+    def _put(self, item):
+        """Put an item on the queue, waiting while it is full; False if the file was closed meanwhile."""
+        import queue
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def read(self):
+        """Read the file into the queue (run in a reading thread). Errors are raised by the iteration."""
+        try:
+            for chunk in chunked(read_lines(self.file_path, self.encoding, self.header), self.chunk_size):
+                if not self._put(chunk):
+                    return
+        except Exception as e:
+            self._put(e)
+        else:
+            self._put(_END_OF_FILE)
+
+    def close(self):
+        """Stop the reading thread, dropping the chunks not read yet."""
+        self.stopped.set()
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is _END_OF_FILE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield from item
+
+class FilePrefetcher:
+    """
+    Read corpus files in background threads, in bounded chunks (see PrefetchedFile).
+
+    Reading releases the GIL, so the threads wait on the storage while the
+    main thread analyzes the documents already read.
+
+    Parameters:
+    workers (int): The number of reading threads.
+    encoding (str): The text encoding of the files.
+    chunk_size (int): The number of documents per chunk.
+    queue_size (int): The number of chunks read ahead in each file.
+    """
+
+    def __init__(self, workers=DEFAULT_IO_THREADS, encoding='utf-8', chunk_size=DEFAULT_PREFETCH_CHUNK_SIZE,
+                 queue_size=DEFAULT_PREFETCH):
+        from concurrent.futures import ThreadPoolExecutor  # Imported here to keep the startup light
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.files = []
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix='corpus-reader')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop the threads, dropping the documents not read yet."""
+        for prefetched in self.files:
+            prefetched.close()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def submit(self, file_path, header=None):
+        """
+        Start reading a file.
+
+        Parameters:
+        file_path (str): The path to the file.
+        header (str, optional): A header line (e.g. "Amharic") to skip if it is the first document.
+
+        Returns:
+        PrefetchedFile: Iterating it yields the documents; a missing file raises FileNotFoundError.
+        """
+        prefetched = PrefetchedFile(file_path, self.encoding, header, self.chunk_size, self.queue_size)
+        self.files = [other for other in self.files if not other.stopped.is_set()] + [prefetched]
+        self.executor.submit(prefetched.read)
+        return prefetched
+
+def prefetch_files(file_paths, encoding='utf-8', header=None, workers=DEFAULT_IO_THREADS, prefetch=DEFAULT_PREFETCH):
+    """
+    Read corpus files in background threads, yielding them in order.
+
+    At most prefetch files are read ahead of the one being processed, each
+    through a queue of at most prefetch chunks, so memory stays bounded
+    however large and however many the files are.
+
+    Parameters:
+    file_paths (iterable): The paths to the files.
+    encoding (str): The text encoding of the files.
+    header (str, optional): A header line (e.g. "Amharic") to skip at the start of each file.
+    workers (int): The number of reading threads.
+    prefetch (int): The number of files, and of chunks per file, read ahead.
+
+    Yields:
+    tuple: (file path, PrefetchedFile yielding its documents)
+    """
+    file_paths = iter(file_paths)
+    with FilePrefetcher(workers, encoding, queue_size=prefetch) as prefetcher:
+        pending = deque()
+        for file_path in file_paths:
+            pending.append((file_path, prefetcher.submit(file_path, header)))
+            if len(pending) > prefetch:
+                break
+        while pending:
+            file_path, prefetched = pending.popleft()
+            yield file_path, prefetched
+            prefetched.close()
+            next_path = next(file_paths, None)
+            if next_path is not None:
+                pending.append((next_path, prefetcher.submit(next_path, header)))
+
+def read_files(file_paths, encoding='utf-8', header=None, workers=DEFAULT_IO_THREADS, prefetch=DEFAULT_PREFETCH):
+    """
+    Lazily read the documents of many corpus files, prefetching the next files in background threads.
+
+    Parameters:
+    file_paths (iterable): The paths to the files.
+    encoding (str): The text encoding of the files.
+    header (str, optional): A header line (e.g. "Amharic") to skip at the start of each file.
+    workers (int): The number of reading threads.
+    prefetch (int): The number of files read ahead.
+
+    Yields:
+    str: The documents, file after file.
+    """
+    for _, documents in prefetch_files(file_paths, encoding, header, workers, prefetch):
+        yield from documents
+
+def chunked(documents, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Group a stream of documents into lists of at most chunk_size documents.
+
+    Parameters:
+    documents (iterable): The documents.
+    chunk_size (int): The maximum number of documents in a chunk.
+
+    Yields:
+    list: The documents of each chunk.
+    """
+    chunk = []
+    for document in documents:
+        chunk.append(document)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def read_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE, encoding='utf-8', header=None, use_mmap=False):
+    """
+    Lazily read the documents of a corpus file in fixed-size chunks.
+
+    Parameters:
+    file_path (str): The path to the file.
+    chunk_size (int): The maximum number of documents in a chunk.
+    encoding (str): The text encoding of the file.
+    header (str, optional): A header line (e.g. "Amharic") to skip if it is the first document.
+    use_mmap (bool): Read the file through a memory-mapped file.
+
+    Yields:
+    list: The documents of each chunk.
+    """
+    reader = read_mmap_lines if use_mmap else read_lines
+    return chunked(reader(file_path, encoding, header), chunk_size)
+
+def split_byte_ranges(file_path, shard_size=DEFAULT_SHARD_SIZE, start=0, end=None):
+    """
+    Split a file into byte ranges of about shard_size bytes, aligned to line starts.
+
+    Parameters:
+    file_path (str): The path to the file.
+    shard_size (int): The approximate number of bytes per range.
+    start (int): The offset to start from, at the start of a line.
+    end (int, optional): The offset to stop at, the end of the file by default.
+
+    Returns:
+    list: (start, end) byte offsets covering the file from start to end, in order.
+    """
+    with _open_corpus(file_path, 'rb') as corpus:
+        if end is None:
+            end = os.fstat(corpus.fileno()).st_size
+        boundaries = [start]
+        while boundaries[-1] + shard_size < end:
+            corpus.seek(boundaries[-1] + shard_size)
+            corpus.readline()  # Move to the start of the next line
+            if corpus.tell() >= end:
+                break
+            boundaries.append(corpus.tell())
+        if end > start:
+            boundaries.append(end)
+    return list(zip(boundaries, boundaries[1:]))
+
+def read_byte_range(file_path, start, end, encoding='utf-8', header=None):
+    """
+    Lazily read the documents of the lines starting in a byte range of a file.
+
+    Parameters:
+    file_path (str): The path to the file.
+    start (int): The offset of the first byte, at the start of a line.
+    end (int): The offset after the last byte of the range.
+    encoding (str): The text encoding of the file.
+    header (str, optional): A header line (e.g. "Amharic") to skip if it is the first document.
+
+    Yields:
+    str: The documents.
+    """
+    def lines(corpus):
+        position = start
+        corpus.seek(start)
+        while position < end:
+            line = corpus.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line.decode(encoding)
+
+    with _open_corpus(file_path, 'rb') as corpus:
+        yield from _documents(lines(corpus), header)
@@ -0,0 +1,202 @@
+"""
+Decomposition of Ethiopic syllables (Fidel) into consonant and vowel.
+
+Unicode lays the Ethiopic syllables out in rows of eight codepoints: one row
+per consonant series, one column per vowel order (1st ə, 2nd u, 3rd i, 4th a,
+5th e, 6th ɨ, 7th o), with the labialized -wa form (or an -oa variant) in
+the 8th column. So the series and the vowel order of a syllable follow from
+its codepoint:
+
+    row = codepoint & ~7, order = (codepoint & 7) + 1
+
+The exceptions are handled when the table is built: the labiovelar rows
+(ቈ, ቘ, ኈ, ኰ, ዀ, ጐ) are labialized forms of the row before them, the 8th
+column is either labialized (-WA) or an -OA variant, ፘ ፙ ፚ are palatalized
+forms, and the syllables of the Ethiopic Supplement and Extended blocks are
+matched to their series through their IPA value.
+
+FIDEL_TABLE is a list indexed by codepoint - TABLE_START, so decompose() is
+O(1). consonant_vowel_frequency builds the consonant-only and vowel-only
+frequency tables of a corpus in one vectorized pass when NumPy is installed.
+"""
+
+import unicodedata  # For telling -WA from -OA syllables
+from collections import namedtuple  # For the decomposition records
+
+from IPA_dict_function import IPA
+
+TABLE_START = 0x1200  # Ethiopic
+TABLE_END = 0x2DE0  # End of Ethiopic Extended
+MAIN_BLOCK_END = 0x1360  # Syllables of the Ethiopic block; the rest are punctuation and numbers
+
+VOWEL_ORDERS = ('ə', 'u', 'i', 'a', 'e', 'ɨ', 'o')  # Vowel of the 1st to 7th order
+LABIALIZED_ROWS = {0x1248: 0x1240, 0x1258: 0x1250, 0x1288: 0x1280, 0x12B0: 0x12A8, 0x12C0: 0x12B8, 0x1310: 0x1308}  # Row -> series
+PALATALIZED = {0x1358: 0x1228, 0x1359: 0x1218, 0x135A: 0x1348}  # ፘ ፙ ፚ -> series of ረ መ ፈ, 4th order
+SERIES_WITHOUT_IPA = {'ኸ': 'x', 'ዸ': 'ɗ'}  # Consonants of the series missing from the IPA dict (Tigrigna ኸ, ዸ)
+LABIALIZATION_MARK = 'ʷ'
+PALATALIZATION_MARK = 'ʲ'
+
+Fidel = namedtuple('Fidel', ['series', 'order', 'labialized'])
+Fidel.__doc__ = """
+The decomposition of a syllable.
+
+Attributes:
+series (str): The 1st order syllable of its consonant series, e.g. ለ for ሉ.
+order (int): The vowel order, 1 to 7 (see VOWEL_ORDERS).
+labialized (bool): Whether the consonant is labialized (e.g. ሏ, ቈ).
+"""
+
+def _split_ipa(phoneme):
+    """Split an IPA value such as 'kʼwa' into its consonant ('kʼw') and vowel ('a')."""
+    if phoneme and phoneme[-1] in VOWEL_ORDERS:
+        return phoneme[:-1], phoneme[-1]
+    return phoneme, None
+
+def _series_consonant(series):
+    """str: The IPA consonant of a series, or the series glyph itself if it has no IPA value."""
+    consonant = _split_ipa(IPA.get(series, ''))[0]
+    return consonant or SERIES_WITHOUT_IPA.get(series, series)
+
+def _decompose_main_block(codepoint):
+    """Decompose a syllable of the Ethiopic block by codepoint arithmetic, or return None."""
+    if not unicodedata.name(chr(codepoint), '').startswith('ETHIOPIC SYLLABLE'):
+        return None
+    row, column = codepoint & ~7, codepoint & 7
+    if codepoint in PALATALIZED:
+        return Fidel(chr(PALATALIZED[codepoint]), 4, False)
+    if row in LABIALIZED_ROWS:
+        return Fidel(chr(LABIALIZED_ROWS[row]), column + 1, True)
+    if column == 7:
+        if unicodedata.name(chr(codepoint)).endswith('OA'):
+            return Fidel(chr(row), 7, False)  # e.g. ሇ, an -o variant used outside Amharic
+        return Fidel(chr(row), 4, True)  # e.g. ሏ lwa
+    return Fidel(chr(row), column + 1, False)
+
+def _consonant_key(char, fidel):
+    """str: The IPA consonant of a syllable, marking labialization and palatalization."""
+    consonant = _split_ipa(IPA.get(char, ''))[0]
+    if len(consonant) > 1 and consonant[-1] == 'w':
+        consonant = consonant[:-1] + LABIALIZATION_MARK
+    elif len(consonant) > 1 and consonant[-1] == 'j':
+        consonant = consonant[:-1] + PALATALIZATION_MARK
+    if not consonant:  # e.g. ኧ, transcribed as a bare vowel
+        consonant = _series_consonant(fidel.series) + (LABIALIZATION_MARK if fidel.labialized else '')
+    return consonant
+
+def _build_table():
+    """Build FIDEL_TABLE, and the consonant and vowel of each entry."""
+    table = [None] * (TABLE_END - TABLE_START)
+    for codepoint in range(TABLE_START, MAIN_BLOCK_END):
+        table[codepoint - TABLE_START] = _decompose_main_block(codepoint)
+
+    # The Supplement and Extended syllables are matched to a series by the consonant of their IPA value
+    series_by_consonant = {}
+    for fidel in table:
+        if fidel is not None and fidel.order == 1 and not fidel.labialized:
+            series_by_consonant.setdefault(_series_consonant(fidel.series), fidel.series)
+    for char, phoneme in IPA.items():
+        codepoint = ord(char)
+        if not MAIN_BLOCK_END <= codepoint < TABLE_END:
+            continue
+        consonant, vowel = _split_ipa(phoneme)
+        labialized = len(consonant) > 1 and consonant[-1] == 'w'
+        if len(consonant) > 1 and consonant[-1] in 'wj':
+            consonant = consonant[:-1]
+        if vowel is not None and consonant in series_by_consonant:
+            table[codepoint - TABLE_START] = Fidel(series_by_consonant[consonant], VOWEL_ORDERS.index(vowel) + 1, labialized)
+
+    consonants = []  # Consonant of each consonant ID
+    consonant_ids = {}
+    consonant_of = [-1] * len(table)  # Consonant ID of each entry, -1 for none
+    vowel_of = [-1] * len(table)  # Vowel order - 1 of each entry, -1 for none
+    for offset, fidel in enumerate(table):
+        if fidel is None:
+            continue
+        consonant = _consonant_key(chr(TABLE_START + offset), fidel)
+        if consonant not in consonant_ids:
+            consonant_ids[consonant] = len(consonants)
+            consonants.append(consonant)
+        consonant_of[offset] = consonant_ids[consonant]
+        vowel_of[offset] = fidel.order - 1
+    return table, consonants, consonant_of, vowel_of
+
+FIDEL_TABLE, CONSONANTS, CONSONANT_OF, VOWEL_OF = _build_table()
+
+def decompose(char):
+    """
+    Decompose an Ethiopic syllable into consonant series, vowel order and labialization.
+
+    Parameters:
+    char (str): One character.
+
+    Returns:
+    Fidel: (series, order, labialized), or None if the character is not an Ethiopic syllable.
+    """
+    offset = ord(char) - TABLE_START
+    return FIDEL_TABLE[offset] if 0 <= offset < len(FIDEL_TABLE) else None
+
+def consonant_of(char):
+    """str: The IPA consonant of a syllable (e.g. 'l' for ሉ, 'kʼʷ' for ቈ), or None."""
+    offset = ord(char) - TABLE_START
+    if 0 <= offset < len(CONSONANT_OF) and CONSONANT_OF[offset] >= 0:
+        return CONSONANTS[CONSONANT_OF[offset]]
+    return None
+
+def vowel_of(char):
+    """str: The IPA vowel of a syllable's order (e.g. 'u' for ሉ), or None."""
+    offset = ord(char) - TABLE_START
+    if 0 <= offset < len(VOWEL_OF) and VOWEL_OF[offset] >= 0:
+        return VOWEL_ORDERS[VOWEL_OF[offset]]
+    return None
+
+_arrays = None  # NumPy versions of CONSONANT_OF and VOWEL_OF, built on first use
+
+def _count_numpy(np, word_counts):
+    """Count the consonant and vowel IDs of all the words in one vectorized pass."""
+    global _arrays
+    if _arrays is None:
+        _arrays = np.array(CONSONANT_OF, dtype=np.int64), np.array(VOWEL_OF, dtype=np.int64)
+    consonant_array, vowel_array = _arrays
+    words = list(word_counts)
+    codepoints = np.frombuffer(''.join(words).encode('utf-32-le'), dtype=np.uint32).astype(np.int64) - TABLE_START
+    weights = np.repeat(np.fromiter(word_counts.values(), dtype=np.int64, count=len(words)),
+                        np.fromiter(map(len, words), dtype=np.int64, count=len(words)))
+    inside = (codepoints >= 0) & (codepoints < len(consonant_array))
+    codepoints, weights = codepoints[inside], weights[inside]
+    results = []
+    for ids, size in ((consonant_array[codepoints], len(CONSONANTS)), (vowel_array[codepoints], len(VOWEL_ORDERS))):
+        found = ids >= 0
+        results.append(np.bincount(ids[found], weights=weights[found], minlength=size).astype(np.int64).tolist())
+    return results
+
+def _count_python(word_counts):
+    """Count the consonant and vowel IDs of all the words, one character at a time."""
+    consonant_counts = [0] * len(CONSONANTS)
+    vowel_counts = [0] * len(VOWEL_ORDERS)
+    size = len(CONSONANT_OF)
+    for word, count in word_counts.items():
+        for char in word:
+            offset = ord(char) - TABLE_START
+            if 0 <= offset < size and CONSONANT_OF[offset] >= 0:
+                consonant_counts[CONSONANT_OF[offset]] += count
+                vowel_counts[VOWEL_OF[offset]] += count
+    return consonant_counts, vowel_counts
+
+def consonant_vowel_frequency(word_counts):
+    """
+    Count the consonants and the vowels of the syllables of a corpus, weighted by the word frequencies.
+
+    Parameters:
+    word_counts (dict): Words as keys and their frequencies as values.
+
+    Returns:
+    tuple: (consonant frequency dictionary, vowel frequency dictionary), keyed by IPA symbols.
+    """
+    try:
+        import numpy as np
+    except ImportError:  # NumPy is optional
+        consonant_counts, vowel_counts = _count_python(word_counts)
+    else:
+        consonant_counts, vowel_counts = _count_numpy(np, word_counts) if word_counts else _count_python(word_counts)
+    return ({consonant: count for consonant, count in zip(CONSONANTS, consonant_counts) if count},
+            {vowel: count for vowel, count in zip(VOWEL_ORDERS, vowel_counts) if count})
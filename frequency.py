@@ -0,0 +1,44 @@
+"""
+Frequency engine shared by the word, alphabet and phoneme counters.
+
+Every count is done in a single pass over the input, and the result is a
+plain dictionary mapping each item to its frequency, in order of first
+appearance. Partial counts taken from separate shards or chunks of a corpus
+can be combined with merge_counts.
+"""
+
+from collections import Counter  # C-accelerated single pass counting
+
+def count_items(items, counter=None):
+    """
+    Count the frequency of each item in a single pass.
+
+    Parameters:
+    items (iterable): The items to count (words, alphabets or phonemes).
+    counter (dict, optional): An existing frequency dictionary to add the new counts to.
+
+    Returns:
+    dict: A dictionary with items as keys and their frequencies as values.
+    """
+    counts = Counter(items)
+    if counter is None:
+        return dict(counts)
+    for item, count in counts.items():
+        counter[item] = counter.get(item, 0) + count
+    return counter
+
+def merge_counts(*counters):
+    """
+    Merge partial frequency dictionaries into one.
+
+    Parameters:
+    counters (dict): The frequency dictionaries to merge, e.g. one per shard.
+
+    Returns:
+    dict: A new dictionary with the summed frequencies.
+    """
+    merged = {}
+    for counter in counters:
+        for item, count in counter.items():
+            merged[item] = merged.get(item, 0) + count
+    return merged
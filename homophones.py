@@ -0,0 +1,111 @@
+"""
+Homophone folding of the Fidel, derived from the IPA dict.
+
+Several Fidel series are pronounced the same (ሀ ሐ ኀ are all ha, ሰ ሠ are sə,
+ጸ ፀ are sʼə), so the same word can be spelled in several ways and its
+frequency is split across the spellings. Here every group of Fidel of the
+Ethiopic block with the same IPA value, vowel order and labialization is
+folded onto one canonical Fidel: the one with the lowest codepoint, except
+that the series in PREFERRED_SERIES (ሰ, the common spelling of sə) win over
+the others. Fidel of different orders are never folded (ሀ and ሃ are both ha
+in the IPA dict, but are different vowel orders), nor the series in
+DISTINCT_SERIES, which the IPA dict transcribes like another series although
+they are distinct phonemes (Tigrinya ቐ, ቘ are not ቀ, ቈ), nor the Ethiopic
+Supplement and Extended syllables, which write the sounds of other languages.
+
+The folding is compiled into translation tables, so it costs no extra pass:
+NORMALIZING_TABLE also deletes everything except for spaces and word
+characters, like NON_WORD_PATTERN, so it cleans and folds a document in one
+str.translate call. tokenize_geez_normalized also replaces the Ethiopic
+punctuation with spaces, like geez_tokenizer.tokenize_geez.
+"""
+
+from IPA_dict_function import IPA
+from fidel import MAIN_BLOCK_END, decompose
+from geez_tokenizer import ETHIOPIC_PUNCTUATION, NON_WORD_PATTERN
+
+PREFERRED_SERIES = ('ሰ',)  # Canonical over lower codepoints (ሠ), as the common modern spelling
+DISTINCT_SERIES = ('ቐ',)  # Tigrinya qʰ (with its labialized ቘ), transcribed as kʼ in the IPA dict
+
+def build_homophone_map(ipa, preferred_series=PREFERRED_SERIES, distinct_series=DISTINCT_SERIES):
+    """
+    Map every Fidel to the canonical Fidel of its IPA value, vowel order and labialization.
+
+    Parameters:
+    ipa (dict): Fidel as keys and IPA values as values.
+    preferred_series (tuple): Series whose Fidel are canonical over lower codepoints.
+    distinct_series (tuple): Series never folded, although their IPA value is shared.
+
+    Returns:
+    dict: Non-canonical Fidel as keys and their canonical Fidel as values.
+    """
+    def rank(char):
+        return (decompose(char).series not in preferred_series, ord(char))
+
+    groups = {}
+    for char, phoneme in ipa.items():
+        fidel = decompose(char)
+        if not phoneme or fidel is None or ord(char) >= MAIN_BLOCK_END or fidel.series in distinct_series:
+            continue
+        groups.setdefault((phoneme, fidel.order, fidel.labialized), []).append(char)
+    homophones = {}
+    for chars in groups.values():
+        canonical = min(chars, key=rank)
+        homophones.update((char, canonical) for char in chars if char != canonical)
+    return homophones
+
+HOMOPHONES = build_homophone_map(IPA)
+FOLD_TABLE = str.maketrans(HOMOPHONES)
+
+class CleaningTable(dict):
+    """
+    Translation table folding the homophones and deleting the characters matched by NON_WORD_PATTERN.
+
+    The decision for each new codepoint is stored in the table, so it is only made once.
+
+    Parameters:
+    homophones (dict): Fidel as keys and their canonical Fidel as values.
+    separators (str): Characters replaced by a space instead (e.g. the Ethiopic wordspace).
+    """
+
+    def __init__(self, homophones=HOMOPHONES, separators=''):
+        super().__init__((ord(char), canonical) for char, canonical in homophones.items())
+        self.update((ord(char), ' ') for char in separators)
+
+    def __missing__(self, codepoint):
+        value = None if NON_WORD_PATTERN.match(chr(codepoint)) else codepoint
+        self[codepoint] = value
+        return value
+
+NORMALIZING_TABLE = CleaningTable()  # clean_data and homophone folding in one pass
+NORMALIZING_SEPARATOR_TABLE = CleaningTable(separators=ETHIOPIC_PUNCTUATION)  # Separates, strips and folds
+
+def fold_homophones(text):
+    """str: The text with every Fidel replaced by its canonical homophone."""
+    return text.translate(FOLD_TABLE)
+
+def fold_tokens(tokens):
+    """
+    Fold the homophone Fidel of tokenized words.
+
+    Folding only maps Fidel to Fidel, so this gives the tokens of the normalizing cleaning pass.
+
+    Parameters:
+    tokens (iterable): The words, before the stopwords are removed.
+
+    Returns:
+    list: The normalized words.
+    """
+    return [token.translate(FOLD_TABLE) for token in tokens]
+
+def tokenize_geez_normalized(text):
+    """
+    Tokenize a document in the Ethiopic script, strip its punctuation and fold the homophone Fidel.
+
+    Parameters:
+    text (str): The raw (uncleaned) document.
+
+    Returns:
+    list: The normalized words.
+    """
+    return text.translate(NORMALIZING_SEPARATOR_TABLE).split()
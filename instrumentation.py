@@ -0,0 +1,263 @@
+"""
+Per-stage profiling and throughput instrumentation.
+
+An Instrumentation records, for every stage of a run, the wall time, the
+number of items (tokens, words, alphabets) and bytes processed with their
+throughput, the peak RSS of the process and, optionally, the live object
+count and tracemalloc peak. Hooks (callables taking the StageRecord) are
+called at the end of each stage, and a cProfile capture of the whole run can
+be switched on. The summary is written as JSON next to the Output.doc report.
+The scripts switch it on with --profile and --trace-memory (see
+add_instrumentation_arguments).
+
+When instrumentation is off, NULL_INSTRUMENTATION is used instead: its stages
+do nothing but call the stage function, so the overhead is near zero.
+"""
+
+import gc  # For the live object count
+import json  # For the summary file
+import sys  # For the platform
+import time  # For wall time
+
+try:
+    import resource  # For the peak RSS (not available on Windows)
+except ImportError:
+    resource = None
+
+def peak_rss_bytes():
+    """int: The peak resident set size of the process in bytes, or None if it is not available."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # Kilobytes on Linux
+
+class StageRecord:
+    """
+    The measurements of one stage.
+
+    Attributes:
+    name (str): The name of the stage.
+    seconds (float): The wall time.
+    items (int): The number of items (e.g. tokens) processed, if known.
+    bytes (int): The number of bytes processed, if known.
+    peak_rss (int): The peak RSS of the process at the end of the stage, in bytes.
+    objects (int): The number of live objects tracked by the garbage collector at the end of the stage.
+    traced_peak (int): The tracemalloc peak during the stage, in bytes.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = None
+        self.items = None
+        self.bytes = None
+        self.peak_rss = None
+        self.objects = None
+        self.traced_peak = None
+
+    def to_dict(self):
+        """dict: The measurements, with the throughputs."""
+        data = dict(vars(self))
+        if self.seconds:
+            data['items_per_second'] = self.items / self.seconds if self.items is not None else None
+            data['bytes_per_second'] = self.bytes / self.seconds if self.bytes is not None else None
+        return data
+
+class _Stage:
+    """Context manager measuring one stage of an Instrumentation."""
+
+    def __init__(self, instrumentation, record):
+        self.instrumentation = instrumentation
+        self.record = record
+
+    def __enter__(self):
+        if self.instrumentation.trace_memory:
+            import tracemalloc
+            tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self.record
+
+    def __exit__(self, *exc_info):
+        record = self.record
+        record.seconds = time.perf_counter() - self.start
+        record.peak_rss = peak_rss_bytes()
+        if self.instrumentation.count_objects:
+            record.objects = len(gc.get_objects())
+        if self.instrumentation.trace_memory:
+            import tracemalloc
+            record.traced_peak = tracemalloc.get_traced_memory()[1]
+        self.instrumentation.records.append(record)
+        for hook in self.instrumentation.hooks:
+            hook(record)
+
+class Instrumentation:
+    """
+    Record per-stage measurements of a run.
+
+    Parameters:
+    hooks (iterable): Callables called with the StageRecord at the end of each stage.
+    profile (bool): Capture a cProfile of the run (between start and stop).
+    trace_memory (bool): Record the tracemalloc peak of every stage.
+    count_objects (bool): Record the live object count after every stage.
+    """
+
+    enabled = True
+
+    def __init__(self, hooks=(), profile=False, trace_memory=False, count_objects=False):
+        self.hooks = list(hooks)
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.count_objects = count_objects
+        self.records = []
+        self.annotations = {}
+        self.profiler = None
+
+    def add_hook(self, hook):
+        """Call hook(record) at the end of every stage."""
+        self.hooks.append(hook)
+
+    def annotate(self, name, value):
+        """Add a JSON-serializable value (e.g. cache statistics) to the summary."""
+        self.annotations[name] = value
+
+    def start(self):
+        """Start the optional cProfile and tracemalloc captures."""
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.profile:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop(self):
+        """Stop the optional cProfile and tracemalloc captures."""
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.stop()
+
+    def stage(self, name, items=None, nbytes=None):
+        """
+        Measure a stage: with instrumentation.stage('tokenize') as record: ...
+
+        Parameters:
+        name (str): The name of the stage.
+        items (int, optional): The number of items processed (can also be set on the record).
+        nbytes (int, optional): The number of bytes processed (can also be set on the record).
+
+        Returns:
+        context manager: Gives the StageRecord of the stage.
+        """
+        record = StageRecord(name)
+        record.items, record.bytes = items, nbytes
+        return _Stage(self, record)
+
+    def call(self, name, function, *args, nbytes=None):
+        """
+        Measure a function call as a stage; the items are the length of its result, if it has one.
+
+        Parameters:
+        name (str): The name of the stage.
+        function (callable): The function to call with args.
+        nbytes (int, optional): The number of bytes processed.
+
+        Returns:
+        The result of the function.
+        """
+        with self.stage(name, nbytes=nbytes) as record:
+            result = function(*args)
+            if hasattr(result, '__len__'):
+                record.items = len(result)
+        return result
+
+    def summary(self):
+        """dict: The records of all the stages and the totals of the run."""
+        return {
+            'stages': [record.to_dict() for record in self.records],
+            'total_seconds': sum(record.seconds for record in self.records),
+            'peak_rss': peak_rss_bytes(),
+            'annotations': self.annotations,
+        }
+
+    def write_summary(self, report_path):
+        """
+        Write the summary (and the cProfile statistics, if captured) next to a report.
+
+        Parameters:
+        report_path (str): The path to the report, e.g. Output.doc.
+
+        Returns:
+        str: The path to the summary, <report_path>.profile.json.
+        """
+        summary_path = report_path + '.profile.json'
+        with open(summary_path, mode='w', encoding='utf-8') as summary_file:
+            json.dump(self.summary(), summary_file, indent=2)
+        if self.profiler is not None:
+            self.profiler.dump_stats(report_path + '.pstats')
+        return summary_path
+
+class _NullStage:
+    """Context manager of NullInstrumentation stages, measuring nothing."""
+
+    def __enter__(self):
+        return StageRecord(None)
+
+    def __exit__(self, *exc_info):
+        pass
+
+class NullInstrumentation:
+    """Instrumentation that measures nothing, used when instrumentation is off."""
+
+    enabled = False
+    _stage = _NullStage()
+
+    def add_hook(self, hook):
+        pass
+
+    def annotate(self, name, value):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def stage(self, name, items=None, nbytes=None):
+        return self._stage
+
+    def call(self, name, function, *args, nbytes=None):
+        return function(*args)
+
+    def write_summary(self, report_path):
+        return None
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+def add_instrumentation_arguments(parser):
+    """
+    Add the --profile and --trace-memory options of instrumentation_from_args to an argparse parser.
+
+    Parameters:
+    parser (argparse.ArgumentParser): The parser of a script.
+    """
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--profile', action='store_true',
+                       help='record the time, throughput and peak RSS of every stage and a cProfile of the run')
+    group.add_argument('--trace-memory', action='store_true',
+                       help='record the tracemalloc peak of every stage (slow; implies the stage records of --profile)')
+
+def instrumentation_from_args(args):
+    """
+    Build the instrumentation asked for on the command line.
+
+    Parameters:
+    args (argparse.Namespace): Arguments parsed with the options of add_instrumentation_arguments.
+
+    Returns:
+    Instrumentation or NullInstrumentation: NULL_INSTRUMENTATION if neither option is given.
+    """
+    if not (args.profile or args.trace_memory):
+        return NULL_INSTRUMENTATION
+    return Instrumentation(profile=args.profile, trace_memory=args.trace_memory)
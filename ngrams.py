@@ -0,0 +1,176 @@
+"""
+Character and phoneme n-gram frequencies.
+
+count_alphabet_frequency counts single Fidel characters and count_word_phonemes
+single IPA phonemes. This module counts the n-grams (bigrams, trigrams, ...)
+inside the words, over Fidel sequences ('character' level) or over the IPA
+sequences of the words ('phoneme' level), for language identification and
+dialect work.
+
+The symbols of the distinct words are interned as integer IDs (see
+vocabulary.Vocabulary) and laid out in one array, with 0 between the words.
+Every window of n IDs that does not cross a word is packed into one integer
+code, and the codes are counted weighted by the word frequencies, so each
+distinct word is processed once however often it occurs. NumPy does the
+sliding windows and counting when it is installed.
+
+The n-gram frequency dictionaries can be compared with overllaping_calc or
+overlap.jaccard_percentage like the word and alphabet counters, and
+ngram_level plugs them into overlap.overlap_matrix.
+"""
+
+import heapq  # For the top-k n-grams
+from array import array  # For compact symbol IDs
+
+from frequency import count_items
+from phonemes import segment_word
+from vocabulary import Vocabulary, np
+
+WORD_BOUNDARY = ' '  # Symbol padding the words when pad=True, so n-grams can mark word starts and ends
+SEPARATOR_ID = 0  # ID between the words; windows containing it are skipped
+MAX_CODE = 2 ** 63  # Packed codes must fit in an int64 for NumPy
+
+def fidel_symbols(word):
+    """str: The Fidel characters of a word."""
+    return word
+
+def ipa_symbols(word):
+    """list: The IPA phonemes of a word, as counted by count_word_phonemes."""
+    return segment_word(word)
+
+NGRAM_LEVELS = {
+    'character': fidel_symbols,
+    'phoneme': ipa_symbols,
+}
+
+def encode_words(word_counts, level='character', pad=False):
+    """
+    Lay out the symbol IDs of the distinct words in one array, with SEPARATOR_ID between the words.
+
+    Parameters:
+    word_counts (dict): Words as keys and their frequencies as values.
+    level (str): 'character' or 'phoneme'.
+    pad (bool): Add WORD_BOUNDARY before and after every word.
+
+    Returns:
+    tuple: (Vocabulary of the symbols, array of IDs shifted by 1, array of the frequency of the word at each position)
+    """
+    symbols_of = NGRAM_LEVELS[level]
+    symbols = Vocabulary()
+    intern = symbols.intern
+    ids = array('I')
+    weights = array('Q')
+    for word, count in word_counts.items():
+        word_symbols = symbols_of(word)
+        if pad:
+            word_symbols = [WORD_BOUNDARY, *word_symbols, WORD_BOUNDARY]
+        ids.extend(intern(symbol) + 1 for symbol in word_symbols)
+        ids.append(SEPARATOR_ID)
+        weights.extend((count,) * (len(word_symbols) + 1))
+    return symbols, ids, weights
+
+def _count_codes_numpy(ids, weights, n, base):
+    """Count the packed codes of the windows of n IDs with NumPy."""
+    ids = np.frombuffer(ids, dtype=np.uint32).astype(np.int64)
+    windows = np.lib.stride_tricks.sliding_window_view(ids, n)
+    valid = (windows != SEPARATOR_ID).all(axis=1)
+    codes = windows[valid] @ (base ** np.arange(n - 1, -1, -1, dtype=np.int64))
+    codes, inverse = np.unique(codes, return_inverse=True)
+    counts = np.bincount(inverse, weights=np.frombuffer(weights, dtype=np.uint64)[:len(valid)][valid])
+    return dict(zip(codes.tolist(), counts.astype(np.int64).tolist()))
+
+def _count_codes_python(ids, weights, n, base):
+    """Count the packed codes of the windows of n IDs with a rolling code."""
+    modulus = base ** n
+    counts = {}
+    code = 0
+    length = 0  # Number of symbols since the last separator
+    for position, symbol_id in enumerate(ids):
+        if symbol_id == SEPARATOR_ID:
+            code = length = 0
+            continue
+        code = (code * base + symbol_id) % modulus
+        length += 1
+        if length >= n:
+            counts[code] = counts.get(code, 0) + weights[position]
+    return counts
+
+def _decode(code, n, base, items):
+    """str: The symbols of a packed code."""
+    symbols = []
+    for _ in range(n):
+        code, symbol_id = divmod(code, base)
+        symbols.append(items[symbol_id - 1])
+    return ''.join(reversed(symbols))
+
+def count_ngrams_range(words, sizes=(2, 3), level='character', pad=False):
+    """
+    Count the n-grams of several sizes, encoding the words once.
+
+    Parameters:
+    words (dict or iterable): Words as keys and their frequencies as values, or a stream of tokens.
+    sizes (iterable): The values of n.
+    level (str): 'character' for Fidel n-grams, 'phoneme' for IPA n-grams.
+    pad (bool): Mark the word starts and ends with WORD_BOUNDARY.
+
+    Returns:
+    dict: Sizes as keys and n-gram frequency dictionaries as values.
+    """
+    word_counts = words if isinstance(words, dict) else count_items(words)
+    symbols, ids, weights = encode_words(word_counts, level, pad)
+    base = len(symbols) + 1
+    results = {}
+    for n in sizes:
+        if n < 1:
+            raise ValueError(f'n must be at least 1, not {n}')
+        if np is not None and len(ids) >= n and base ** n < MAX_CODE:
+            code_counts = _count_codes_numpy(ids, weights, n, base)
+        else:
+            code_counts = _count_codes_python(ids, weights, n, base)
+        results[n] = {_decode(code, n, base, symbols.items): count for code, count in code_counts.items()}
+    return results
+
+def count_ngrams(words, n=2, level='character', pad=False):
+    """
+    Count the n-grams inside the words, weighted by the word frequencies.
+
+    Parameters:
+    words (dict or iterable): Words as keys and their frequencies as values, or a stream of tokens.
+    n (int): The number of symbols per n-gram (2 for bigrams).
+    level (str): 'character' for Fidel n-grams, 'phoneme' for IPA n-grams.
+    pad (bool): Mark the word starts and ends with WORD_BOUNDARY.
+
+    Returns:
+    dict: N-grams as keys and their frequencies as values.
+    """
+    return count_ngrams_range(words, (n,), level, pad)[n]
+
+def top_ngrams(counts, k=20):
+    """
+    Get the most frequent n-grams.
+
+    Parameters:
+    counts (dict): N-grams as keys and their frequencies as values.
+    k (int): The number of n-grams.
+
+    Returns:
+    list: (n-gram, frequency) pairs, most frequent first.
+    """
+    return heapq.nlargest(k, counts.items(), key=lambda item: item[1])
+
+def ngram_level(n, level='character', pad=False):
+    """
+    Get a level function for overlap.overlap_matrix comparing the distinct n-grams of corpora.
+
+    Parameters:
+    n (int): The number of symbols per n-gram.
+    level (str): 'character' or 'phoneme'.
+    pad (bool): Mark the word starts and ends with WORD_BOUNDARY.
+
+    Returns:
+    callable: Takes a word frequency dictionary and returns the set of its n-grams.
+    """
+    def ngrams(words):
+        return set(count_ngrams(words, n, level, pad))
+    ngrams.__name__ = f'{level}_{n}gram'
+    return ngrams
@@ -0,0 +1,217 @@
+"""
+N-way overlap matrices between corpora at the word, character and phoneme levels.
+
+overllaping_calc compares two vocabularies with Python sets. This module
+compares any number of corpora at once and returns the full pairwise Jaccard
+overlap matrix, in percent like overllaping_calc.
+
+In 'exact' mode the vocabularies are compared as sets. In 'minhash' mode each
+vocabulary is reduced to a bottom-k MinHash sketch (the num_hashes smallest
+64-bit hashes of its items), so very large vocabularies are compared in
+memory that does not grow with their size. The estimate of a Jaccard
+similarity J has a standard error of sqrt(J * (1 - J) / num_hashes), at most
+0.5 / sqrt(num_hashes); see minhash_error_bound.
+"""
+
+import hashlib  # For stable 64-bit hashes of the items
+import heapq  # For keeping the smallest hashes
+import math  # For the error bound
+
+from IPA_dict_function import ipa_convertor_alpahbet
+
+DEFAULT_NUM_HASHES = 256
+
+def word_level(word_counts):
+    """set: The distinct words of a corpus."""
+    return set(word_counts)
+
+def character_level(word_counts):
+    """set: The distinct alphabets of the words of a corpus."""
+    return {char for word in word_counts for char in word}
+
+def phoneme_level(word_counts):
+    """set: The IPA representations of the distinct alphabets of a corpus, as in the combined phoneme overlap."""
+    return set(ipa_convertor_alpahbet(character_level(word_counts))) - {''}
+
+LEVELS = {
+    'word': word_level,
+    'character': character_level,
+    'phoneme': phoneme_level,
+}
+
+# Items fed straight into the sketches in 'minhash' mode, without building the set of a large
+# vocabulary (the character and phoneme sets are bounded by the size of the alphabet)
+SKETCH_ITEMS = {
+    'word': iter,
+}
+
+def jaccard_percentage(items1, items2):
+    """
+    Compute the Jaccard overlap of two sets of items, in percent.
+
+    Parameters:
+    items1 (set): The first set.
+    items2 (set): The second set.
+
+    Returns:
+    float: The size of the intersection over the size of the union, in percent (0 if both are empty).
+    """
+    union = len(items1 | items2)
+    return len(items1 & items2) / union * 100 if union else 0.0
+
+def stable_hash(item):
+    """
+    Hash an item to a 64-bit integer that is the same in every process.
+
+    Parameters:
+    item (str): The item to hash.
+
+    Returns:
+    int: The hash.
+    """
+    return int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def minhash_error_bound(num_hashes=DEFAULT_NUM_HASHES, z=1.96):
+    """
+    Compute the worst-case error of a MinHash Jaccard estimate.
+
+    Parameters:
+    num_hashes (int): The size of the sketches.
+    z (float): The z-score of the confidence level (1.96 for about 95%).
+
+    Returns:
+    float: The maximum absolute error of the estimate, in percentage points, at that confidence.
+    """
+    return z * 0.5 / math.sqrt(num_hashes) * 100
+
+class MinHashSketch:
+    """
+    Bottom-k MinHash sketch of a set: the num_hashes smallest hashes of its items.
+
+    Sketches of separate shards of a corpus can be merged, and can be
+    serialized with to_dict/from_dict.
+
+    Parameters:
+    num_hashes (int): The number of hashes kept.
+    items (iterable, optional): The items to add.
+    """
+
+    def __init__(self, num_hashes=DEFAULT_NUM_HASHES, items=()):
+        self.num_hashes = num_hashes
+        self._heap = []  # Negated hashes, so the largest kept hash is on top
+        self._hashes = set()
+        self.update(items)
+
+    def add_hash(self, value):
+        """Add the hash of one item."""
+        if value in self._hashes:
+            return
+        if len(self._heap) < self.num_hashes:
+            heapq.heappush(self._heap, -value)
+            self._hashes.add(value)
+        elif value < -self._heap[0]:
+            self._hashes.discard(-heapq.heappushpop(self._heap, -value))
+            self._hashes.add(value)
+
+    def update(self, items):
+        """Add items (e.g. words) to the sketch."""
+        for item in items:
+            self.add_hash(stable_hash(item))
+
+    def __len__(self):
+        """int: The number of kept hashes."""
+        return len(self._hashes)
+
+    def hashes(self):
+        """set: The kept hashes."""
+        return set(self._hashes)
+
+    def merge(self, other):
+        """
+        Merge another sketch (e.g. of another shard) into this one.
+
+        Parameters:
+        other (MinHashSketch): The sketch to merge, with the same num_hashes.
+
+        Returns:
+        MinHashSketch: This sketch.
+        """
+        for value in other._hashes:
+            self.add_hash(value)
+        return self
+
+    def jaccard_percentage(self, other):
+        """
+        Estimate the Jaccard overlap of the two sketched sets, in percent.
+
+        Parameters:
+        other (MinHashSketch): The other sketch, with the same num_hashes.
+
+        Returns:
+        float: The estimated overlap in percent.
+        """
+        union = heapq.nsmallest(self.num_hashes, self._hashes | other._hashes)
+        if not union:
+            return 0.0
+        shared = sum(1 for value in union if value in self._hashes and value in other._hashes)
+        return shared / len(union) * 100
+
+    def to_dict(self):
+        """dict: A JSON-serializable form of the sketch."""
+        return {'num_hashes': self.num_hashes, 'hashes': sorted(self._hashes)}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a sketch from to_dict output."""
+        sketch = cls(data['num_hashes'])
+        for value in data['hashes']:
+            sketch.add_hash(value)
+        return sketch
+
+def overlap_matrix(corpora, level='word', mode='exact', num_hashes=DEFAULT_NUM_HASHES):
+    """
+    Compute the pairwise overlap of N corpora at one level.
+
+    Parameters:
+    corpora (dict): Corpus names as keys and word frequency dictionaries (or word lists) as values.
+    level (str or callable): 'word', 'character' or 'phoneme', or a function returning the set of
+        items of a word frequency dictionary (e.g. ngrams.ngram_level(2); any iterable in 'minhash' mode).
+    mode (str): 'exact' for set overlap, 'minhash' for sketch estimates.
+    num_hashes (int): The sketch size in 'minhash' mode.
+
+    Returns:
+    dict: matrix[name1][name2] is the overlap of the two corpora in percent.
+    """
+    extract = LEVELS[level] if isinstance(level, str) else level
+    if mode == 'exact':
+        items = {name: extract(words) for name, words in corpora.items()}
+        similarity = jaccard_percentage
+    elif mode == 'minhash':
+        extract = SKETCH_ITEMS.get(level, extract) if isinstance(level, str) else extract
+        items = {name: MinHashSketch(num_hashes, extract(words)) for name, words in corpora.items()}
+        similarity = MinHashSketch.jaccard_percentage
+    else:
+        raise ValueError(f"Unknown overlap mode '{mode}', expected 'exact' or 'minhash'")
+
+    names = list(items)
+    matrix = {name: {} for name in names}
+    for i, name1 in enumerate(names):
+        matrix[name1][name1] = 100.0 if items[name1] else 0.0
+        for name2 in names[i + 1:]:
+            matrix[name1][name2] = matrix[name2][name1] = similarity(items[name1], items[name2])
+    return matrix
+
+def overlap_matrices(corpora, levels=tuple(LEVELS), mode='exact', num_hashes=DEFAULT_NUM_HASHES):
+    """
+    Compute the pairwise overlap of N corpora at several levels.
+
+    Parameters:
+    corpora (dict): Corpus names as keys and word frequency dictionaries (or word lists) as values.
+    levels (tuple): The levels to compare, out of 'word', 'character' and 'phoneme'.
+    mode (str): 'exact' for set overlap, 'minhash' for sketch estimates.
+    num_hashes (int): The sketch size in 'minhash' mode.
+
+    Returns:
+    dict: Levels as keys and overlap matrices (see overlap_matrix) as values.
+    """
+    return {level: overlap_matrix(corpora, level, mode, num_hashes) for level in levels}
@@ -0,0 +1,224 @@
+"""
+Multi-process corpus analysis with sharding and counter merge.
+
+The input files are split into byte ranges aligned to line starts, and every
+range is analyzed by a worker of a process pool: cleaning, tokenizing,
+stopword removal, frequency counting and IPA conversion. The per-shard
+counters are merged in file order, so the result is identical to a serial run
+(workers=1) over the same files.
+"""
+
+import os  # For interacting with the operating system
+from collections import deque  # For the jobs in flight
+from concurrent.futures import ProcessPoolExecutor  # For the worker pool
+
+from frequency import count_items
+from corpus_reader import DEFAULT_SHARD_SIZE, split_byte_ranges, read_byte_range
+from pipeline import AnalysisPipeline, nltk_tokenize
+from IPA_dict_function import ipa_convertor_alpahbet
+from phonemes import count_word_phonemes
+from instrumentation import NULL_INSTRUMENTATION
+
+class CorpusAnalysis:
+    """
+    The mergeable counters of the analysis of one language's corpus.
+
+    Attributes:
+    word_counts (dict): Words as keys and their frequencies as values.
+    phoneme_counts (dict): IPA phonemes of all the words as keys and their frequencies as values.
+    document_count (int): The number of documents analyzed.
+    """
+
+    def __init__(self, word_counts=None, phoneme_counts=None, document_count=0):
+        self.word_counts = word_counts if word_counts is not None else {}
+        self.phoneme_counts = phoneme_counts if phoneme_counts is not None else {}
+        self.document_count = document_count
+
+    def update(self, other):
+        """
+        Merge the counters of another analysis (e.g. another shard) into this one.
+
+        Parameters:
+        other (CorpusAnalysis): The analysis to merge.
+
+        Returns:
+        CorpusAnalysis: This analysis.
+        """
+        for counts, other_counts in ((self.word_counts, other.word_counts),
+                                     (self.phoneme_counts, other.phoneme_counts)):
+            for item, count in other_counts.items():
+                counts[item] = counts.get(item, 0) + count
+        self.document_count += other.document_count
+        return self
+
+    def to_dict(self):
+        """dict: A JSON-serializable form of the counters."""
+        return {'word_counts': self.word_counts, 'phoneme_counts': self.phoneme_counts,
+                'document_count': self.document_count}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild the counters from to_dict output."""
+        return cls(data['word_counts'], data['phoneme_counts'], data['document_count'])
+
+    def unique_words(self):
+        """list: The words that appear only once."""
+        return [word for word, count in self.word_counts.items() if count == 1]
+
+    def alphabets(self):
+        """list: The alphabets of the distinct words, like extract_alphabets."""
+        return [char for word in self.word_counts for char in word]
+
+    def alphabet_counts(self):
+        """dict: The frequency of each alphabet over the distinct words."""
+        return count_items(self.alphabets())
+
+    def ipa_alphabet_counts(self):
+        """dict: The frequency of the IPA representation of each alphabet over the distinct words."""
+        return count_items(ipa_convertor_alpahbet(self.alphabets()))
+
+def analyze_shard(task):
+    """
+    Analyze one byte range of a corpus file (run in a worker process).
+
+    Parameters:
+    task (tuple): (file_path, start, end, language, header, tokenizer).
+
+    Returns:
+    CorpusAnalysis: The counters of the shard.
+    """
+    file_path, start, end, language, header, tokenizer = task
+    documents = read_byte_range(file_path, start, end, header=header if start == 0 else None)
+    return analyze_documents((documents, language, tokenizer))
+
+def analyze_documents(task):
+    """
+    Analyze a batch of documents (run in a worker process).
+
+    Parameters:
+    task (tuple): (documents, language, tokenizer).
+
+    Returns:
+    CorpusAnalysis: The counters of the documents.
+    """
+    documents, language, tokenizer = task
+    result = AnalysisPipeline(language, tokenizer=tokenizer).run(documents)
+    return CorpusAnalysis(result.word_counts, count_word_phonemes(result.word_counts), result.document_count)
+
+def shard_tasks(file_paths, language, shard_size=DEFAULT_SHARD_SIZE, header=None, tokenizer=nltk_tokenize):
+    """
+    Split corpus files into analysis tasks of about shard_size bytes.
+
+    Parameters:
+    file_paths (list): The corpus files, with one document per line.
+    language (str): The language of the stopwords to remove.
+    shard_size (int): The approximate number of bytes per task.
+    header (str, optional): A header line (e.g. "Amharic") to skip at the start of each file.
+    tokenizer (str or callable): 'nltk', 'geez', or a module-level function splitting one document into a list of words.
+
+    Returns:
+    list: The tasks for analyze_shard, in file order.
+    """
+    return [(file_path, start, end, language, header, tokenizer)
+            for file_path in file_paths
+            for start, end in split_byte_ranges(file_path, shard_size)]
+
+def run_tasks(tasks, workers=None, instrument=NULL_INSTRUMENTATION):
+    """
+    Run analysis tasks on a pool of worker processes and merge their counters in order.
+
+    Parameters:
+    tasks (list): The tasks for analyze_shard.
+    workers (int, optional): The number of worker processes, all cores by default. 1 runs serially.
+    instrument (Instrumentation): Records the run as an 'analyze_shards' stage, with the tokens and bytes analyzed.
+
+    Returns:
+    CorpusAnalysis: The merged counters of all the tasks.
+    """
+    workers = workers or os.cpu_count() or 1
+    analysis = CorpusAnalysis()
+    with instrument.stage('analyze_shards', nbytes=sum(end - start for _, start, end, *_ in tasks)) as record:
+        if workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                analysis.update(analyze_shard(task))
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                for shard in executor.map(analyze_shard, tasks):
+                    analysis.update(shard)
+        record.items = sum(analysis.word_counts.values())
+    return analysis
+
+def iter_analyses(jobs, workers=None, prefetch=None):
+    """
+    Lazily run analysis jobs on a pool of worker processes, yielding their counters in order.
+
+    At most prefetch jobs are submitted ahead of the one being yielded, so a
+    stream of jobs (e.g. chunks read from a pipe) is consumed as the workers
+    keep up, and memory use does not grow with the length of the stream.
+
+    Parameters:
+    jobs (iterable): (function, task) pairs, e.g. (analyze_shard, task) or (analyze_documents, task).
+    workers (int, optional): The number of worker processes, all cores by default. 1 runs serially.
+    prefetch (int, optional): The number of jobs in flight, twice the number of workers by default.
+
+    Yields:
+    CorpusAnalysis: The counters of each job, in the order of the jobs.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for function, task in jobs:
+            yield function(task)
+        return
+    prefetch = prefetch or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for function, task in jobs:
+            pending.append(executor.submit(function, task))
+            if len(pending) >= prefetch:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def analyze_files(file_paths, language, workers=None, shard_size=DEFAULT_SHARD_SIZE, header=None, tokenizer=nltk_tokenize,
+                  instrument=NULL_INSTRUMENTATION):
+    """
+    Analyze corpus files of one language on a pool of worker processes.
+
+    Parameters:
+    file_paths (list or str): The corpus files, with one document per line.
+    language (str): The language of the stopwords to remove.
+    workers (int, optional): The number of worker processes, all cores by default. 1 runs serially.
+    shard_size (int): The approximate number of bytes analyzed by a worker at a time.
+    header (str, optional): A header line (e.g. "Amharic") to skip at the start of each file.
+    tokenizer (str or callable): 'nltk', 'geez', or a module-level function splitting one document into a list of words.
+    instrument (Instrumentation): Records the run as a stage (see run_tasks).
+
+    Returns:
+    CorpusAnalysis: The merged counters of all the files.
+    """
+    if isinstance(file_paths, str):
+        file_paths = [file_paths]
+    return run_tasks(shard_tasks(file_paths, language, shard_size, header, tokenizer), workers, instrument)
+
+def analyze_byte_range(file_path, start, end, language, workers=None, shard_size=DEFAULT_SHARD_SIZE, header=None, tokenizer=nltk_tokenize,
+                       instrument=NULL_INSTRUMENTATION):
+    """
+    Analyze the lines of one byte range of a corpus file on a pool of worker processes.
+
+    Parameters:
+    file_path (str): The corpus file, with one document per line.
+    start (int): The offset of the first byte, at the start of a line.
+    end (int): The offset after the last byte of the range.
+    language (str): The language of the stopwords to remove.
+    workers (int, optional): The number of worker processes, all cores by default. 1 runs serially.
+    shard_size (int): The approximate number of bytes analyzed by a worker at a time.
+    header (str, optional): A header line (e.g. "Amharic") to skip if the range starts the file.
+    tokenizer (str or callable): 'nltk', 'geez', or a module-level function splitting one document into a list of words.
+    instrument (Instrumentation): Records the run as a stage (see run_tasks).
+
+    Returns:
+    CorpusAnalysis: The merged counters of the range.
+    """
+    tasks = [(file_path, shard_start, shard_end, language, header, tokenizer)
+             for shard_start, shard_end in split_byte_ranges(file_path, shard_size, start, end)]
+    return run_tasks(tasks, workers, instrument)
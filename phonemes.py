@@ -0,0 +1,102 @@
+"""
+Segmentation of IPA strings into phonemes.
+
+Splitting an IPA string into single codepoints breaks multi-codepoint
+phonemes such as t͡ʃ, kʼ and d͡ʒ into meaningless pieces (t, ͡, ʃ). Here the
+phoneme inventory is built once from the values of the IPA dict: the last
+symbol of every value is its vowel (ə, u, i, a, e, ɨ, o), the rest is its
+consonant, and a trailing w or j glide (kʼw, rj) is a phoneme of its own. A
+regular expression matching the longest inventory phoneme first segments any
+IPA string, and the phonemes are streamed straight into frequency counters.
+
+The consonant and vowel split of the phoneme counts comes from the same
+inventory.
+"""
+
+import re  # For the longest-match segmenter
+
+from IPA_dict_function import IPA, ipa_convert_word
+from frequency import count_items
+
+GLIDES = ('w', 'j')
+
+def _build_inventory(ipa):
+    """
+    Build the vowel and consonant inventories from the values of the IPA dict.
+
+    Parameters:
+    ipa (dict): Fidel as keys and IPA values as values.
+
+    Returns:
+    tuple: (frozenset of vowels, frozenset of consonants)
+    """
+    values = [value for value in ipa.values() if value]
+    vowels = frozenset(value[-1] for value in values)
+    consonants = set()
+    for value in values:
+        consonant = value[:-1] if value[-1] in vowels else value
+        if len(consonant) > 1 and consonant[-1] in GLIDES:
+            consonants.add(consonant[-1])
+            consonant = consonant[:-1]
+        if consonant:
+            consonants.add(consonant)
+    return vowels, frozenset(consonants)
+
+VOWELS, CONSONANTS = _build_inventory(IPA)
+PHONEME_INVENTORY = VOWELS | CONSONANTS
+PHONEME_PATTERN = re.compile('|'.join(map(re.escape, sorted(PHONEME_INVENTORY, key=len, reverse=True))))
+
+_findall = PHONEME_PATTERN.findall
+
+def segment(ipa):
+    """list: The phonemes of an IPA string, longest match first; other characters are skipped."""
+    return _findall(ipa)
+
+def segment_word(word):
+    """list: The phonemes of the IPA of a word."""
+    return _findall(ipa_convert_word(word))
+
+def count_ipa_phonemes(ipa_words, counter=None):
+    """
+    Count the phonemes of a stream of IPA strings.
+
+    Parameters:
+    ipa_words (iterable): IPA strings, e.g. from ipa_convert_stream.
+    counter (dict, optional): An existing frequency dictionary to add the new counts to.
+
+    Returns:
+    dict: Phonemes as keys and their frequencies as values.
+    """
+    return count_items((phoneme for ipa in ipa_words for phoneme in _findall(ipa)), counter)
+
+def count_word_phonemes(word_counts, counter=None):
+    """
+    Count the phonemes of the IPA of words, weighted by the word frequencies.
+
+    Parameters:
+    word_counts (dict): Words as keys and their frequencies as values.
+    counter (dict, optional): An existing frequency dictionary to add the new counts to.
+
+    Returns:
+    dict: Phonemes as keys and their frequencies as values.
+    """
+    if counter is None:
+        counter = {}
+    for word, count in word_counts.items():
+        for phoneme in _findall(ipa_convert_word(word)):
+            counter[phoneme] = counter.get(phoneme, 0) + count
+    return counter
+
+def split_consonants_vowels(phoneme_counts):
+    """
+    Split phoneme counts into consonants and vowels, by the inventory of the IPA dict.
+
+    Parameters:
+    phoneme_counts (dict): Phonemes as keys and their frequencies as values.
+
+    Returns:
+    tuple: (consonant frequency dictionary, vowel frequency dictionary)
+    """
+    consonants = {phoneme: count for phoneme, count in phoneme_counts.items() if phoneme in CONSONANTS}
+    vowels = {phoneme: count for phoneme, count in phoneme_counts.items() if phoneme in VOWELS}
+    return consonants, vowels
@@ -0,0 +1,230 @@
+"""
+Fused single-pass analysis pipeline: clean -> tokenize -> stopword filter -> count.
+
+Every stage is a generator, so each token is processed once as it flows from
+the corpus reader to the counters, and no intermediate list of documents or
+tokens is built. Only the final counters (and an optional sample of the
+tokens) are kept, so memory is bounded by the vocabulary, not by the size of
+the corpus.
+"""
+
+from frequency import count_items, merge_counts
+from corpus_reader import DEFAULT_IO_THREADS, DEFAULT_PREFETCH, read_lines, read_mmap_lines, read_files
+from stopword_registry import get_stopwords, filter_stopwords
+from geez_tokenizer import NON_WORD_PATTERN, tokenize_geez
+from homophones import NORMALIZING_TABLE, fold_homophones, tokenize_geez_normalized
+
+def nltk_tokenize(text):
+    """
+    Tokenize a document with nltk.word_tokenize, importing NLTK on first use.
+
+    Parameters:
+    text (str): The document to tokenize.
+
+    Returns:
+    list: The tokenized words.
+    """
+    import nltk
+    return nltk.word_tokenize(text)
+
+def clean_lines(lines, normalize=False):
+    """
+    Clean a stream of documents by removing everything except for spaces and word characters.
+
+    Parameters:
+    lines (iterable): The documents, e.g. from read_lines.
+    normalize (bool): Also fold the homophone Fidel (see homophones), in the same pass.
+
+    Yields:
+    str: The cleaned documents.
+    """
+    if normalize:
+        for line in lines:
+            yield line.translate(NORMALIZING_TABLE)
+        return
+    for line in lines:
+        yield NON_WORD_PATTERN.sub('', line)
+
+def tokenize_lines(lines, tokenizer=nltk_tokenize):
+    """
+    Tokenize a stream of cleaned documents.
+
+    Parameters:
+    lines (iterable): The cleaned documents.
+    tokenizer (callable): A function splitting one document into a list of words.
+
+    Yields:
+    str: The tokenized words.
+    """
+    for line in lines:
+        yield from tokenizer(line)
+
+TOKENIZERS = {
+    'nltk': nltk_tokenize,
+    'geez': tokenize_geez,
+    'geez_normalized': tokenize_geez_normalized,
+}
+
+# Tokenizers that strip the punctuation themselves, so the documents are not cleaned first
+CLEANING_TOKENIZERS = (tokenize_geez, tokenize_geez_normalized)
+
+def get_tokenizer(tokenizer):
+    """
+    Get a tokenizer function by name ('nltk' or 'geez').
+
+    Parameters:
+    tokenizer (str or callable): The name of the tokenizer, or a tokenizer function.
+
+    Returns:
+    callable: A function splitting one document into a list of words.
+    """
+    return TOKENIZERS[tokenizer] if isinstance(tokenizer, str) else tokenizer
+
+def tokenize_documents(lines, tokenizer=nltk_tokenize, normalize=False):
+    """
+    Clean and tokenize a stream of raw documents.
+
+    Parameters:
+    lines (iterable): The raw documents, e.g. from read_lines.
+    tokenizer (str or callable): The name of the tokenizer, or a function splitting one document into a list of words.
+    normalize (bool): Fold the homophone Fidel while cleaning (the 'geez_normalized' tokenizer always does).
+
+    Yields:
+    str: The tokenized words.
+    """
+    tokenizer = get_tokenizer(tokenizer)
+    if normalize and tokenizer is tokenize_geez:
+        tokenizer = tokenize_geez_normalized
+    if tokenizer not in CLEANING_TOKENIZERS:
+        lines = clean_lines(lines, normalize)
+    return tokenize_lines(lines, tokenizer)
+
+class PipelineResult:
+    """
+    The counters kept by an AnalysisPipeline run.
+
+    Attributes:
+    word_counts (dict): Words as keys and their frequencies as values.
+    document_count (int): The number of documents processed.
+    sample (list): The first tokens of the run, up to the pipeline's sample size.
+    """
+
+    def __init__(self, word_counts=None, document_count=0, sample=None):
+        self.word_counts = word_counts if word_counts is not None else {}
+        self.document_count = document_count
+        self.sample = sample if sample is not None else []
+
+    @property
+    def token_count(self):
+        """int: The number of tokens counted, after stopword removal."""
+        return sum(self.word_counts.values())
+
+    def merge(self, other):
+        """
+        Merge the result of another run (e.g. another shard of the corpus).
+
+        Parameters:
+        other (PipelineResult): The result to merge.
+
+        Returns:
+        PipelineResult: A new merged result.
+        """
+        return PipelineResult(merge_counts(self.word_counts, other.word_counts),
+                              self.document_count + other.document_count,
+                              self.sample + other.sample)
+
+class AnalysisPipeline:
+    """
+    Chain cleaning, tokenizing, stopword filtering and counting as generators.
+
+    Parameters:
+    language (str, optional): The language whose stopwords are removed.
+    stop_words (iterable, optional): The stopwords to remove, instead of loading them by language.
+    tokenizer (str or callable): 'nltk', 'geez', 'geez_normalized', or a function splitting one document into a list of words.
+    sample_size (int): The number of tokens to keep as a sample of the run.
+    normalize (bool): Fold the homophone Fidel while cleaning; the stopwords are folded too.
+    """
+
+    def __init__(self, language=None, stop_words=None, tokenizer=nltk_tokenize, sample_size=0, normalize=False):
+        if stop_words is None:
+            stop_words = get_stopwords(language) if language else ()
+        self.tokenizer = get_tokenizer(tokenizer)
+        self.normalize = normalize or self.tokenizer is tokenize_geez_normalized
+        self.stop_words = frozenset(map(fold_homophones, stop_words)) if self.normalize else frozenset(stop_words)
+        self.sample_size = sample_size
+
+    def tokens(self, lines):
+        """
+        Stream the cleaned, tokenized words of the documents, without stopwords.
+
+        Parameters:
+        lines (iterable): The documents.
+
+        Yields:
+        str: The words.
+        """
+        tokens = tokenize_documents(lines, self.tokenizer, self.normalize)
+        if self.stop_words:
+            tokens = filter_stopwords(tokens, self.stop_words)
+        return tokens
+
+    def run(self, lines):
+        """
+        Run the pipeline over a stream of documents.
+
+        Parameters:
+        lines (iterable): The documents, e.g. from read_lines.
+
+        Returns:
+        PipelineResult: The counters of the run.
+        """
+        result = PipelineResult()
+
+        def counted(lines):
+            for line in lines:
+                result.document_count += 1
+                yield line
+
+        def sampled(tokens):
+            for word in tokens:
+                if len(result.sample) < self.sample_size:
+                    result.sample.append(word)
+                yield word
+
+        tokens = self.tokens(counted(lines))
+        if self.sample_size:
+            tokens = sampled(tokens)
+        count_items(tokens, result.word_counts)
+        return result
+
+    def run_file(self, file_path, header=None, use_mmap=False, encoding='utf-8'):
+        """
+        Run the pipeline over a corpus file with one document per line.
+
+        Parameters:
+        file_path (str): The path to the file.
+        header (str, optional): A header line (e.g. "Amharic") to skip if it is the first document.
+        use_mmap (bool): Read the file through a memory-mapped file.
+        encoding (str): The text encoding of the file.
+
+        Returns:
+        PipelineResult: The counters of the run.
+        """
+        reader = read_mmap_lines if use_mmap else read_lines
+        return self.run(reader(file_path, encoding, header))
+
+    def run_files(self, file_paths, header=None, encoding='utf-8', workers=DEFAULT_IO_THREADS, prefetch=DEFAULT_PREFETCH):
+        """
+        Run the pipeline over many corpus files, reading the next files in background threads.
+
+        Parameters:
+        file_paths (iterable): The paths to the files.
+        header (str, optional): A header line (e.g. "Amharic") to skip at the start of each file.
+        encoding (str): The text encoding of the files.
+        workers (int): The number of reading threads.
+        prefetch (int): The number of files read ahead, which bounds the memory used.
+
+        Returns:
+        PipelineResult: The counters of the run.
+        """
+        return self.run(read_files(file_paths, encoding, header, workers, prefetch))
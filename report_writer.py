@@ -0,0 +1,234 @@
+"""
+Buffered report writer and structured frequency table outputs.
+
+ReportWriter keeps one buffered UTF-8 handle open for the whole report instead
+of opening Output.doc on every write; BackgroundReportWriter does the writing
+in a background thread, so the analysis does not wait on the disk.
+
+The frequency tables can also be streamed row by row to machine-readable
+files (JSON Lines, CSV, and Parquet when pyarrow is installed), so large
+tables are never built as one string.
+"""
+
+import csv  # For CSV output
+import json  # For JSON Lines output
+from itertools import islice  # For cutting long tables into pieces
+
+REPORT_PATH = 'Output.doc'
+REPORT_BUFFER_SIZE = 1024 * 1024  # Bytes buffered before the report is written to disk
+PARQUET_BATCH_SIZE = 65536  # Rows per Parquet record batch
+REPORT_QUEUE_SIZE = 64  # Pieces of text waiting for the writer thread
+REPORT_PIECE_ITEMS = 4096  # Words or pairs per piece of text handed to the writer thread
+
+TABLE_FORMATS = ('jsonl', 'csv', 'parquet')
+
+class ReportWriter:
+    """
+    Write the text report through one buffered file handle.
+
+    Parameters:
+    file_path (str): The path to the report.
+    mode (str): 'w' to start a new report, 'a' to append to an existing one.
+    buffer_size (int): The number of bytes buffered before writing to disk.
+    """
+
+    def __init__(self, file_path=REPORT_PATH, mode='a', buffer_size=REPORT_BUFFER_SIZE):
+        self.file_path = file_path
+        self.handle = open(file_path, mode=mode, encoding='utf-8', buffering=buffer_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Flush the buffer and close the report."""
+        self.handle.close()
+
+    def write(self, text):
+        """Write text (e.g. a title) to the report."""
+        self.handle.write(text)
+
+    def write_joined(self, texts):
+        """Write a list of texts (e.g. IPA words) with nothing between them."""
+        self.handle.writelines(texts)
+
+    def write_list(self, tokens):
+        """Write a list of words, separated by spaces."""
+        self.handle.writelines(f'{word} ' for word in tokens)
+
+    def write_counts(self, counter):
+        """Write a frequency dictionary as key:value pairs, separated by spaces."""
+        self.handle.writelines(f'{key}:{value} ' for key, value in counter.items())
+
+def _pieces(texts, size=REPORT_PIECE_ITEMS):
+    """Join a stream of texts into pieces of at most size texts."""
+    texts = iter(texts)
+    while True:
+        batch = list(islice(texts, size))
+        if not batch:
+            return
+        yield ''.join(batch)
+
+class BackgroundReportWriter(ReportWriter):
+    """
+    Write the text report from a background thread, through a bounded queue.
+
+    The text is formatted by the caller and handed over in pieces. When the
+    queue is full the caller waits for the writer thread, so at most
+    queue_size pieces are held in memory. An error of the writer thread is
+    raised by the next write or by close.
+
+    Parameters:
+    file_path (str): The path to the report.
+    mode (str): 'w' to start a new report, 'a' to append to an existing one.
+    buffer_size (int): The number of bytes buffered before writing to disk.
+    queue_size (int): The number of pieces of text waiting to be written.
+    """
+
+    def __init__(self, file_path=REPORT_PATH, mode='a', buffer_size=REPORT_BUFFER_SIZE, queue_size=REPORT_QUEUE_SIZE):
+        import queue  # For handing the text to the writer thread; imported here to keep the startup light
+        import threading  # For the writer thread
+        super().__init__(file_path, mode, buffer_size)
+        self.queue = queue.Queue(queue_size)
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name='report-writer', daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        """Write the pieces of the queue until close sends None (run in the writer thread)."""
+        while True:
+            text = self.queue.get()
+            if text is None:
+                return
+            if self.error is None:
+                try:
+                    self.handle.write(text)
+                except Exception as e:  # Keep emptying the queue so the caller is never blocked
+                    self.error = e
+
+    def _raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _put(self, pieces):
+        for piece in pieces:
+            self._raise_error()
+            self.queue.put(piece)
+
+    def close(self):
+        """Wait for the queued text to be written, then flush the buffer and close the report."""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        super().close()
+        self._raise_error()
+
+    def write(self, text):
+        """Write text (e.g. a title) to the report."""
+        self._put((text,))
+
+    def write_joined(self, texts):
+        """Write a list of texts (e.g. IPA words) with nothing between them."""
+        self._put(_pieces(texts))
+
+    def write_list(self, tokens):
+        """Write a list of words, separated by spaces."""
+        self._put(_pieces(f'{word} ' for word in tokens))
+
+    def write_counts(self, counter):
+        """Write a frequency dictionary as key:value pairs, separated by spaces."""
+        self._put(_pieces(f'{key}:{value} ' for key, value in counter.items()))
+
+def _rows(tables):
+    """
+    Flatten named frequency tables into (table, item, count) rows.
+
+    Parameters:
+    tables (dict): Table names as keys and frequency dictionaries as values.
+
+    Yields:
+    tuple: (table, item, count)
+    """
+    for table, counter in tables.items():
+        for item, count in counter.items():
+            yield table, item, count
+
+def write_tables_jsonl(tables, file_path):
+    """
+    Stream frequency tables to a JSON Lines file, one {"table", "item", "count"} object per line.
+
+    Parameters:
+    tables (dict): Table names as keys and frequency dictionaries as values.
+    file_path (str): The path to the output file.
+    """
+    with open(file_path, mode='w', encoding='utf-8', buffering=REPORT_BUFFER_SIZE) as output:
+        for table, item, count in _rows(tables):
+            output.write(json.dumps({'table': table, 'item': item, 'count': count}, ensure_ascii=False))
+            output.write('\n')
+
+def write_tables_csv(tables, file_path):
+    """
+    Stream frequency tables to a CSV file with table, item and count columns.
+
+    Parameters:
+    tables (dict): Table names as keys and frequency dictionaries as values.
+    file_path (str): The path to the output file.
+    """
+    with open(file_path, mode='w', encoding='utf-8', newline='', buffering=REPORT_BUFFER_SIZE) as output:
+        writer = csv.writer(output)
+        writer.writerow(('table', 'item', 'count'))
+        writer.writerows(_rows(tables))
+
+def write_tables_parquet(tables, file_path, batch_size=PARQUET_BATCH_SIZE):
+    """
+    Stream frequency tables to a Parquet file with table, item and count columns, in record batches.
+
+    Parameters:
+    tables (dict): Table names as keys and frequency dictionaries as values.
+    file_path (str): The path to the output file.
+    batch_size (int): The number of rows per record batch.
+
+    Raises:
+    ImportError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError('Parquet output needs pyarrow. Please install it with: pip install pyarrow') from e
+    schema = pa.schema([('table', pa.string()), ('item', pa.string()), ('count', pa.int64())])
+    with pq.ParquetWriter(file_path, schema) as writer:
+        batch = []
+        for row in _rows(tables):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                writer.write_batch(pa.RecordBatch.from_arrays([pa.array(column) for column in zip(*batch)], schema=schema))
+                batch = []
+        if batch:
+            writer.write_batch(pa.RecordBatch.from_arrays([pa.array(column) for column in zip(*batch)], schema=schema))
+
+TABLE_WRITERS = {
+    'jsonl': write_tables_jsonl,
+    'csv': write_tables_csv,
+    'parquet': write_tables_parquet,
+}
+
+def write_tables(tables, file_path, table_format):
+    """
+    Stream frequency tables to a machine-readable file.
+
+    Parameters:
+    tables (dict): Table names as keys and frequency dictionaries as values.
+    file_path (str): The path to the output file.
+    table_format (str): One of 'jsonl', 'csv' or 'parquet'.
+
+    Raises:
+    ValueError: If the format is unknown.
+    ImportError: If the format needs a library that is not installed (pyarrow for 'parquet').
+    """
+    if table_format not in TABLE_WRITERS:
+        raise ValueError(f"Unknown table format '{table_format}', expected one of {', '.join(TABLE_FORMATS)}")
+    TABLE_WRITERS[table_format](tables, file_path)
@@ -0,0 +1,191 @@
+"""
+Incremental re-analysis of growing corpora with a persistent on-disk cache.
+
+Corpora that only grow by appended lines do not need to be analyzed from
+scratch every night. For every corpus file the cache stores the counters of
+the bytes already processed (word counts, IPA phoneme counts and document
+count; the unique words are derived from the word counts), together with the
+file path, the number of processed bytes, a SHA-256 hash of those bytes and
+the analysis options.
+
+On a re-run, the processed bytes are hashed again. If they are unchanged,
+only the new bytes are analyzed and merged into the cached counters. If the
+file was rewritten or truncated, or the options changed, the whole file is
+analyzed again.
+"""
+
+import hashlib  # For hashing the processed bytes
+import json  # For the cache files
+import os  # For interacting with the operating system
+
+from corpus_reader import DEFAULT_SHARD_SIZE
+from parallel import CorpusAnalysis, analyze_byte_range
+from pipeline import nltk_tokenize
+
+CACHE_DIR = '.analysis_cache'
+HASH_BLOCK_SIZE = 1024 * 1024  # Bytes read at a time while hashing
+CACHE_VERSION = 2  # 2: phonemes are segmented (t͡ʃ is one phoneme)
+
+def _option_name(option):
+    """Name an analysis option (e.g. a tokenizer function) so it can be stored in the cache."""
+    if callable(option):
+        return f'{option.__module__}.{option.__qualname__}'
+    return option
+
+def cache_path(file_path, cache_dir=CACHE_DIR):
+    """
+    Get the cache file of a corpus file.
+
+    Parameters:
+    file_path (str): The corpus file.
+    cache_dir (str): The directory of the cache files.
+
+    Returns:
+    str: The path to the cache file.
+    """
+    key = hashlib.sha256(os.path.abspath(file_path).encode('utf-8')).hexdigest()[:32]
+    return os.path.join(cache_dir, f'{key}.json')
+
+def load_entry(file_path, cache_dir=CACHE_DIR):
+    """
+    Load the cache entry of a corpus file.
+
+    Parameters:
+    file_path (str): The corpus file.
+    cache_dir (str): The directory of the cache files.
+
+    Returns:
+    dict: The cache entry, or None if there is no usable entry.
+    """
+    try:
+        with open(cache_path(file_path, cache_dir), encoding='utf-8') as cache_file:
+            entry = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+    if entry.get('version') != CACHE_VERSION or entry.get('path') != os.path.abspath(file_path):
+        return None
+    return entry
+
+def save_entry(file_path, entry, cache_dir=CACHE_DIR):
+    """
+    Save the cache entry of a corpus file, replacing the old one atomically.
+
+    Parameters:
+    file_path (str): The corpus file.
+    entry (dict): The cache entry.
+    cache_dir (str): The directory of the cache files.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = cache_path(file_path, cache_dir)
+    with open(path + '.tmp', mode='w', encoding='utf-8') as cache_file:
+        json.dump(entry, cache_file, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+
+def _hash_and_find_line_end(file_path, verify_end, verify_digest):
+    """
+    Hash a file in one sequential read, checking the hash of its first verify_end bytes.
+
+    Parameters:
+    file_path (str): The corpus file.
+    verify_end (int): The number of already processed bytes (0 for none).
+    verify_digest (str, optional): The expected SHA-256 of the processed bytes.
+
+    Returns:
+    tuple: (whether the processed bytes are unchanged, offset after the last complete line,
+            SHA-256 of the bytes up to that offset)
+    """
+    digest = hashlib.sha256()
+    position = 0
+    line_end, line_end_digest = 0, digest.hexdigest()
+    unchanged = verify_digest is None or verify_end == 0
+    with open(file_path, 'rb') as corpus:
+        while True:
+            block = corpus.read(HASH_BLOCK_SIZE if position >= verify_end else min(HASH_BLOCK_SIZE, verify_end - position))
+            if not block:
+                break
+            newline = block.rfind(b'\n')
+            if newline >= 0:
+                digest.update(block[:newline + 1])
+                line_end, line_end_digest = position + newline + 1, digest.hexdigest()
+                digest.update(block[newline + 1:])
+            else:
+                digest.update(block)
+            position += len(block)
+            if position == verify_end and verify_digest is not None:
+                unchanged = digest.hexdigest() == verify_digest
+                if not unchanged:
+                    break
+    return unchanged, line_end, line_end_digest
+
+def _tail_is_complete(file_path, start, end):
+    """
+    Check that the unterminated last line of a file ends on a whole UTF-8 character.
+
+    A line being appended can stop in the middle of a multi-byte character;
+    such a tail is left out until more text arrives.
+
+    Parameters:
+    file_path (str): The corpus file.
+    start (int): The offset of the last line.
+    end (int): The size of the file.
+
+    Returns:
+    bool: Whether the bytes of the line decode.
+    """
+    with open(file_path, 'rb') as corpus:
+        corpus.seek(start)
+        tail = corpus.read(end - start)
+    try:
+        tail.decode('utf-8')
+    except UnicodeDecodeError:
+        return False
+    return True
+
+def analyze_incremental(file_path, language, cache_dir=CACHE_DIR, workers=None, shard_size=DEFAULT_SHARD_SIZE,
+                        header=None, tokenizer=nltk_tokenize):
+    """
+    Analyze a corpus file, reusing the cached counters of the bytes already processed.
+
+    Parameters:
+    file_path (str): The corpus file, with one document per line.
+    language (str): The language of the stopwords to remove.
+    cache_dir (str): The directory of the cache files.
+    workers (int, optional): The number of worker processes, all cores by default. 1 runs serially.
+    shard_size (int): The approximate number of bytes analyzed by a worker at a time.
+    header (str, optional): A header line (e.g. "Amharic") to skip at the start of the file.
+    tokenizer (str or callable): 'nltk', 'geez', or a module-level function splitting one document into a list of words.
+
+    Returns:
+    CorpusAnalysis: The counters of the whole file.
+    """
+    options = {'language': language, 'header': header, 'tokenizer': _option_name(tokenizer)}
+    entry = load_entry(file_path, cache_dir)
+    size = os.path.getsize(file_path)
+    if entry is not None and entry['options'] != options:
+        entry = None  # Cached with other options
+
+    processed = entry['processed_bytes'] if entry else 0
+    unchanged = processed <= size
+    if unchanged:
+        unchanged, line_end, digest = _hash_and_find_line_end(file_path, processed, entry['sha256'] if entry else None)
+    if not unchanged:
+        print(f"{file_path} was rewritten since the last run, analyzing the whole file again.")
+        entry, processed = None, 0
+        unchanged, line_end, digest = _hash_and_find_line_end(file_path, 0, None)
+
+    analysis = CorpusAnalysis.from_dict(entry['analysis']) if entry else CorpusAnalysis()
+    analysis.update(analyze_byte_range(file_path, processed, line_end, language, workers, shard_size, header, tokenizer))
+    save_entry(file_path, {
+        'version': CACHE_VERSION,
+        'path': os.path.abspath(file_path),
+        'options': options,
+        'processed_bytes': line_end,
+        'sha256': digest,
+        'analysis': analysis.to_dict(),
+    }, cache_dir)
+
+    if line_end < size and _tail_is_complete(file_path, line_end, size):
+        # The last line is not complete yet: count it now, but do not cache it,
+        # since more text may still be appended to it (a tail cut inside a character is skipped)
+        analysis.update(analyze_byte_range(file_path, line_end, size, language, 1, shard_size, header, tokenizer))
+    return analysis
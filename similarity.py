@@ -0,0 +1,235 @@
+"""
+Frequency-weighted similarity metrics between corpora.
+
+overllaping_calc and the overlap module compare the sets of words, alphabets
+or phonemes, so a word used once counts as much as a word used a thousand
+times. Here the frequency dictionaries of two or more corpora are aligned
+into one NumPy matrix over the union of their items (one row per corpus) and
+compared with:
+
+    weighted_jaccard  sum(min(u, v)) / sum(max(u, v))
+    cosine            u . v / (|u| |v|)
+    jensen_shannon    Jensen-Shannon divergence of the frequency distributions, in bits (0 to 1)
+    spearman          Spearman rank correlation of the frequencies
+
+The alignment and the metrics run in NumPy (the dictionaries are read with
+map and np.fromiter, without a Python loop per item), so vocabularies of
+millions of items are compared in seconds. similarity_matrix and
+pair_similarities compare many pairs of corpora at once, in batches of rows.
+
+NumPy is required by this module only.
+"""
+
+from itertools import chain  # For the union of the items
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+BATCH_ELEMENTS = 2 ** 24  # Matrix cells per batch of pairs, to bound the temporary arrays
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('The similarity metrics need NumPy. Please install it with: pip install numpy')
+
+def align_counts(counters):
+    """
+    Align frequency dictionaries into one matrix over the union of their items.
+
+    Parameters:
+    counters (iterable): Frequency dictionaries (words, alphabets, phonemes, n-grams, ...).
+
+    Returns:
+    tuple: (list of the items, float64 matrix where matrix[i, j] is the frequency of item j in counter i)
+    """
+    _require_numpy()
+    counters = list(counters)
+    items = list(dict.fromkeys(chain.from_iterable(counters)))
+    position = dict(zip(items, range(len(items))))
+    matrix = np.zeros((len(counters), len(items)))
+    for row, counts in zip(matrix, counters):
+        columns = np.fromiter(map(position.__getitem__, counts), dtype=np.int64, count=len(counts))
+        row[columns] = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    return items, matrix
+
+def weighted_jaccard(u, v):
+    """
+    Compute the weighted (Ruzicka) Jaccard similarity of aligned frequency vectors.
+
+    Parameters:
+    u (numpy.ndarray): Frequencies, one vector or one row per corpus.
+    v (numpy.ndarray): Frequencies aligned with u.
+
+    Returns:
+    float or numpy.ndarray: sum(min) / sum(max) over the last axis, 0 to 1 (0 if both are empty).
+    """
+    largest = np.maximum(u, v).sum(axis=-1)
+    smallest = np.minimum(u, v).sum(axis=-1)
+    return np.divide(smallest, largest, out=np.zeros_like(largest), where=largest > 0)
+
+def cosine(u, v):
+    """
+    Compute the cosine similarity of aligned frequency vectors.
+
+    Parameters:
+    u (numpy.ndarray): Frequencies, one vector or one row per corpus.
+    v (numpy.ndarray): Frequencies aligned with u.
+
+    Returns:
+    float or numpy.ndarray: The cosine over the last axis, 0 to 1 (0 if either is empty).
+    """
+    norms = np.sqrt(np.einsum('...i,...i->...', u, u) * np.einsum('...i,...i->...', v, v))
+    dot = np.einsum('...i,...i->...', u, v)
+    return np.divide(dot, norms, out=np.zeros_like(norms), where=norms > 0)
+
+def _kl_to_mixture(p, m):
+    """The Kullback-Leibler divergence of p from m in bits, where m > 0 wherever p > 0."""
+    ratio = np.divide(p, m, out=np.ones_like(p), where=p > 0)
+    return (p * np.log2(ratio)).sum(axis=-1)
+
+def jensen_shannon(u, v):
+    """
+    Compute the Jensen-Shannon divergence of the distributions of aligned frequency vectors.
+
+    Parameters:
+    u (numpy.ndarray): Frequencies, one vector or one row per corpus.
+    v (numpy.ndarray): Frequencies aligned with u.
+
+    Returns:
+    float or numpy.ndarray: The divergence in bits over the last axis, 0 (same distribution) to 1
+    (no shared item); nan if either is empty.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        p = u / u.sum(axis=-1, keepdims=True)
+        q = v / v.sum(axis=-1, keepdims=True)
+    m = (p + q) / 2
+    return (_kl_to_mixture(p, m) + _kl_to_mixture(q, m)) / 2
+
+def rank_rows(matrix):
+    """
+    Rank the frequencies of each row, giving tied frequencies their average rank.
+
+    Parameters:
+    matrix (numpy.ndarray): Frequencies, one vector or one row per corpus.
+
+    Returns:
+    numpy.ndarray: The ranks, 1 for the smallest frequency.
+    """
+    matrix = np.atleast_2d(matrix)
+    ranks = np.empty(matrix.shape)
+    for row, values in enumerate(matrix):
+        order = np.argsort(values, kind='stable')
+        ordered = values[order]
+        starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])  # First position of each tie group
+        ends = np.r_[starts[1:], len(ordered)]
+        group = np.repeat(np.arange(len(starts)), ends - starts)
+        ranks[row, order] = (starts + ends + 1)[group] / 2
+    return ranks
+
+def _pearson(u, v):
+    """The Pearson correlation of aligned vectors over the last axis, nan if either is constant."""
+    u = u - u.mean(axis=-1, keepdims=True)
+    v = v - v.mean(axis=-1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.einsum('...i,...i->...', u, v) / np.sqrt(np.einsum('...i,...i->...', u, u) * np.einsum('...i,...i->...', v, v))
+
+def spearman(u, v):
+    """
+    Compute the Spearman rank correlation of aligned frequency vectors.
+
+    Items missing from a corpus count as frequency 0.
+
+    Parameters:
+    u (numpy.ndarray): Frequencies, one vector or one row per corpus.
+    v (numpy.ndarray): Frequencies aligned with u.
+
+    Returns:
+    float or numpy.ndarray: The correlation over the last axis, -1 to 1; nan if either is constant.
+    """
+    result = _pearson(rank_rows(u), rank_rows(v))
+    return result if np.ndim(u) > 1 or np.ndim(v) > 1 else result[0]
+
+METRICS = {
+    'weighted_jaccard': weighted_jaccard,
+    'cosine': cosine,
+    'jensen_shannon': jensen_shannon,
+    'spearman': spearman,
+}
+
+def pair_similarities(matrix, pairs, metric='weighted_jaccard'):
+    """
+    Compare many pairs of rows of an aligned matrix, in batches.
+
+    Parameters:
+    matrix (numpy.ndarray): Aligned frequencies, one row per corpus (see align_counts).
+    pairs (array-like): (row1, row2) index pairs.
+    metric (str): One of METRICS.
+
+    Returns:
+    numpy.ndarray: The metric of each pair.
+    """
+    _require_numpy()
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {', '.join(METRICS)}")
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    function = METRICS[metric]
+    if metric == 'spearman':
+        matrix, function = rank_rows(matrix), _pearson  # Rank each row once, not once per pair
+    results = np.empty(len(pairs))
+    batch_size = max(1, BATCH_ELEMENTS // max(1, matrix.shape[1]))
+    for start in range(0, len(pairs), batch_size):
+        batch = pairs[start:start + batch_size]
+        results[start:start + batch_size] = function(matrix[batch[:, 0]], matrix[batch[:, 1]])
+    return results
+
+def similarity_matrix(matrix, metric='weighted_jaccard'):
+    """
+    Compare every pair of rows of an aligned matrix.
+
+    Parameters:
+    matrix (numpy.ndarray): Aligned frequencies, one row per corpus (see align_counts).
+    metric (str): One of METRICS.
+
+    Returns:
+    numpy.ndarray: A symmetric square matrix of the metric.
+    """
+    first, second = np.triu_indices(len(matrix))
+    values = pair_similarities(matrix, np.column_stack((first, second)), metric)
+    result = np.empty((len(matrix), len(matrix)))
+    result[first, second] = result[second, first] = values
+    return result
+
+def compare_counts(counter1, counter2, metrics=tuple(METRICS)):
+    """
+    Compare two frequency dictionaries.
+
+    Parameters:
+    counter1 (dict): Items as keys and their frequencies as values.
+    counter2 (dict): Items as keys and their frequencies as values.
+    metrics (tuple): The metrics to compute, out of METRICS.
+
+    Returns:
+    dict: Metric names as keys and their values as values.
+    """
+    _, matrix = align_counts((counter1, counter2))
+    return {metric: float(pair_similarities(matrix, (0, 1), metric)[0]) for metric in metrics}
+
+def similarity_matrices(corpora, metrics=tuple(METRICS)):
+    """
+    Compare N corpora with several metrics, aligning their counters once.
+
+    Parameters:
+    corpora (dict): Corpus names as keys and frequency dictionaries as values.
+    metrics (tuple): The metrics to compute, out of METRICS.
+
+    Returns:
+    dict: Metrics as keys and matrices as values, where matrix[name1][name2] is the metric of the two corpora.
+    """
+    names = list(corpora)
+    _, matrix = align_counts(corpora.values())
+    results = {}
+    for metric in metrics:
+        values = similarity_matrix(matrix, metric).tolist()
+        results[metric] = {name1: dict(zip(names, row)) for name1, row in zip(names, values)}
+    return results
@@ -0,0 +1,362 @@
+"""
+Bounded-memory approximate statistics for unbounded token streams.
+
+The exact dictionaries built by count_frequency and get_unique_words grow with
+the vocabulary. ApproximateStats keeps a fixed amount of memory instead:
+
+* HyperLogLog estimates the number of distinct words,
+* a Count-Min sketch estimates the frequency of any word,
+* Space-Saving keeps the top-k heavy hitters,
+* a bottom-k distinct sample of words with exact counts estimates the number
+  of hapax legomena (words that appear only once), standing in for
+  get_unique_words.
+
+Every sketch uses stable 64-bit hashes, can be merged with the sketch of
+another shard or process, and can be serialized with to_dict/from_dict
+(JSON-compatible).
+"""
+
+import base64  # For serializing the HyperLogLog registers
+import heapq  # For the Space-Saving minimum and the distinct sample
+import itertools  # For reading the token stream in chunks
+import math  # For the sketch dimensions
+from array import array  # For compact counter rows
+from collections import Counter  # For pre-aggregating each chunk
+
+from overlap import stable_hash
+
+HASH_BITS = 64
+DEFAULT_CHUNK_SIZE = 100000  # Tokens pre-aggregated before updating the sketches
+
+class HyperLogLog:
+    """
+    HyperLogLog estimate of the number of distinct items.
+
+    Parameters:
+    precision (int): log2 of the number of registers; the relative error is about 1.04 / sqrt(2 ** precision).
+    """
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add_hash(self, value):
+        """Add the 64-bit hash of one item."""
+        index = value >> (HASH_BITS - self.precision)
+        rest = value & ((1 << (HASH_BITS - self.precision)) - 1)
+        rank = HASH_BITS - self.precision - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self):
+        """int: The estimated number of distinct items."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))  # Linear counting for small cardinalities
+        return round(raw)
+
+    def merge(self, other):
+        """Merge another HyperLogLog with the same precision into this one."""
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def to_dict(self):
+        """dict: A JSON-serializable form of the sketch."""
+        return {'precision': self.precision, 'registers': base64.b64encode(bytes(self.registers)).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a sketch from to_dict output."""
+        sketch = cls(data['precision'])
+        sketch.registers = bytearray(base64.b64decode(data['registers']))
+        return sketch
+
+class CountMinSketch:
+    """
+    Count-Min sketch estimate of item frequencies.
+
+    Estimates never undercount. With probability 1 - delta they overcount by
+    at most epsilon times the total count.
+
+    Parameters:
+    epsilon (float): The relative error bound.
+    delta (float): The probability of exceeding the error bound.
+    """
+
+    def __init__(self, epsilon=0.0001, delta=0.001):
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.rows = [array('Q', bytes(8 * self.width)) for _ in range(self.depth)]
+        self.total = 0
+
+    def _indexes(self, value):
+        low, high = value & 0xFFFFFFFF, value >> 32
+        return [(low + row * high) % self.width for row in range(self.depth)]
+
+    def add_hash(self, value, count=1):
+        """Add count occurrences of the item with this 64-bit hash."""
+        for row, index in zip(self.rows, self._indexes(value)):
+            row[index] += count
+        self.total += count
+
+    def estimate_hash(self, value):
+        """int: The estimated count of the item with this 64-bit hash."""
+        return min(row[index] for row, index in zip(self.rows, self._indexes(value)))
+
+    def estimate(self, item):
+        """int: The estimated count of an item."""
+        return self.estimate_hash(stable_hash(item))
+
+    def merge(self, other):
+        """Merge another Count-Min sketch with the same dimensions into this one."""
+        for row, other_row in zip(self.rows, other.rows):
+            for index, count in enumerate(other_row):
+                if count:
+                    row[index] += count
+        self.total += other.total
+        return self
+
+    def to_dict(self):
+        """dict: A JSON-serializable form of the sketch."""
+        return {'width': self.width, 'depth': self.depth, 'total': self.total,
+                'rows': [base64.b64encode(row.tobytes()).decode('ascii') for row in self.rows]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a sketch from to_dict output."""
+        sketch = cls.__new__(cls)
+        sketch.width, sketch.depth, sketch.total = data['width'], data['depth'], data['total']
+        sketch.rows = []
+        for encoded in data['rows']:
+            row = array('Q')
+            row.frombytes(base64.b64decode(encoded))
+            sketch.rows.append(row)
+        return sketch
+
+class SpaceSaving:
+    """
+    Space-Saving summary of the top-k heavy hitters of a stream.
+
+    Every item with a true count above total / capacity is kept. The kept
+    counts overestimate the true counts by at most the item's error.
+
+    Parameters:
+    capacity (int): The number of items kept.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = {}  # item -> [count, error]
+        self._heap = []  # (count, item), possibly stale
+
+    def _minimum(self):
+        while True:
+            count, item = self._heap[0]
+            if item in self.counts and self.counts[item][0] == count:
+                return count, item
+            heapq.heappop(self._heap)
+            if item in self.counts:
+                heapq.heappush(self._heap, (self.counts[item][0], item))
+
+    def add(self, item, count=1):
+        """Add count occurrences of an item."""
+        if item in self.counts:
+            self.counts[item][0] += count
+            return
+        error = 0
+        if len(self.counts) >= self.capacity:
+            error, evicted = self._minimum()
+            heapq.heappop(self._heap)
+            del self.counts[evicted]
+        self.counts[item] = [error + count, error]
+        heapq.heappush(self._heap, (error + count, item))
+
+    def top(self, k=None):
+        """list: The (item, estimated count) pairs of the k heaviest items, heaviest first."""
+        ranked = sorted(self.counts.items(), key=lambda entry: entry[1][0], reverse=True)
+        return [(item, count) for item, (count, error) in ranked[:k]]
+
+    def merge(self, other):
+        """Merge another Space-Saving summary into this one."""
+        floor = min((count for count, error in self.counts.values()), default=0) if len(self.counts) >= self.capacity else 0
+        other_floor = min((count for count, error in other.counts.values()), default=0) if len(other.counts) >= other.capacity else 0
+        merged = {}
+        for item in self.counts.keys() | other.counts.keys():
+            count, error = self.counts.get(item, (floor, floor))
+            other_count, other_error = other.counts.get(item, (other_floor, other_floor))
+            merged[item] = [count + other_count, error + other_error]
+        kept = heapq.nlargest(self.capacity, merged.items(), key=lambda entry: entry[1][0])
+        self.counts = dict(kept)
+        self._heap = [(count, item) for item, (count, error) in kept]
+        heapq.heapify(self._heap)
+        return self
+
+    def to_dict(self):
+        """dict: A JSON-serializable form of the summary."""
+        return {'capacity': self.capacity, 'counts': [[item, count, error] for item, (count, error) in self.counts.items()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a summary from to_dict output."""
+        summary = cls(data['capacity'])
+        summary.counts = {item: [count, error] for item, count, error in data['counts']}
+        summary._heap = [(count, item) for item, count, error in data['counts']]
+        heapq.heapify(summary._heap)
+        return summary
+
+class DistinctSample:
+    """
+    Uniform sample of the distinct items, with their exact counts.
+
+    Keeps the items with the sample_size smallest hashes. The hash threshold
+    only goes down, so a kept item has been counted since its first
+    occurrence and its count is exact.
+
+    Parameters:
+    sample_size (int): The number of distinct items kept.
+    """
+
+    def __init__(self, sample_size=4096):
+        self.sample_size = sample_size
+        self.counts = {}  # hash -> [item, count]
+        self._heap = []  # Negated hashes, so the largest kept hash is on top
+
+    def add_hash(self, value, item, count=1):
+        """Add count occurrences of the item with this 64-bit hash."""
+        if value in self.counts:
+            self.counts[value][1] += count
+        elif len(self._heap) < self.sample_size:
+            heapq.heappush(self._heap, -value)
+            self.counts[value] = [item, count]
+        elif value < -self._heap[0]:
+            del self.counts[-heapq.heappushpop(self._heap, -value)]
+            self.counts[value] = [item, count]
+
+    def hapax_fraction(self):
+        """float: The fraction of the sampled distinct items that appear only once."""
+        if not self.counts:
+            return 0.0
+        return sum(1 for item, count in self.counts.values() if count == 1) / len(self.counts)
+
+    def merge(self, other):
+        """Merge another sample with the same size into this one."""
+        # Only the items below the threshold of every full sample were counted exactly on both sides
+        thresholds = [-sample._heap[0] for sample in (self, other) if len(sample._heap) >= sample.sample_size]
+        threshold = min(thresholds) if thresholds else None
+        merged = {}
+        for value in self.counts.keys() | other.counts.keys():
+            if threshold is not None and value > threshold:
+                continue
+            item, count = self.counts.get(value, (None, 0))
+            other_item, other_count = other.counts.get(value, (None, 0))
+            merged[value] = [item if item is not None else other_item, count + other_count]
+        kept = heapq.nsmallest(self.sample_size, merged)
+        self.counts = {value: merged[value] for value in kept}
+        self._heap = [-value for value in kept]
+        heapq.heapify(self._heap)
+        return self
+
+    def to_dict(self):
+        """dict: A JSON-serializable form of the sample."""
+        return {'sample_size': self.sample_size, 'counts': [[value, item, count] for value, (item, count) in self.counts.items()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a sample from to_dict output."""
+        sample = cls(data['sample_size'])
+        sample.counts = {value: [item, count] for value, item, count in data['counts']}
+        sample._heap = [-value for value in sample.counts]
+        heapq.heapify(sample._heap)
+        return sample
+
+class ApproximateStats:
+    """
+    Fixed-memory word statistics of a token stream.
+
+    Parameters:
+    precision (int): The HyperLogLog precision.
+    epsilon (float): The Count-Min relative error bound.
+    delta (float): The Count-Min failure probability.
+    top_k (int): The number of heavy hitters kept by Space-Saving.
+    sample_size (int): The size of the distinct sample used for the hapax estimate.
+    """
+
+    def __init__(self, precision=14, epsilon=0.0001, delta=0.001, top_k=1000, sample_size=4096):
+        self.distinct = HyperLogLog(precision)
+        self.frequencies = CountMinSketch(epsilon, delta)
+        self.heavy_hitters = SpaceSaving(top_k)
+        self.sample = DistinctSample(sample_size)
+
+    def add(self, word, count=1):
+        """Add count occurrences of a word."""
+        value = stable_hash(word)
+        self.distinct.add_hash(value)
+        self.frequencies.add_hash(value, count)
+        self.heavy_hitters.add(word, count)
+        self.sample.add_hash(value, word, count)
+
+    def update(self, tokens, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Add a stream of tokens, pre-aggregating chunk_size tokens at a time.
+
+        Parameters:
+        tokens (iterable): The tokenized words.
+        chunk_size (int): The number of tokens counted exactly before updating the sketches.
+
+        Returns:
+        ApproximateStats: These statistics.
+        """
+        tokens = iter(tokens)
+        while True:
+            chunk = Counter(itertools.islice(tokens, chunk_size))
+            if not chunk:
+                return self
+            for word, count in chunk.items():
+                self.add(word, count)
+
+    @property
+    def token_count(self):
+        """int: The number of tokens added."""
+        return self.frequencies.total
+
+    def distinct_words(self):
+        """int: The estimated number of distinct words (vocabulary size)."""
+        return self.distinct.estimate()
+
+    def frequency(self, word):
+        """int: The estimated frequency of a word (never an undercount)."""
+        return self.frequencies.estimate(word)
+
+    def top(self, k=None):
+        """list: The (word, estimated count) pairs of the k most frequent words."""
+        return self.heavy_hitters.top(k)
+
+    def hapax_estimate(self):
+        """int: The estimated number of words that appear only once, standing in for len(get_unique_words(...))."""
+        return round(self.sample.hapax_fraction() * self.distinct_words())
+
+    def merge(self, other):
+        """Merge the statistics of another shard or process into these."""
+        self.distinct.merge(other.distinct)
+        self.frequencies.merge(other.frequencies)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        self.sample.merge(other.sample)
+        return self
+
+    def to_dict(self):
+        """dict: A JSON-serializable form of the statistics."""
+        return {'distinct': self.distinct.to_dict(), 'frequencies': self.frequencies.to_dict(),
+                'heavy_hitters': self.heavy_hitters.to_dict(), 'sample': self.sample.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild the statistics from to_dict output."""
+        stats = cls.__new__(cls)
+        stats.distinct = HyperLogLog.from_dict(data['distinct'])
+        stats.frequencies = CountMinSketch.from_dict(data['frequencies'])
+        stats.heavy_hitters = SpaceSaving.from_dict(data['heavy_hitters'])
+        stats.sample = DistinctSample.from_dict(data['sample'])
+        return stats
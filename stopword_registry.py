@@ -0,0 +1,111 @@
+"""
+Registry of preloaded, hashed stopword sets.
+
+Each language's stopword list is loaded once into a frozenset and cached for
+the life of the process, so filtering a token is a single hash lookup. The
+Amharic and Tigrigna lists shipped in this repository are read directly from
+the repository, without copying them into the NLTK data path. Other languages
+fall back to the NLTK stopwords corpus.
+"""
+
+import os  # For interacting with the operating system
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Stopword files shipped in this repository, by language name
+STOPWORD_FILES = {
+    'amharic': os.path.join(REPO_DIR, 'amharic'),
+    'tigregna': os.path.join(REPO_DIR, 'tigregna'),
+}
+
+_stopword_cache = {}  # language -> frozenset of stopwords
+
+def register_stopwords_file(language, file_path):
+    """
+    Use a stopword file with one word per line for a language.
+
+    Parameters:
+    language (str): The language name, as passed to get_stopwords.
+    file_path (str): The path to the stopword file.
+    """
+    STOPWORD_FILES[language] = os.path.abspath(file_path)
+    _stopword_cache.pop(language, None)
+
+def read_stopwords_file(file_path):
+    """
+    Read a stopword file with one word per line.
+
+    Parameters:
+    file_path (str): The path to the stopword file.
+
+    Returns:
+    frozenset: The stopwords.
+    """
+    with open(file_path, encoding='utf-8') as stopword_file:
+        return frozenset(line.strip() for line in stopword_file if line.strip())
+
+def _load_stopwords(language):
+    """
+    Load the stopwords of a language from this repository or from NLTK.
+
+    Parameters:
+    language (str): The language of the stopwords.
+
+    Returns:
+    frozenset: The stopwords, or an empty set if they were not found.
+    """
+    if language in STOPWORD_FILES:
+        return read_stopwords_file(STOPWORD_FILES[language])
+    try:
+        from nltk.corpus import stopwords
+        return frozenset(stopwords.words(language))
+    except (OSError, LookupError):
+        print(f"Error: The stopwords for the language '{language}' were not found. The stop words can't be removed.")
+        print("Please add the stopwords file for this language with register_stopwords_file or to the NLTK data path.")
+        return frozenset()
+
+def get_stopwords(language):
+    """
+    Get the stopwords of a language, loading them on first use.
+
+    Parameters:
+    language (str): The language of the stopwords.
+
+    Returns:
+    frozenset: The stopwords, or an empty set if they were not found.
+    """
+    try:
+        return _stopword_cache[language]
+    except KeyError:
+        stop_words = _stopword_cache[language] = _load_stopwords(language)
+        return stop_words
+
+def filter_stopwords(tokens, stop_words):
+    """
+    Drop the stopwords from a stream of tokens.
+
+    Parameters:
+    tokens (iterable): The tokenized words.
+    stop_words (frozenset): The stopwords to drop, e.g. from get_stopwords.
+
+    Yields:
+    str: The words that are not stopwords.
+    """
+    for word in tokens:
+        if word not in stop_words:
+            yield word
+
+def filter_stopwords_batches(batches, language):
+    """
+    Drop the stopwords of a language from a stream of token batches.
+
+    Parameters:
+    batches (iterable): Lists of tokenized words, e.g. one per chunk of documents.
+    language (str): The language of the stopwords.
+
+    Yields:
+    list: The words of each batch that are not stopwords.
+    """
+    stop_words = get_stopwords(language)
+    for batch in batches:
+        yield [word for word in batch if word not in stop_words]
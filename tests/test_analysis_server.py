@@ -0,0 +1,70 @@
+import http.client
+import json
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from analysis_server import AnalysisServer, AnalysisService, ResultCache, parse_request, response_size
+
+@pytest.mark.parametrize('tokenizer', [['geez'], {'geez': 1}, 1])
+def test_tokenizer_must_be_a_string(tokenizer):
+    with pytest.raises(ValueError):
+        parse_request({'documents': ['ሰላም'], 'tokenizer': tokenizer})
+
+@pytest.fixture(scope='module')
+def server():
+    service = AnalysisService(workers=1, languages=())
+    server = AnalysisServer(('127.0.0.1', 0), service, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+def post(server, body, content_length):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=30)
+    connection.putrequest('POST', '/analyze')
+    connection.putheader('Content-Length', content_length)
+    connection.endheaders(body)
+    response = connection.getresponse()
+    data = json.loads(response.read().decode('utf-8'))
+    connection.close()
+    return response.status, data
+
+@pytest.mark.parametrize('content_length', ['abc', '-1'])
+def test_invalid_content_length_is_rejected(server, content_length):
+    assert post(server, b'{}', content_length)[0] == 400
+
+def test_invalid_tokenizer_is_rejected(server):
+    body = json.dumps({'documents': ['ሰላም'], 'tokenizer': ['geez']}).encode('utf-8')
+    assert post(server, body, str(len(body)))[0] == 400
+
+def test_ipa_keeps_words_apart(server):
+    body = json.dumps({'documents': ['ሰላም፡ነው።'], 'ipa': True}).encode('utf-8')
+    status, data = post(server, body, str(len(body)))
+    assert status == 200
+    assert len(data['ipa'][0].split()) == 2
+
+def test_cache_is_bounded_by_the_size_of_the_responses():
+    response = {'word_counts': {'ሰላም': 1}}
+    cache = ResultCache(max_entries=10, max_bytes=2 * response_size(response))
+    for key in 'abc':
+        cache.put(key, response)
+    assert list(cache.entries) == ['b', 'c']
+    assert cache.total_bytes == 2 * response_size(response)
+    cache.put('large', {'word_counts': {'ሰላም' * 100: 1}})
+    assert 'large' not in cache.entries
+
+def test_broken_pool_is_replaced():
+    service = AnalysisService(workers=1, cache_size=0, languages=())
+    try:
+        with pytest.raises(BrokenProcessPool):
+            service.pool.submit(os._exit, 1).result()
+        with pytest.raises(BrokenProcessPool):
+            service.analyze({'documents': ['ሰላም'], 'tokenizer': 'geez'})
+        assert service.analyze({'documents': ['ሰላም'], 'tokenizer': 'geez'})['word_counts'] == {'ሰላም': 1}
+    finally:
+        service.close()
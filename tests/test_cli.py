@@ -0,0 +1,40 @@
+import json
+import os
+
+import pytest
+
+from cli import main, parse_corpus
+from stopword_registry import get_stopwords
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AMHARIC_PATH = os.path.join(ROOT, 'Amharic.txt')
+TIGRIGNA_PATH = os.path.join(ROOT, 'Tegrigna.txt')
+
+def test_profile_writes_the_stages(tmp_path, capfd):
+    profile_path = str(tmp_path / 'run')
+    assert main([f'amharic={AMHARIC_PATH}', f'tigregna={TIGRIGNA_PATH}', '--jobs', '1', '--profile', '--profile-path', profile_path]) == 0
+    rows = [json.loads(line) for line in capfd.readouterr().out.splitlines()]
+    assert {row['corpus'] for row in rows} == {'amharic', 'tigregna'}
+    with open(profile_path + '.profile.json', encoding='utf-8') as summary_file:
+        stages = {stage['name']: stage for stage in json.load(summary_file)['stages']}
+    assert stages['analyze.amharic']['bytes'] == os.path.getsize(AMHARIC_PATH)
+    assert stages['analyze.amharic']['items'] == sum(row['count'] for row in rows
+                                                     if row['corpus'] == 'amharic' and row['table'] == 'words')
+    assert 'overlap' in stages
+    assert os.path.exists(profile_path + '.pstats')
+
+def test_corpus_name_and_language():
+    assert parse_corpus('amharic=a.txt,b.txt') == ('amharic', 'amharic', ['a.txt', 'b.txt'])
+    assert parse_corpus('gojjam:amharic=a.txt') == ('gojjam', 'amharic', ['a.txt'])
+    assert parse_corpus('a.txt', default_language='amharic') == ('amharic', 'amharic', ['a.txt'])
+    with pytest.raises(ValueError):
+        parse_corpus('gojjam:=a.txt')
+
+def test_two_corpora_of_one_language(capfd):
+    assert main([f'gojjam:amharic={AMHARIC_PATH}', f'wollo:amharic={AMHARIC_PATH}', '--jobs', '1', '--tables', 'words']) == 0
+    rows = [json.loads(line) for line in capfd.readouterr().out.splitlines()]
+    words = {name: {row['item']: row['count'] for row in rows if row['corpus'] == name and row['table'] == 'words'}
+             for name in ('gojjam', 'wollo')}
+    assert words['gojjam'] and words['gojjam'] == words['wollo']
+    assert not get_stopwords('amharic') & set(words['gojjam'])
+    assert {row['item']: row['count'] for row in rows if row['table'] == 'overlap.word'} == {'wollo': 100.0, 'gojjam': 100.0}
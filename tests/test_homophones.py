@@ -0,0 +1,29 @@
+import os
+
+from corpus_reader import read_lines
+from homophones import HOMOPHONES, fold_homophones, fold_tokens
+from pipeline import AnalysisPipeline, tokenize_documents
+from text_analyzer import count_frequency, normalize_frequency, remove_stopwords
+
+AMHARIC_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Amharic.txt')
+
+def test_same_order_homophones_fold():
+    assert fold_homophones('ሀሐኀ') == 'ሀሀሀ'
+    assert fold_homophones('ሠላም') == 'ሰላም'
+    assert fold_homophones('ፀሐይ') == 'ጸሀይ'
+
+def test_different_orders_do_not_fold():
+    assert fold_homophones('ሀሃ') == 'ሀሃ'
+    assert HOMOPHONES['ሓ'] == 'ሃ'
+
+def test_distinct_phonemes_do_not_fold():
+    assert fold_homophones('ቐቘ') == 'ቐቘ'
+    assert 'ⷈ' not in HOMOPHONES
+
+def test_folded_tokens_match_the_normalizing_cleaning_pass():
+    lines = list(read_lines(AMHARIC_PATH, header='Amharic'))
+    tokens = list(tokenize_documents(lines, 'geez'))
+    assert fold_tokens(tokens) == list(tokenize_documents(lines, 'geez', normalize=True))
+    normalized = AnalysisPipeline('amharic', tokenizer='geez_normalized').run(lines).word_counts
+    assert count_frequency(remove_stopwords(fold_tokens(tokens), 'amharic', normalize=True)) == normalized
+    assert normalize_frequency(count_frequency(remove_stopwords(tokens, 'amharic')), 'amharic') == normalized
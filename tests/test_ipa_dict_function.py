@@ -0,0 +1,8 @@
+from IPA_dict_function import ipa_convert_document, ipa_convert_word
+
+def test_ethiopic_punctuation_separates_words():
+    assert ipa_convert_document('ሰላም፡ነው።').split() == [ipa_convert_word('ሰላም'), ipa_convert_word('ነው')]
+    assert ipa_convert_document('ሰላም ነው') == ' '.join((ipa_convert_word('ሰላም'), ipa_convert_word('ነው')))
+
+def test_other_characters_are_dropped():
+    assert ipa_convert_document('ሰላም!') == ipa_convert_word('ሰላም')
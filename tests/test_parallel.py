@@ -0,0 +1,14 @@
+import os
+
+from parallel import analyze_files
+from phonemes import count_word_phonemes
+from pipeline import AnalysisPipeline
+
+AMHARIC_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Amharic.txt')
+
+def test_sharded_analysis_matches_the_serial_pipeline():
+    serial = AnalysisPipeline('amharic', tokenizer='geez').run_file(AMHARIC_PATH, header='Amharic')
+    sharded = analyze_files(AMHARIC_PATH, 'amharic', workers=2, shard_size=2048, header='Amharic', tokenizer='geez')
+    assert list(sharded.word_counts.items()) == list(serial.word_counts.items())
+    assert sharded.phoneme_counts == count_word_phonemes(serial.word_counts)
+    assert sharded.document_count == serial.document_count
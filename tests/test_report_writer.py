@@ -0,0 +1,12 @@
+import sys
+
+import pytest
+
+from report_writer import write_tables
+
+def test_parquet_without_pyarrow_raises(monkeypatch, tmp_path):
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    file_path = tmp_path / 'tables.parquet'
+    with pytest.raises(ImportError, match='pip install pyarrow'):
+        write_tables({'words': {'ሰላም': 1}}, str(file_path), 'parquet')
+    assert not file_path.exists()
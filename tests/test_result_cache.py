@@ -0,0 +1,18 @@
+from parallel import analyze_byte_range
+from result_cache import analyze_incremental
+
+CORPUS = 'ሰላም ነው\nእንዴት ነህ ሰላም\nደህና ነኝ\n'
+
+def test_tail_cut_inside_a_character_is_left_out(tmp_path):
+    corpus_path = tmp_path / 'corpus.txt'
+    data = CORPUS.encode('utf-8')
+    cut = data.index('ደ'.encode('utf-8')) + 1  # Inside the 3-byte character
+    corpus_path.write_bytes(data[:cut])
+
+    analysis = analyze_incremental(str(corpus_path), None, cache_dir=str(tmp_path / 'cache'), workers=1, tokenizer='geez')
+    complete = analyze_byte_range(str(corpus_path), 0, data.rindex(b'\n', 0, cut) + 1, None, 1, tokenizer='geez')
+    assert analysis.word_counts == complete.word_counts
+
+    corpus_path.write_bytes(data)
+    analysis = analyze_incremental(str(corpus_path), None, cache_dir=str(tmp_path / 'cache'), workers=1, tokenizer='geez')
+    assert analysis.word_counts == analyze_byte_range(str(corpus_path), 0, len(data), None, 1, tokenizer='geez').word_counts
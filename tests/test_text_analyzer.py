@@ -0,0 +1,54 @@
+import os
+import sys
+import threading
+import types
+
+import pytest
+
+import text_analyzer
+from text_analyzer import NLTK_RESOURCES, ensure_nltk_resources
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def install_nltk(monkeypatch, installed, punkt_tab):
+    """Replace NLTK by a stub whose word_tokenize loads punkt_tab (NLTK 3.8.2 and later) or punkt."""
+    def find(resource):
+        if resource not in installed:
+            raise LookupError(resource)
+        return resource
+
+    punkt = types.ModuleType('nltk.tokenize.punkt')
+    if punkt_tab:
+        punkt.PunktTokenizer = object
+    tokenize = types.ModuleType('nltk.tokenize')
+    tokenize.punkt = punkt
+    nltk = types.ModuleType('nltk')
+    nltk.tokenize = tokenize
+    nltk.data = types.SimpleNamespace(find=find)
+    monkeypatch.setitem(sys.modules, 'nltk', nltk)
+    monkeypatch.setitem(sys.modules, 'nltk.tokenize', tokenize)
+    monkeypatch.setitem(sys.modules, 'nltk.tokenize.punkt', punkt)
+
+@pytest.mark.parametrize('punkt_tab, resource', [(True, 'tokenizers/punkt_tab'), (False, 'tokenizers/punkt')])
+def test_the_data_loaded_by_word_tokenize_is_enough(monkeypatch, punkt_tab, resource):
+    install_nltk(monkeypatch, {resource}, punkt_tab)
+    assert ensure_nltk_resources() == []
+
+@pytest.mark.parametrize('punkt_tab, resource, other', [(True, 'tokenizers/punkt_tab', 'tokenizers/punkt'),
+                                                        (False, 'tokenizers/punkt', 'tokenizers/punkt_tab')])
+def test_only_the_data_loaded_by_word_tokenize_is_missing(monkeypatch, punkt_tab, resource, other):
+    install_nltk(monkeypatch, {other}, punkt_tab)
+    assert ensure_nltk_resources() == [resource]
+    assert set(NLTK_RESOURCES) == {resource, other}
+
+def test_report_writer_is_closed_on_errors(monkeypatch, tmp_path):
+    def fail(counter):
+        raise RuntimeError('stage failed')
+
+    monkeypatch.setattr(text_analyzer, 'consonant_vowel_frequency', fail)
+    output_path = str(tmp_path / 'Output.doc')
+    with pytest.raises(RuntimeError):
+        text_analyzer.main(os.path.join(ROOT, 'Amharic.txt'), os.path.join(ROOT, 'Tegrigna.txt'), output_path, tokenizer='geez')
+    assert not any(thread.name == 'report-writer' for thread in threading.enumerate())
+    with open(output_path, encoding='utf-8') as report:
+        assert report.read().startswith('This is all the output of the code')
@@ -1,20 +1,34 @@
 # Importing all necessary libraries
-import pandas as pd  # For data manipulation and analysis
+# pandas and NLTK are heavy, so they are imported lazily by the functions that need them,
+# and NLTK data is never downloaded on import (see ensure_nltk_resources).
 import os  # For interacting with the operating system
-import re  # For regular expressions
-import nltk  # For natural language processing tasks
 
-# Downloading necessary NLTK data
-nltk.download('punkt')  # Tokenizer models
-#nltk.download('wordnet')  # WordNet lexical database
-nltk.download("stopwords")  # Stopwords list
+# Importing the IPA conversion functions from IPA_dict_function module
+from IPA_dict_function import ipa_convert, ipa_convertor_alpahbet, ipa_convert_word
 
-# Importing specific functions from NLTK
-from nltk.tokenize import word_tokenize  # For tokenizing words
-from nltk.corpus import stopwords  # For accessing stopwords
+# Importing the single pass frequency engine
+from frequency import count_items
 
-# Importing custom functions from IPA_dict&unction module
-from IPA_dict_function import *
+# Importing the background corpus prefetcher
+from corpus_reader import FilePrefetcher
+
+# Importing the cached stopword sets and the tokenizers
+from stopword_registry import get_stopwords, filter_stopwords
+from pipeline import TOKENIZERS, tokenize_documents, nltk_tokenize
+from geez_tokenizer import NON_WORD_PATTERN
+
+# Importing the consonant and vowel frequencies of the Fidel, and the IPA phoneme segmentation
+from fidel import consonant_vowel_frequency
+from phonemes import count_ipa_phonemes, split_consonants_vowels
+
+# Importing the homophone folding of the Fidel
+from homophones import NORMALIZING_TABLE, fold_homophones
+
+# Importing the buffered report writer and structured table outputs
+from report_writer import REPORT_PATH, TABLE_FORMATS, ReportWriter, BackgroundReportWriter, write_tables
+
+# Importing the per-stage instrumentation
+from instrumentation import NULL_INSTRUMENTATION, add_instrumentation_arguments, instrumentation_from_args
 
 """
 In order to differentiate the two texts, we use 'a' for Amharic text manipulation and
@@ -22,6 +36,41 @@ In order to differentiate the two texts, we use 'a' for Amharic text manipulatio
 a difference in these two alphabets.
 """
 
+NLTK_RESOURCES = ('tokenizers/punkt_tab', 'tokenizers/punkt')  # Alternative data of nltk.word_tokenize: punkt_tab since NLTK 3.8.2, punkt before
+
+DEFAULT_AMHARIC_PATH = 'Amharic.txt'
+DEFAULT_TIGRIGNA_PATH = 'Tegrigna.txt'
+
+def word_tokenize_resource():
+    """str: The NLTK data loaded by the installed nltk.word_tokenize, out of NLTK_RESOURCES."""
+    from nltk.tokenize import punkt
+    return NLTK_RESOURCES[0] if hasattr(punkt, 'PunktTokenizer') else NLTK_RESOURCES[1]
+
+def ensure_nltk_resources(resources=NLTK_RESOURCES):
+    """
+    Check, without network access, that the NLTK data used by the analysis is installed.
+
+    The resources are alternatives, of which the installed nltk.word_tokenize
+    loads one: only that one has to be found, and only it is reported as missing.
+    
+    Parameters:
+    resources (tuple): The alternative NLTK data paths to look for.
+    
+    Returns:
+    list: The missing resources (empty if everything is installed).
+    """
+    import nltk  # For natural language processing tasks
+    needed = word_tokenize_resource()
+    for resource in ((needed,) if needed in resources else resources):
+        try:
+            nltk.data.find(resource)
+            return []
+        except LookupError:
+            pass
+    print(f"Error: The NLTK data {needed} was not found.")
+    print(f"Please install it once with nltk.download('{needed.rpartition('/')[2]}').")
+    return [needed]
+
 def load_data(file_path):
     """
     Load data from a fixed-width formatted file.
@@ -32,6 +81,7 @@ def load_data(file_path):
     Returns:
     DataFrame: The loaded data.
     """
+    import pandas as pd  # For data manipulation and analysis
     try:
         return pd.read_fwf(os.path.abspath(file_path))
     except FileNotFoundError as e:
@@ -39,56 +89,67 @@ def load_data(file_path):
         print("Please check the file path and ensure the file exists.")
         exit()
 
-def clean_data(df, column_name):
+def clean_data(df, column_name, normalize=False):
     """
     Clean the data by removing everything except for spaces and word characters.
     
+    The whole column is cleaned in one vectorized operation with the precompiled pattern.
+    
     Parameters:
     df (DataFrame): The data frame containing the text data.
     column_name (str): The name of the column to clean.
+    normalize (bool): Also fold the homophone Fidel (ሐ, ኀ -> ሀ, ...), in the same pass.
     
     Returns:
     DataFrame: The cleaned data frame.
     """
-    for i in range(len(df.axes[0])):
-        df.loc[i, column_name] = re.sub(r'[^\w\s]', '', df[column_name][i])
+    if normalize:
+        df[column_name] = df[column_name].str.translate(NORMALIZING_TABLE)
+    else:
+        df[column_name] = df[column_name].str.replace(NON_WORD_PATTERN, '', regex=True)
     return df
 
-def tokenize_data(df, column_name):
+def tokenize_data(df, column_name, tokenizer=nltk_tokenize):
     """
     Tokenize the cleaned text data.
     
+    By default every document is tokenized with nltk.word_tokenize. With tokenizer=None the
+    column is instead split on whitespace and exploded into tokens in vectorized form, which
+    is much faster but does not split what NLTK splits (e.g. "cannot", or punctuation left
+    attached to words).
+    
     Parameters:
     df (DataFrame): The data frame containing the text data.
     column_name (str): The name of the column to tokenize.
+    tokenizer (callable, optional): A function splitting one document into a list of words,
+        or None for the vectorized whitespace split.
     
     Returns:
     list: The tokenized words.
     """
-    tokens = []
-    for i in range(len(df.axes[0])):
-        tokens += nltk.word_tokenize(df[column_name][i])
-    return tokens
+    column = df[column_name]
+    tokens = column.str.split() if tokenizer is None else column.map(tokenizer, na_action='ignore')
+    return tokens.explode().dropna().tolist()
 
-def remove_stopwords(tokens, language):
+def remove_stopwords(tokens, language, normalize=False):
     """
     Remove stopwords from the tokenized data.
     
     Parameters:
     tokens (list): The list of tokenized words.
     language (str): The language of the stopwords to remove.
+    normalize (bool): Fold the homophone Fidel of the stopwords, for normalized tokens.
     
     Returns:
     list: The list of words without stopwords.
     """
-    try:
-        stop_words = stopwords.words(language)
-    except OSError:
-        print(f"Error: The stopwords for the language '{language}' were not found. The stop words can't be removed.")
-        print("Please add the stopwords file for this language to the NLTK data path.")
+    stop_words = get_stopwords(language)
+    if not stop_words:
         return tokens  # Return the original tokens if stopwords are not found
+    if normalize:
+        stop_words = frozenset(map(fold_homophones, stop_words))
     
-    return [word for word in tokens if word not in stopwords.words(language)]
+    return list(filter_stopwords(tokens, stop_words))
 
 
 def count_frequency(tokens):
@@ -96,16 +157,35 @@ def count_frequency(tokens):
     Count the frequency of each word in the tokenized data.
     
     Parameters:
-    tokens (list): The list of tokenized words.
+    tokens (iterable): The tokenized words, as a list or a stream.
     
     Returns:
     dict: A dictionary with words as keys and their frequencies as values.
     """
-    counter = {}
-    for word in tokens:
-        if word not in counter:
-            counter[word] = tokens.count(word)
-    return counter
+    return count_items(tokens)
+
+def normalize_frequency(counter, language):
+    """
+    Fold the homophone Fidel of a word frequency dictionary without stopwords.
+
+    Folding maps every Fidel to one Fidel, so folding the distinct words and
+    removing the folded stopwords gives the counts of the normalizing cleaning
+    pass (AnalysisPipeline(normalize=True)) without a second pass over the tokens.
+    
+    Parameters:
+    counter (dict): A dictionary with words as keys and their frequencies as values, without the stopwords of the language.
+    language (str): The language of the stopwords to remove.
+    
+    Returns:
+    dict: A dictionary with normalized words as keys and their frequencies as values.
+    """
+    stop_words = frozenset(map(fold_homophones, get_stopwords(language)))
+    normalized = {}
+    for word, count in counter.items():
+        word = fold_homophones(word)
+        if word not in stop_words:
+            normalized[word] = normalized.get(word, 0) + count
+    return normalized
 
 def get_unique_words(counter):
     """
@@ -149,36 +229,26 @@ def count_alphabet_frequency(alphabets):
     Count the frequency of each alphabet.
     
     Parameters:
-    alphabets (list): A list of alphabets.
+    alphabets (iterable): The alphabets (or phonemes), as a list or a stream.
     
     Returns:
     dict: A dictionary with alphabets as keys and their frequencies as values.
     """
-    counter = {}
-    for char in alphabets:
-        if char not in counter:
-            counter[char] = alphabets.count(char)
-    return counter
+    return count_items(alphabets)
 
 #Write Geeze charachters
-def Title_write(text):
-    op=open('Output.doc',mode='a')
-    op.write(text)
-    op.close()
+def Title_write(text, file_path=REPORT_PATH):
+    with ReportWriter(file_path) as report:
+        report.write(text)
     
     
-def list_Geez_write(token):
-    with open ('Output.doc', encoding='utf-8', mode='a') as report_file:
-       
-        for word in token:
-            report_file.write(f'{word} ')
+def list_Geez_write(token, file_path=REPORT_PATH):
+    with ReportWriter(file_path) as report:
+        report.write_list(token)
 
-def dect_Geez_write(counter):
- 
-    with open ('Output.doc', encoding='utf-8', mode='a') as report_file:
-        for key,value in counter.items() :
-
-            report_file.write(f'{key}:{value} ')
+def dect_Geez_write(counter, file_path=REPORT_PATH):
+    with ReportWriter(file_path) as report:
+        report.write_counts(counter)
 
 def overllaping_calc(counter1,counter2):
 
@@ -187,147 +257,228 @@ def overllaping_calc(counter1,counter2):
 
     return (len(overllaped_phonem)/len(Union))*100  
 
-# Load the data
-dfa = load_data('C:\\Users\\Liya\\Desktop\\5k\\Project\\Amharic.txt')
-dft = load_data('C:\\Users\\Liya\\Desktop\\5k\\Project\\Tegrigna.txt')
-
-# Clean the data
-dfa = clean_data(dfa, "Amharic")
-dft = clean_data(dft, "Tigregna")
-
-# Tokenize the data
-dfa_t = tokenize_data(dfa, "Amharic")
-dft_t = tokenize_data(dft, "Tigregna")
-
-# Remove stopwords
-dfa_t = remove_stopwords(dfa_t, 'amharic')
-dft_t = remove_stopwords(dft_t, 'tigregna')
-
-# Count word frequency
-acounter = count_frequency(dfa_t)
-tcounter = count_frequency(dft_t)
-
-# Get unique words
-aunique_word = get_unique_words(acounter)
-tunique_word = get_unique_words(tcounter)
-
-# Extract alphabets
-aalphabet = extract_alphabets(acounter)
-talphabet = extract_alphabets(tcounter)
-
-# Count alphabet frequency
-aalphabet_counter = count_alphabet_frequency(aalphabet)
-talphabet_counter = count_alphabet_frequency(talphabet)
-
-#Clculate word and alphabet level overlap
-# Find overlapping words
-overlapped_word =get_overlapping_words(acounter, tcounter)
-
-#Find overlapping Alphabets
-overlapped_alphabet= get_overlapping_words(talphabet_counter, aalphabet_counter)
-
-# Converting Ethiopic alphabets into their phonetic representations
-aipa_converted_alphabet = ipa_convertor_alpahbet(aalphabet)  # alphabet level
-tipa_converted_alphabet = ipa_convertor_alpahbet(talphabet)
-
-aipa_converted_df = ipa_convert(dfa_t)  # Text level
-tipa_converted_df = ipa_convert(dft_t)
-# Print the cleaned data
-op=open('Output.doc','w')
-op.write('This is all the output of the code\n')
-op.close()
-         
-
-Title_write('The preprocessed Amharic text:\n')
-list_Geez_write(dfa_t)
-
-Title_write('The preprocessed Tigregna text:\n')
-list_Geez_write(dft_t)
-
-Title_write('The word frequency in the given Tigrigna and Amharic text is shown below\nTigregna\n')
-dect_Geez_write(tcounter)
-Title_write('Amharic')
-dect_Geez_write(acounter)
-Title_write('Unique words for the given Tigrigna text are\n')
-Title_write('Total number of unique words in the Tigrigna text:  ')
-Title_write(str(len(tunique_word)))
-list_Geez_write(tunique_word)
-Title_write('Unique words for the given Amharic text are\n')
-Title_write('Total number of unique words in the Amharic text:  ')
-Title_write(str(len(aunique_word)))
-list_Geez_write(aunique_word)
-
-Title_write('Alphabetical frequency in the given Amharic text: \n')
-dect_Geez_write(aalphabet_counter)
-Title_write('Alphabetical frequency in the given Tigregna text: \n')
-dect_Geez_write(talphabet_counter)
-Title_write('The number of words that are in both Amharic and Tigrigna texts are: ')
-Title_write(str(len(overlapped_word)))
-Title_write('Here are the words\n')
-list_Geez_write(overlapped_word)
-Title_write('The number of alphabets that are in both Amharic and Tigrigna texts are: ')
-Title_write(str(len(overlapped_alphabet)))
-Title_write('Here are the words\n')
-list_Geez_write(overlapped_alphabet)
-
-# #Print the  phoneme of the given text
-Title_write('\nThe phoenem of the given Amharic text\n')
-aipa_converted_alphabet_single=[]
-for word in aipa_converted_df:
-    op=open('Output.doc',encoding='utf-8',mode='a')
-    op.write(word)
-    for char in word:
-        aipa_converted_alphabet_single.append(char)
-
-Title_write('\nThe phoenem of the given Tigregna text\n')
-tipa_converted_alphabet_single=[]
-for word in tipa_converted_df:
-    op=open('Output.doc',encoding='utf-8',mode='a')
-    op.write(word)
-    for char in word:
-        tipa_converted_alphabet_single.append(char)
-   
-# Counting the frequency of each phonetic character
-aipa_converted_alphabet_counter = {}
-for char in aipa_converted_alphabet:
-    if char not in aipa_converted_alphabet_counter:
-        aipa_converted_alphabet_counter[char] = aipa_converted_alphabet.count(char)
-
-tipa_converted_alphabet_counter = {}
-for char in tipa_converted_alphabet:
-    if char not in tipa_converted_alphabet_counter:
-        tipa_converted_alphabet_counter[char] = tipa_converted_alphabet.count(char)
-
-#Print the alphabet  phoneme frequancy
-#print()
-Title_write('\n\nAlphabetical  phoneme frequency in the given Amharic text: \n') 
-dect_Geez_write(aipa_converted_alphabet_counter)
-
-Title_write('\n\nAlphabetical  phoneme frequency in the given Tigregna text: \n') 
-dect_Geez_write(tipa_converted_alphabet_counter)
-#print(f'Alphabetical  phoneme frequency in the given Tigrigna text: \n \n{tipa_converted_alphabet_counter}\n')
-
-aipa_converted_single_alphabet_counter = count_alphabet_frequency(aipa_converted_alphabet_single)
-tipa_converted_single_alphabet_counter = count_alphabet_frequency(tipa_converted_alphabet_single)
-
-#print(f'Single phoneme  frequency in the given Amharic text: \n\n{aipa_converted_single_alphabet_counter}\n')
-Title_write('\n\nSingle phoneme  frequency in the given Amharic text: \n')
-dect_Geez_write(aipa_converted_single_alphabet_counter)
-#print(f'Single phoneme  frequency in the given Tigrigna text: \n\n{tipa_converted_single_alphabet_counter}')
-Title_write('\n\nSingle phoneme  frequency in the given Tigregna text: \n')
-dect_Geez_write(tipa_converted_single_alphabet_counter)
-#Phonetic overllaping analysis-character level 
-
-#Phonetic overllaping analysis-phonem level 
-single_phonem_overllaped=set.intersection(set(aipa_converted_single_alphabet_counter),set(tipa_converted_single_alphabet_counter))
-vowels={'a','e','o','ə', 'u','i', 'ɨ','ɒ','ʌ','æ','ɔ','ɜ'}
-single_phonem_overllaped.difference_update(vowels)  #Remove Vowels-> short vowels: /ɪ/ /ʊ/ /ə/ /e/ /ɒ/ /ʌ/ /æ/ 5 long vowels: /iː/ /uː/ /ɑː/ /ɔː/ /ɜː/
-Union=set.union(set(tipa_converted_single_alphabet_counter),set(aipa_converted_single_alphabet_counter))
-Union.difference_update(vowels)
-single_phonem_overllaped_phonem=len(single_phonem_overllaped)/len(Union)*100
-
-#Analysis
-Title_write(f'\n\nAnalysis\nWord level overlaping in percentache is: {overllaping_calc(acounter, tcounter)}%\nCharacter level overlaping in percentache is: {overllaping_calc(aalphabet, talphabet)}%\nCombined Phonem level overlap in percentage is: {overllaping_calc(tipa_converted_alphabet_counter, aipa_converted_alphabet_counter)}%\n Phonem level overlap is: {single_phonem_overllaped_phonem}%\n--------END------------')
+def main(amharic_path=DEFAULT_AMHARIC_PATH, tigrigna_path=DEFAULT_TIGRIGNA_PATH, output_path=REPORT_PATH, table_format=None, tokenizer='nltk', instrument=None):
+    """
+    Run the whole Amharic/Tigrigna analysis and write the report to Output.doc.
+    
+    Parameters:
+    amharic_path (str): The path to the Amharic text file.
+    tigrigna_path (str): The path to the Tigrigna text file.
+    output_path (str): The path to the text report.
+    table_format (str, optional): Also write the frequency tables next to the report as 'jsonl', 'csv' or 'parquet'.
+    tokenizer (str): 'nltk' for nltk.word_tokenize, or 'geez' for the Ethiopic-aware regex tokenizer.
+    instrument (Instrumentation, optional): Record per-stage measurements, written next to the report.
+    """
+    if tokenizer == 'nltk' and ensure_nltk_resources():
+        exit()
+    instrument = instrument or NULL_INSTRUMENTATION
+    instrument.start()
 
+    # Stream both files from background threads in bounded chunks, skipping the header line of each file,
+    # so the Tigrigna file is read while the Amharic text is cleaned and tokenized
+    try:
+        with FilePrefetcher(workers=2) as prefetcher:
+            dfa = prefetcher.submit(amharic_path, header="Amharic")
+            dft = prefetcher.submit(tigrigna_path, header="Tigregna")
 
+            # Clean and tokenize the data
+            dfa_t = instrument.call('read_clean_tokenize.amharic', list, tokenize_documents(dfa, tokenizer), nbytes=os.path.getsize(amharic_path))
+            dft_t = instrument.call('read_clean_tokenize.tigrigna', list, tokenize_documents(dft, tokenizer), nbytes=os.path.getsize(tigrigna_path))
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        print("Please check the file path and ensure the file exists.")
+        exit()
 
+    # Remove stopwords
+    dfa_t = instrument.call('remove_stopwords.amharic', remove_stopwords, dfa_t, 'amharic')
+    dft_t = instrument.call('remove_stopwords.tigrigna', remove_stopwords, dft_t, 'tigregna')
+
+    # Count word frequency
+    acounter = instrument.call('count_frequency.amharic', count_frequency, dfa_t)
+    tcounter = instrument.call('count_frequency.tigrigna', count_frequency, dft_t)
+
+    # Get unique words
+    aunique_word = instrument.call('get_unique_words.amharic', get_unique_words, acounter)
+    tunique_word = instrument.call('get_unique_words.tigrigna', get_unique_words, tcounter)
+
+    # Extract alphabets
+    aalphabet = instrument.call('extract_alphabets.amharic', extract_alphabets, acounter)
+    talphabet = instrument.call('extract_alphabets.tigrigna', extract_alphabets, tcounter)
+
+    # Count alphabet frequency
+    aalphabet_counter = instrument.call('count_alphabet_frequency.amharic', count_alphabet_frequency, aalphabet)
+    talphabet_counter = instrument.call('count_alphabet_frequency.tigrigna', count_alphabet_frequency, talphabet)
+
+    #Clculate word and alphabet level overlap
+    # Find overlapping words
+    overlapped_word = instrument.call('get_overlapping_words.words', get_overlapping_words, acounter, tcounter)
+
+    #Find overlapping Alphabets
+    overlapped_alphabet = instrument.call('get_overlapping_words.alphabets', get_overlapping_words, talphabet_counter, aalphabet_counter)
+
+    # Converting Ethiopic alphabets into their phonetic representations
+    aipa_converted_alphabet = instrument.call('ipa_convertor_alpahbet.amharic', ipa_convertor_alpahbet, aalphabet)  # alphabet level
+    tipa_converted_alphabet = instrument.call('ipa_convertor_alpahbet.tigrigna', ipa_convertor_alpahbet, talphabet)
+
+    aipa_converted_df = instrument.call('ipa_convert.amharic', ipa_convert, dfa_t)  # Text level
+    tipa_converted_df = instrument.call('ipa_convert.tigrigna', ipa_convert, dft_t)
+    # Print the cleaned data
+    with BackgroundReportWriter(output_path, mode='w') as report:  # Closed (and its thread stopped) on errors too
+        report.write('This is all the output of the code\n')
+
+        report.write('The preprocessed Amharic text:\n')
+        report.write_list(dfa_t)
+
+        report.write('The preprocessed Tigregna text:\n')
+        report.write_list(dft_t)
+
+        report.write('The word frequency in the given Tigrigna and Amharic text is shown below\nTigregna\n')
+        report.write_counts(tcounter)
+        report.write('Amharic')
+        report.write_counts(acounter)
+        report.write('Unique words for the given Tigrigna text are\n')
+        report.write('Total number of unique words in the Tigrigna text:  ')
+        report.write(str(len(tunique_word)))
+        report.write_list(tunique_word)
+        report.write('Unique words for the given Amharic text are\n')
+        report.write('Total number of unique words in the Amharic text:  ')
+        report.write(str(len(aunique_word)))
+        report.write_list(aunique_word)
+
+        report.write('Alphabetical frequency in the given Amharic text: \n')
+        report.write_counts(aalphabet_counter)
+        report.write('Alphabetical frequency in the given Tigregna text: \n')
+        report.write_counts(talphabet_counter)
+        report.write('The number of words that are in both Amharic and Tigrigna texts are: ')
+        report.write(str(len(overlapped_word)))
+        report.write('Here are the words\n')
+        report.write_list(overlapped_word)
+        report.write('The number of alphabets that are in both Amharic and Tigrigna texts are: ')
+        report.write(str(len(overlapped_alphabet)))
+        report.write('Here are the words\n')
+        report.write_list(overlapped_alphabet)
+
+        # #Print the  phoneme of the given text
+        report.write('\nThe phoenem of the given Amharic text\n')
+        report.write_joined(aipa_converted_df)
+
+        report.write('\nThe phoenem of the given Tigregna text\n')
+        report.write_joined(tipa_converted_df)
+
+        # Counting the frequency of each phonetic character
+        aipa_converted_alphabet_counter = instrument.call('count_alphabet_phonemes.amharic', count_alphabet_frequency, aipa_converted_alphabet)
+        tipa_converted_alphabet_counter = instrument.call('count_alphabet_phonemes.tigrigna', count_alphabet_frequency, tipa_converted_alphabet)
+
+        #Print the alphabet  phoneme frequancy
+        #print()
+        report.write('\n\nAlphabetical  phoneme frequency in the given Amharic text: \n') 
+        report.write_counts(aipa_converted_alphabet_counter)
+
+        report.write('\n\nAlphabetical  phoneme frequency in the given Tigregna text: \n') 
+        report.write_counts(tipa_converted_alphabet_counter)
+        #print(f'Alphabetical  phoneme frequency in the given Tigrigna text: \n \n{tipa_converted_alphabet_counter}\n')
+
+        aipa_converted_single_alphabet_counter = instrument.call('count_single_phonemes.amharic', count_ipa_phonemes, aipa_converted_df)
+        tipa_converted_single_alphabet_counter = instrument.call('count_single_phonemes.tigrigna', count_ipa_phonemes, tipa_converted_df)
+
+        #print(f'Single phoneme  frequency in the given Amharic text: \n\n{aipa_converted_single_alphabet_counter}\n')
+        report.write('\n\nSingle phoneme  frequency in the given Amharic text: \n')
+        report.write_counts(aipa_converted_single_alphabet_counter)
+        #print(f'Single phoneme  frequency in the given Tigrigna text: \n\n{tipa_converted_single_alphabet_counter}')
+        report.write('\n\nSingle phoneme  frequency in the given Tigregna text: \n')
+        report.write_counts(tipa_converted_single_alphabet_counter)
+        #Phonetic overllaping analysis-character level 
+
+        # Consonant and vowel frequency, from the consonant series and vowel order of each Fidel
+        aconsonant_counter, avowel_counter = instrument.call('consonant_vowel_frequency.amharic', consonant_vowel_frequency, acounter)
+        tconsonant_counter, tvowel_counter = instrument.call('consonant_vowel_frequency.tigrigna', consonant_vowel_frequency, tcounter)
+        report.write('\n\nConsonant frequency in the given Amharic text: \n')
+        report.write_counts(aconsonant_counter)
+        report.write('\n\nConsonant frequency in the given Tigregna text: \n')
+        report.write_counts(tconsonant_counter)
+        report.write('\n\nVowel frequency in the given Amharic text: \n')
+        report.write_counts(avowel_counter)
+        report.write('\n\nVowel frequency in the given Tigregna text: \n')
+        report.write_counts(tvowel_counter)
+
+        #Phonetic overllaping analysis-phonem level (consonants only)
+        asingle_consonants, _ = split_consonants_vowels(aipa_converted_single_alphabet_counter)
+        tsingle_consonants, _ = split_consonants_vowels(tipa_converted_single_alphabet_counter)
+        single_phonem_overllaped_phonem = overllaping_calc(asingle_consonants, tsingle_consonants)
+
+        #Analysis
+        report.write(f'\n\nAnalysis\nWord level overlaping in percentache is: {overllaping_calc(acounter, tcounter)}%\nCharacter level overlaping in percentache is: {overllaping_calc(aalphabet, talphabet)}%\nCombined Phonem level overlap in percentage is: {overllaping_calc(tipa_converted_alphabet_counter, aipa_converted_alphabet_counter)}%\n Phonem level overlap is: {single_phonem_overllaped_phonem}%')
+
+        # The same overlaps with the homophone Fidel folded, so spelling variants count as one word
+        anormalized_counter = instrument.call('normalize_frequency.amharic', normalize_frequency, acounter, 'amharic')
+        tnormalized_counter = instrument.call('normalize_frequency.tigrigna', normalize_frequency, tcounter, 'tigregna')
+        anormalized_alphabet_counter = count_alphabet_frequency(extract_alphabets(anormalized_counter))
+        tnormalized_alphabet_counter = count_alphabet_frequency(extract_alphabets(tnormalized_counter))
+        report.write(f'\nNormalized word level overlaping in percentache is: {overllaping_calc(anormalized_counter, tnormalized_counter)}%'
+                     f' (distinct words: Amharic {len(acounter)} raw, {len(anormalized_counter)} normalized;'
+                     f' Tigregna {len(tcounter)} raw, {len(tnormalized_counter)} normalized)'
+                     f'\nNormalized character level overlaping in percentache is: {overllaping_calc(anormalized_alphabet_counter, tnormalized_alphabet_counter)}%')
+
+        # Frequency-weighted similarity of the counters (NumPy is imported here, not at startup)
+        from similarity import compare_counts
+        try:
+            for level, counter1, counter2 in (('Word', acounter, tcounter), ('Character', aalphabet_counter, talphabet_counter),
+                                              ('Phonem', aipa_converted_single_alphabet_counter, tipa_converted_single_alphabet_counter)):
+                metrics = instrument.call(f'similarity.{level.lower()}', compare_counts, counter1, counter2)
+                report.write(f"\n{level} level weighted Jaccard: {metrics['weighted_jaccard'] * 100}%, cosine: {metrics['cosine']},"
+                             f" Jensen-Shannon divergence: {metrics['jensen_shannon']}, Spearman correlation: {metrics['spearman']}")
+        except ImportError as error:
+            print(f'Skipping the weighted similarity: {error}')
+        report.write('\n--------END------------')
+        instrument.call('write_report', report.close)
+
+    if table_format:
+        try:
+            with instrument.stage('write_tables'):
+                write_tables({
+                    'amharic_words': acounter,
+                    'tigrigna_words': tcounter,
+                    'amharic_words_normalized': anormalized_counter,
+                    'tigrigna_words_normalized': tnormalized_counter,
+                    'amharic_alphabets': aalphabet_counter,
+                    'tigrigna_alphabets': talphabet_counter,
+                    'amharic_alphabet_phonemes': aipa_converted_alphabet_counter,
+                    'tigrigna_alphabet_phonemes': tipa_converted_alphabet_counter,
+                    'amharic_single_phonemes': aipa_converted_single_alphabet_counter,
+                    'tigrigna_single_phonemes': tipa_converted_single_alphabet_counter,
+                    'amharic_consonants': aconsonant_counter,
+                    'tigrigna_consonants': tconsonant_counter,
+                    'amharic_vowels': avowel_counter,
+                    'tigrigna_vowels': tvowel_counter,
+                }, os.path.splitext(output_path)[0] + '.' + table_format, table_format)
+        except ImportError as error:  # e.g. no pyarrow for Parquet: the report is written, the tables are not
+            print(f'Error: {error}')
+
+    instrument.stop()
+    instrument.annotate('ipa_word_cache', ipa_convert_word.cache_info()._asdict())
+    instrument.write_summary(output_path)
+
+def parse_arguments(argv=None):
+    """
+    Parse the command line of the script: the arguments of main, in order, and the instrumentation options.
+    
+    Parameters:
+    argv (list, optional): The arguments, sys.argv[1:] by default.
+    
+    Returns:
+    argparse.Namespace: The parsed arguments.
+    """
+    import argparse  # Only needed when run as a script
+    parser = argparse.ArgumentParser(description='Analyze an Amharic and a Tigrigna text and write the report.')
+    parser.add_argument('amharic_path', nargs='?', default=DEFAULT_AMHARIC_PATH)
+    parser.add_argument('tigrigna_path', nargs='?', default=DEFAULT_TIGRIGNA_PATH)
+    parser.add_argument('output_path', nargs='?', default=REPORT_PATH)
+    parser.add_argument('table_format', nargs='?', choices=TABLE_FORMATS + ('',),
+                        help="also write the frequency tables next to the report ('' for none, to give a tokenizer)")
+    parser.add_argument('tokenizer', nargs='?', choices=sorted(TOKENIZERS), default='nltk')
+    add_instrumentation_arguments(parser)
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_arguments()
+    main(args.amharic_path, args.tigrigna_path, args.output_path, args.table_format, args.tokenizer, instrumentation_from_args(args))
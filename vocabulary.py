@@ -0,0 +1,192 @@
+"""
+Interned integer vocabularies and array-backed token storage.
+
+Keeping every token as a separate Python string in a list costs tens of bytes
+per token. Here words, and separately Fidel characters, are interned once and
+mapped to integer IDs. Token streams are stored as compact array('I') arrays
+(4 bytes per token) and counts as dense integer arrays indexed by ID, and the
+frequency, unique-word and overlap queries run directly on those arrays.
+NumPy is used for the dense counting and overlap when it is installed.
+
+Corpora that are compared with each other must be encoded with the same
+Vocabulary objects, so that their IDs line up.
+"""
+
+from array import array  # For compact integer storage
+from collections import Counter  # For counting IDs without NumPy
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+ID_TYPECODE = 'I'  # Unsigned 32-bit IDs
+COUNT_TYPECODE = 'Q'  # Unsigned 64-bit counts
+
+class Vocabulary:
+    """
+    Map items (words or characters) to consecutive integer IDs, interning each item once.
+
+    Parameters:
+    items (iterable, optional): Items to intern up front.
+    """
+
+    def __init__(self, items=()):
+        self.ids = {}
+        self.items = []
+        for item in items:
+            self.intern(item)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.ids
+
+    def intern(self, item):
+        """
+        Get the ID of an item, adding the item if it is new.
+
+        Parameters:
+        item (str): The item.
+
+        Returns:
+        int: The ID.
+        """
+        try:
+            return self.ids[item]
+        except KeyError:
+            item_id = self.ids[item] = len(self.items)
+            self.items.append(item)
+            return item_id
+
+    def encode(self, items, ids=None):
+        """
+        Encode a stream of items as IDs.
+
+        Parameters:
+        items (iterable): The items (e.g. tokens).
+        ids (array, optional): An existing ID array to append to.
+
+        Returns:
+        array: The IDs.
+        """
+        if ids is None:
+            ids = array(ID_TYPECODE)
+        intern = self.intern
+        ids.extend(intern(item) for item in items)
+        return ids
+
+    def decode(self, ids):
+        """list: The items of a sequence of IDs."""
+        items = self.items
+        return [items[item_id] for item_id in ids]
+
+def count_ids(ids, size):
+    """
+    Count the IDs of a token array into a dense array indexed by ID.
+
+    Parameters:
+    ids (array): The IDs.
+    size (int): The size of the vocabulary.
+
+    Returns:
+    array or numpy.ndarray: counts[id] is the frequency of the ID.
+    """
+    if np is not None:
+        return np.bincount(np.frombuffer(ids, dtype=np.uint32) if len(ids) else np.zeros(0, np.uint32), minlength=size)
+    counts = array(COUNT_TYPECODE, bytes(8 * size))
+    for item_id, count in Counter(ids).items():
+        counts[item_id] = count
+    return counts
+
+def present_ids(counts):
+    """set: The IDs whose count is not zero."""
+    if np is not None and isinstance(counts, np.ndarray):
+        return set(np.flatnonzero(counts).tolist())
+    return {item_id for item_id, count in enumerate(counts) if count}
+
+def overlap_percentage(counts1, counts2):
+    """
+    Compute the Jaccard overlap of the IDs present in two dense count arrays, in percent.
+
+    Parameters:
+    counts1 (array): The counts of the first corpus.
+    counts2 (array): The counts of the second corpus, over the same vocabulary.
+
+    Returns:
+    float: The overlap in percent, like overllaping_calc.
+    """
+    if np is not None:
+        size = max(len(counts1), len(counts2))
+        present1 = np.zeros(size, bool)
+        present2 = np.zeros(size, bool)
+        present1[:len(counts1)] = np.asarray(counts1) > 0
+        present2[:len(counts2)] = np.asarray(counts2) > 0
+        union = np.count_nonzero(present1 | present2)
+        return np.count_nonzero(present1 & present2) / union * 100 if union else 0.0
+    ids1, ids2 = present_ids(counts1), present_ids(counts2)
+    union = len(ids1 | ids2)
+    return len(ids1 & ids2) / union * 100 if union else 0.0
+
+class EncodedCorpus:
+    """
+    A tokenized corpus stored as an ID array over shared word and character vocabularies.
+
+    Parameters:
+    tokens (iterable): The tokenized words (e.g. after stopword removal).
+    words (Vocabulary): The word vocabulary, shared by the corpora that are compared.
+    characters (Vocabulary): The Fidel character vocabulary, shared by the corpora that are compared.
+    """
+
+    def __init__(self, tokens, words, characters):
+        self.words = words
+        self.characters = characters
+        self.token_ids = words.encode(tokens)
+        self._spellings = {}  # word ID -> array of character IDs
+
+    def __len__(self):
+        return len(self.token_ids)
+
+    def word_counts(self):
+        """array: counts[word ID] is the frequency of the word."""
+        return count_ids(self.token_ids, len(self.words))
+
+    def frequency(self):
+        """dict: Words as keys and their frequencies as values, like count_frequency."""
+        counts = Counter(self.token_ids)
+        items = self.words.items
+        return {items[word_id]: count for word_id, count in counts.items()}
+
+    def unique_word_ids(self):
+        """list: The IDs of the words that appear only once."""
+        if np is not None:
+            return np.flatnonzero(self.word_counts() == 1).tolist()
+        return [word_id for word_id, count in enumerate(self.word_counts()) if count == 1]
+
+    def unique_words(self):
+        """list: The words that appear only once, like get_unique_words."""
+        return self.words.decode(self.unique_word_ids())
+
+    def spelling(self, word_id):
+        """array: The character IDs of a word."""
+        try:
+            return self._spellings[word_id]
+        except KeyError:
+            spelling = self._spellings[word_id] = self.characters.encode(self.words.items[word_id])
+            return spelling
+
+    def alphabet_counts(self):
+        """array: counts[character ID] over the distinct words of the corpus, like count_alphabet_frequency(extract_alphabets(...))."""
+        character_ids = array(ID_TYPECODE)
+        for word_id in present_ids(self.word_counts()):
+            character_ids.extend(self.spelling(word_id))
+        return count_ids(character_ids, len(self.characters))
+
+    def word_overlap(self, other):
+        """float: The word-level overlap with another corpus over the same vocabularies, in percent."""
+        return overlap_percentage(self.word_counts(), other.word_counts())
+
+    def alphabet_overlap(self, other):
+        """float: The character-level overlap with another corpus over the same vocabularies, in percent."""
+        return overlap_percentage(self.alphabet_counts(), other.alphabet_counts())